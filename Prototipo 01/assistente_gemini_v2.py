@@ -1,4 +1,5 @@
 import os
+import sys
 import subprocess
 import threading
 import webbrowser 
@@ -20,6 +21,16 @@ except ImportError:
 import pyttsx3
 import speech_recognition as sr
 
+# --- Núcleo compartilhado (pasta isa_core na raiz do repositório) ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from isa_core.capture_service import CaptureService
+from isa_core.stt import TAXA, criar_motor
+from isa_core.wake_word import DetectorPalavraChave, esperar_palavra_chave
+from isa_core.browser_session import SessaoNavegador, resolver_chromedriver
+from isa_core.url_cache import CacheURLs
+from isa_core.log_sink import LogSink
+from isa_core.task_lanes import ExecutorRaias, RaiaCheia
+
 # --- Importações para Controle Web (Selenium) ---
 try:
     from selenium import webdriver
@@ -47,6 +58,9 @@ assistente_ativo = False
 voz_ativa = False
 status_label = None
 log_text = None
+# Log da janela: aceita mensagens de qualquer thread, mostra as últimas 1000
+# linhas e guarda tudo em isa.log (com rotação)
+sink_log = LogSink(max_linhas=1000, arquivo=os.path.join(os.path.dirname(os.path.abspath(__file__)), "isa.log"))
 comando_entry = None
 root = None
 btn_voz = None
@@ -54,8 +68,39 @@ client = None
 chat = None 
 URL_PREFIXES = ("http://", "https://") 
 
-# --- VARIÁVEIS GLOBAIS DO SELENIUM ---
-driver = None 
+# --- TAREFAS EM SEGUNDO PLANO: poucas threads fixas, uma raia por recurso ---
+# fala: 1 thread (o motor do pyttsx3 não aceita runAndWait concorrente)
+# navegador: 1 thread (o driver do Selenium é um só)
+# ia: 1 thread (o chat do Gemini guarda o histórico em ordem)
+tarefas = ExecutorRaias({"fala": (1, 16), "navegador": (1, 4), "ia": (1, 4)})
+
+# --- SERVIÇO DE CAPTURA (microfone aberto enquanto o modo voz está ligado) ---
+servico_captura = None
+
+# --- MÃOS LIVRES: detector local do "ISA" (ISA_PALAVRA_CHAVE=0 desliga) ---
+MODO_PALAVRA_CHAVE = os.getenv("ISA_PALAVRA_CHAVE", "1") != "0"
+detector_palavra = None
+
+# --- CACHE DE URLS: "abra o site X" já resolvido não volta para a IA ---
+cache_urls = CacheURLs(os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache_urls.json"))
+
+# --- NAVEGADOR DO SELENIUM (aberto uma vez e reaproveitado entre comandos) ---
+ARQUIVO_CACHE_DRIVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache_chromedriver.json")
+
+def criar_driver_chrome():
+    """Inicia o Chrome; o caminho do chromedriver vem do cache em disco."""
+    instalar = lambda: ChromeDriverManager().install()
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option("detach", True)
+    try:
+        driver = webdriver.Chrome(service=ChromeService(resolver_chromedriver(ARQUIVO_CACHE_DRIVER, instalar)), options=options)
+    except WebDriverException:
+        # Chrome atualizado e driver antigo no cache: resolve de novo uma vez
+        driver = webdriver.Chrome(service=ChromeService(resolver_chromedriver(ARQUIVO_CACHE_DRIVER, instalar, forcar=True)), options=options)
+    driver.maximize_window()
+    return driver
+
+navegador = SessaoNavegador(criar_driver_chrome) if ChromeDriverManager is not None else None
 
 # --- 1. FUNÇÕES DE ALERTA E CONFIGURAÇÃO DA API ---
 
@@ -154,31 +199,44 @@ def falar(texto):
     engine.say(texto)
     engine.runAndWait()
 
+def agendar(raia, funcao, *args):
+    """Roda `funcao` na raia; com a raia cheia, avisa em vez de empilhar mais threads."""
+    try:
+        tarefas.enviar(raia, funcao, *args)
+        return True
+    except RaiaCheia:
+        if raia == "fala":
+            # Fila de fala cheia: a mensagem continua no log, só não é lida
+            print(f"Fala descartada (fila cheia): {args[0] if args else ''}")
+        else:
+            exibir_log("Assistente", "Ainda estou ocupada com os pedidos anteriores. Tente de novo em instantes.", falar_se_ativo=True)
+        return False
+    except RuntimeError:
+        return False  # Aplicação encerrando
+
 def exibir_log(fonte, texto, falar_se_ativo=False):
     """Atualiza a GUI com logs e, opcionalmente, usa TTS."""
-    global log_text, voz_ativa
+    global voz_ativa
     
     print(f"{fonte}: {texto}")
 
-    if log_text:
-        log_text.insert(END, f"\n{fonte}: {texto}")
-        log_text.see(END)
+    # O widget é atualizado em lotes pelo loop do Tk (pode ser chamado de qualquer thread)
+    sink_log.escrever(f"{fonte}: {texto}")
 
     if falar_se_ativo and voz_ativa:
-        threading.Thread(target=falar, args=(texto,)).start()
+        agendar("fala", falar, texto)
 
 def escutar_comando():
     """Capta o áudio do microfone e o converte em texto em Português."""
-    r = sr.Recognizer()
-    r.energy_threshold = 500 # Sensibilidade do microfone
+    servico = servico_captura
+    if servico is None:
+        return "VOZ_FALHOU"
     
     try:
-        # ✅ CORREÇÃO: O bloco with garante que 'source' seja definido.
-        with sr.Microphone() as source:
-            # 🔊 Mensagem de escuta retornada com voz
-            exibir_log("Sistema", "Escutando... Fale agora.", falar_se_ativo=True)
-            # A chamada r.listen() precisa estar dentro do 'with'
-            audio = r.listen(source, timeout=7, phrase_time_limit=15) 
+        # 🔊 Mensagem de escuta retornada com voz
+        exibir_log("Sistema", "Escutando... Fale agora.", falar_se_ativo=True)
+        # O microfone já está aberto e calibrado: a espera é só pela frase
+        audio = servico.capturar(timeout=7, limite_frase=15)
     except sr.WaitTimeoutError:
         # 🔊 Mensagem de timeout retornada com voz
         exibir_log("Sistema", "Tempo de escuta esgotado. Nenhuma frase detectada.", falar_se_ativo=True)
@@ -190,7 +248,7 @@ def escutar_comando():
         return "VOZ_FALHOU"
 
     try:
-        comando = r.recognize_google(audio, language='pt-BR')
+        comando = servico.recognizer.recognize_google(audio, language='pt-BR')
         return comando.lower()
     except sr.UnknownValueError:
         exibir_log("Assistente", "Não foi possível entender o áudio.", falar_se_ativo=True)
@@ -202,11 +260,9 @@ def escutar_comando():
 # --- 4. FUNÇÃO AUXILIAR PARA ABRIR URLS (USANDO SELENIUM COM FALLBACK) ---
 def tentar_abrir_url(url_candidata):
     """
-    Tenta iniciar o Selenium WebDriver.
+    Abre a URL no navegador do Selenium (reaproveitado entre comandos).
     Se falhar, usa o subprocess para abrir diretamente no Chrome/Edge/padrão.
     """
-    global driver
-    
     # 1. Limpeza e Padronização da URL
     url_limpa = url_candidata.strip()
     
@@ -221,36 +277,22 @@ def tentar_abrir_url(url_candidata):
     exibir_log("Assistente", f"Tentando abrir: {url_limpa}", falar_se_ativo=True)
     
     def abrir_navegador(url):
-        global driver
-        
-        # 1. Fechar o driver anterior se houver
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass 
-        
-        # Tenta a opção Selenium
-        if 'webdriver' in globals() and 'ChromeDriverManager' in globals() and ChromeDriverManager is not None:
+        # Tenta a opção Selenium: o mesmo navegador é reaproveitado; só inicia
+        # outro na primeira vez ou se o anterior foi fechado/travou
+        if navegador is not None:
             try:
-                # 🔊 Logs de navegação retornados com voz
-                exibir_log("Sistema", "Tentando iniciar o navegador via Selenium...", falar_se_ativo=True)
-                service = ChromeService(ChromeDriverManager().install())
-                options = webdriver.ChromeOptions()
-                options.add_experimental_option("detach", True) 
-                
-                driver = webdriver.Chrome(service=service, options=options)
-                driver.maximize_window()
-                driver.get(url)
-                # 🔊 Logs de navegação retornados com voz
-                exibir_log("Sistema", "Navegador Selenium iniciado com sucesso.", falar_se_ativo=True)
+                if not navegador.aberto:
+                    # 🔊 Logs de navegação retornados com voz
+                    exibir_log("Sistema", "Tentando iniciar o navegador via Selenium...", falar_se_ativo=True)
+                navegador.navegar(url)
+                exibir_log("Sistema", "Página aberta no navegador Selenium.")
                 return
             except WebDriverException as e:
                 exibir_log("Sistema", f"Falha no Selenium ({e}). Ativando modo Fallback...", falar_se_ativo=True)
-                driver = None
+                navegador.fechar()
             except Exception as e:
                 exibir_log("Sistema", f"Falha desconhecida no Selenium ({e}). Ativando modo Fallback...", falar_se_ativo=True)
-                driver = None
+                navegador.fechar()
 
         # 2. FALLBACK
         # 🔊 Logs de navegação retornados com voz
@@ -271,13 +313,13 @@ def tentar_abrir_url(url_candidata):
                     exibir_log("Assistente", "ERRO FATAL: Não foi possível abrir a URL em nenhum navegador.", falar_se_ativo=True)
                     print(f"Erro no Fallback: {e}")
 
-    threading.Thread(target=abrir_navegador, args=(url_limpa,)).start()
+    agendar("navegador", abrir_navegador, url_limpa)
 
 
 # --- 4.1 FUNÇÕES DE INTERAÇÃO COM O SITE ---
 def interagir_com_site(comando):
     """Executa ações específicas no navegador controlado pelo Selenium."""
-    global driver
+    driver = navegador.driver_ativo() if navegador is not None else None
     
     if driver is None:
         exibir_log("Assistente", "Nenhum site está aberto ou o navegador não foi inicializado. Use 'abra o site...' primeiro.", falar_se_ativo=True)
@@ -296,8 +338,7 @@ def interagir_com_site(comando):
             
         elif "fechar navegador" in comando or "feche a página" in comando:
             exibir_log("Assistente", "Fechando o navegador.", falar_se_ativo=True)
-            driver.quit()
-            driver = None
+            navegador.fechar()
             
         elif "pesquisar por" in comando:
             termo = comando.replace("pesquisar por", "").strip()
@@ -326,6 +367,39 @@ def interagir_com_site(comando):
         exibir_log("Assistente", f"Erro durante a interação com o site: {e}", falar_se_ativo=True)
 
 
+# --- 4.2 CHAMADAS À IA (rodam na raia "ia") ---
+def pedir_url_a_ia(comando):
+    """Pede ao Gemini a URL de um site e abre o resultado."""
+    try:
+        # A IA retorna a URL pura devido ao SYSTEM_PROMPT
+        resposta_ia = chat.send_message(comando)
+        url_candidata = resposta_ia.text.strip()
+        
+        # URL válida: guarda para a próxima vez e abre
+        url_valida = cache_urls.guardar(comando, url_candidata)
+        if url_valida:
+            tentar_abrir_url(url_valida)
+        # Se a resposta da IA for um URL, abra-o imediatamente.
+        elif url_candidata.lower().startswith(URL_PREFIXES) or '.' in url_candidata:
+            tentar_abrir_url(url_candidata) 
+        # Se a IA pedir mais informação, exibe a mensagem.
+        else:
+             exibir_log("Gemini", url_candidata, falar_se_ativo=True)
+        
+    except Exception as e:
+        exibir_log("Assistente", "Houve um erro de comunicação com a IA ao buscar o site.", falar_se_ativo=True)
+        print(f"Erro Gemini ao buscar URL: {e}")
+
+def conversar_com_ia(comando):
+    """Envia uma pergunta geral ao Gemini e lê a resposta."""
+    try:
+        response = chat.send_message(comando)
+        exibir_log("Gemini", response.text, falar_se_ativo=True)
+    except Exception as e:
+        exibir_log("Assistente", "Desculpe, houve um erro ao processar sua pergunta com a IA.", falar_se_ativo=True)
+        print(f"Erro Gemini: {e}")
+
+
 # --- 5. FUNÇÃO DE PROCESSAMENTO DE COMANDOS (CENTRAL) ---
 
 def processar_comando(comando):
@@ -342,8 +416,8 @@ def processar_comando(comando):
     comando = comando.lower()
 
     # --- 5.0. COMANDO DE INTERAÇÃO COM O SITE (PRIORIDADE MÁXIMA) ---
-    if driver is not None and ("rolar" in comando or "fechar navegador" in comando or "pesquisar por" in comando or "subir" in comando or "descer" in comando):
-        threading.Thread(target=interagir_com_site, args=(comando,)).start()
+    if navegador is not None and navegador.aberto and ("rolar" in comando or "fechar navegador" in comando or "pesquisar por" in comando or "subir" in comando or "descer" in comando):
+        agendar("navegador", interagir_com_site, comando)
         return
 
 
@@ -368,27 +442,19 @@ def processar_comando(comando):
 
     # --- 5.2. COMANDO DE ABRIR SITE DIRETO ---
     if ("abra" in comando or "abrir" in comando) and ("site" in comando or "página" in comando or "url" in comando or len(comando.split()) <= 4):
+        # Site já aberto antes: resolve localmente, sem chamar a IA
+        url_guardada = cache_urls.obter(comando)
+        if url_guardada:
+            tentar_abrir_url(url_guardada)
+            return
+
         if not client:
             exibir_log("Assistente", "A IA não está conectada. Verifique sua chave Gemini.", falar_se_ativo=True)
             return
 
         exibir_log("Assistente", "Solicitando URL à Inteligência Artificial...", falar_se_ativo=True)
-        try:
-            # A IA retorna a URL pura devido ao SYSTEM_PROMPT
-            resposta_ia = chat.send_message(comando)
-            url_candidata = resposta_ia.text.strip()
-            
-            # Se a resposta da IA for um URL, abra-o imediatamente.
-            if url_candidata.lower().startswith(URL_PREFIXES) or '.' in url_candidata:
-                tentar_abrir_url(url_candidata) 
-            # Se a IA pedir mais informação, exibe a mensagem.
-            else:
-                 exibir_log("Gemini", url_candidata, falar_se_ativo=True)
-            
-        except Exception as e:
-            exibir_log("Assistente", "Houve um erro de comunicação com a IA ao buscar o site.", falar_se_ativo=True)
-            print(f"Erro Gemini ao buscar URL: {e}")
-            
+        # A chamada à IA roda na raia "ia": a janela não trava esperando a resposta
+        agendar("ia", pedir_url_a_ia, comando)
         return 
 
     # --- 5.3. Comandos de Sistema (Abrir Programas) ---
@@ -421,24 +487,16 @@ def processar_comando(comando):
     # --- 5.4. Comandos de Encerrar ---
     elif "sair" in comando or "encerrar" in comando or "desligar aplicação" in comando:
         exibir_log("Assistente", "Encerrando a aplicação e fechando o navegador, se estiver aberto. Até logo!", falar_se_ativo=True)
-        if driver:
-              try:
-                driver.quit()
-              except Exception:
-                pass
+        if navegador is not None:
+            navegador.fechar()
         if root:
             root.quit()
         return
         
     # --- 5.5. Comandos de Conversa Geral (Fallback para Gemini) ---
     elif client: 
-        try:
-            exibir_log("Assistente", "Consultando a inteligência artificial...", falar_se_ativo=True) 
-            response = chat.send_message(comando)
-            exibir_log("Gemini", response.text, falar_se_ativo=True)
-        except Exception as e:
-            exibir_log("Assistente", "Desculpe, houve um erro ao processar sua pergunta com a IA.", falar_se_ativo=True)
-            print(f"Erro Gemini: {e}")
+        exibir_log("Assistente", "Consultando a inteligência artificial...", falar_se_ativo=True) 
+        agendar("ia", conversar_com_ia, comando)
             
     else:
         exibir_log("Assistente", "Comando não mapeado. A IA (Gemini) não está disponível.", falar_se_ativo=True)
@@ -456,9 +514,24 @@ def laço_principal_voz():
         return
 
     # 🔊 Mensagem de sistema retornada com voz
-    exibir_log("Sistema", "Modo VOZ ativado. Iniciando escuta...", falar_se_ativo=True)
+    if detector_palavra is not None:
+        exibir_log("Sistema", "Modo VOZ ativado. Diga ISA para me chamar.", falar_se_ativo=True)
+    else:
+        exibir_log("Sistema", "Modo VOZ ativado. Iniciando escuta...", falar_se_ativo=True)
     
     while voz_ativa:
+        if detector_palavra is not None:
+            # Mãos livres: o reconhecimento completo só roda depois do "ISA"
+            servico = servico_captura
+            try:
+                if servico is None or not esperar_palavra_chave(servico, detector_palavra):
+                    continue
+            except Exception as e:
+                exibir_log("Sistema", f"Erro no Microfone: {e}. Desativando voz.", falar_se_ativo=True)
+                desativar_voz()
+                break
+            exibir_log("Sistema", "Palavra-chave detectada.")
+
         comando_usuario = escutar_comando()
         
         if comando_usuario and comando_usuario != "VOZ_FALHOU":
@@ -511,11 +584,8 @@ def ativar_assistente():
 def desativar_assistente():
     """Desativa o modo de gerenciamento/uso (software principal)."""
     global assistente_ativo
-    if driver:
-          try:
-            driver.quit()
-          except Exception:
-            pass
+    if navegador is not None:
+        navegador.fechar()
     assistente_ativo = False
     # 🔊 Mensagem de sistema retornada com voz
     exibir_log("Sistema", "Software principal desativado.", falar_se_ativo=True)
@@ -529,9 +599,20 @@ def atualizar_status_voz():
     else:
         btn_voz.config(text="Voz: INATIVA (Microfone Off)", bg="#696969", state='normal') 
 
+def carregar_detector_palavra():
+    """Carrega o Vosk com gramática só da palavra-chave; sem ele, escuta todas as frases como antes."""
+    global detector_palavra
+    if detector_palavra is None and MODO_PALAVRA_CHAVE:
+        modelo = os.getenv("ISA_VOSK_MODELO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "modelos", "vosk-model-small-pt-0.3"))
+        try:
+            detector_palavra = DetectorPalavraChave(criar_motor("vosk", {"vosk_modelo": modelo}))
+        except Exception as e:
+            print(f"Modo mãos livres indisponível ({e}). Todas as frases vão para o reconhecimento.")
+    return detector_palavra
+
 def ativar_voz():
     """Liga o modo voz e inicia o loop de escuta em uma thread."""
-    global voz_ativa, assistente_ativo
+    global voz_ativa, assistente_ativo, servico_captura
     if not assistente_ativo:
         # 🔊 Mensagem de sistema retornada com voz
         exibir_log("Sistema", "Ative o software principal primeiro.", falar_se_ativo=True)
@@ -548,6 +629,14 @@ def ativar_voz():
             messagebox.showwarning("Atenção", "Microfone não encontrado. Verifique se o dispositivo está conectado e configurado como padrão no Windows.")
             return 
 
+        # Abre o microfone uma vez só; ele fica aberto até desligar a voz
+        r = sr.Recognizer()
+        r.energy_threshold = 500 # Sensibilidade inicial (recalibrada em segundo plano)
+        # 16 kHz: o formato do detector da palavra-chave, sem conversão
+        servico_captura = CaptureService(lambda: sr.Microphone(sample_rate=TAXA), recognizer=r)
+        servico_captura.start()
+        carregar_detector_palavra()
+
         voz_ativa = True
         t = threading.Thread(target=laço_principal_voz)
         t.daemon = True 
@@ -556,9 +645,12 @@ def ativar_voz():
         
 def desativar_voz():
     """Desliga o modo voz."""
-    global voz_ativa
+    global voz_ativa, servico_captura
     if voz_ativa:
         voz_ativa = False
+    if servico_captura:
+        servico_captura.parar() # Fecha o microfone ao fim da escuta atual
+        servico_captura = None
     atualizar_status_voz()
 
 # --- 8. CRIAÇÃO DA INTERFACE GRÁFICA (Tkinter) ---
@@ -608,9 +700,10 @@ if __name__ == "__main__":
     log_text.insert(END, f"\nAssistente: {mensagem_inicial}")
     
     # 2. Força a resposta por voz na inicialização
-    threading.Thread(target=falar, args=(mensagem_inicial,)).start()
+    agendar("fala", falar, mensagem_inicial)
     
     log_text.pack(padx=10, pady=10)
+    sink_log.anexar(log_text, root)
 
     # Inicializa o status e a API
     inicializar_gemini(root) 
@@ -621,10 +714,11 @@ if __name__ == "__main__":
     root.mainloop()
 
     # --- FINALIZAÇÃO ---
+    # Falas e tarefas ainda na fila são descartadas; mostra quanto cada raia esperou/levou
+    tarefas.encerrar()
+    for raia, dados in tarefas.estatisticas().items():
+        print(f"Raia {raia}: {dados}")
     engine.stop()
     # Garante que o driver seja fechado ao sair
-    if driver:
-          try:
-            driver.quit()
-          except Exception:
-            pass
\ No newline at end of file
+    if navegador is not None:
+        navegador.fechar()
\ No newline at end of file
@@ -1,37 +1,57 @@
+import os
+import sys
 import speech_recognition as sr
 import pyttsx3
 from flask import Flask, render_template, jsonify, request
 
+# Núcleo compartilhado (pasta isa_core na raiz do repositório)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from isa_core.intent_router import IntentRouter
+from isa_core.knowledge_base import BaseConhecimento
+from isa_core.tts_cache import TTSAudioCache
+from isa_core.speech_scheduler import SpeechScheduler
+from isa_core.stt import criar_stt
+
 # --- 1. Configuração Inicial ---
 app = Flask(__name__)
 
-# Configura o motor de FALA (pyttsx3)
-try:
-    engine = pyttsx3.init()
-    # Tenta definir uma voz em português
-    voices = engine.getProperty('voices')
-    for voice in voices:
-        if "brazil" in voice.name.lower() or "portuguese" in voice.name.lower():
-            engine.setProperty('voice', voice.id)
-            break
-except Exception as e:
-    print(f"Erro ao inicializar motor de voz: {e}")
-    engine = None
-
 # Configura o motor de AUDIÇÃO (SpeechRecognition)
 recognizer = sr.Recognizer()
 microphone = sr.Microphone()
+# Motores de STT: Google por padrão; ISA_STT_MOTORES=vosk,google usa o Vosk offline primeiro
+stt = criar_stt({"vosk_modelo": os.getenv("ISA_VOSK_MODELO", "modelos/vosk-model-small-pt-0.3")},
+                os.path.dirname(os.path.abspath(__file__)))
 
 # --- 2. Funções de "Sentidos" (Falar e Ouvir) ---
 
+# Cache de áudio: as respostas prontas são sintetizadas uma vez, quando a voz está livre
+cache_voz = TTSAudioCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache_voz"))
+
+class VozTotem(SpeechScheduler):
+    """ Fila de fala do totem: o motor roda na própria thread, fora das requisições """
+
+    def __init__(self, cache_audio, engine_factory=None, max_fila=4):
+        super().__init__(max_fila=max_fila, cache_audio=cache_audio)
+        self.engine_factory = engine_factory  # Permite usar um motor falso (benchmarks)
+        # Sobe já na criação: com `flask run` ou um servidor WSGI o __main__ não roda
+        self.start()
+
+    def criar_engine(self):
+        if self.engine_factory:
+            return self.engine_factory()
+        engine = pyttsx3.init()
+        # Tenta definir uma voz em português
+        voices = engine.getProperty('voices')
+        for voice in voices:
+            if "brazil" in voice.name.lower() or "portuguese" in voice.name.lower():
+                engine.setProperty('voice', voice.id)
+                break
+        return engine
+
 def falar(texto):
-    """ Função que faz o robô falar """
+    """ Função que faz o robô falar (só enfileira; a rota responde na hora) """
     print(f"Robô falando: {texto}")
-    if engine:
-        engine.say(texto)
-        engine.runAndWait()
-    else:
-        print("Motor de voz não inicializado.")
+    voz.falar(texto)
 
 def ouvir_comando():
     """ Função que ouve o microfone e retorna o texto """
@@ -42,39 +62,65 @@ def ouvir_comando():
     
     try:
         print("Reconhecendo...")
-        # Usando a API do Google (requer internet)
-        texto = recognizer.recognize_google(audio, language='pt-BR')
+        # Motor local (offline) ou API do Google, conforme a configuração
+        texto = stt.reconhecer(audio)
         print(f"Usuário disse: {texto}")
         return texto
     except sr.UnknownValueError:
         print("Não entendi o que foi dito.")
         return ""
-    except sr.RequestError as e:
+    except (sr.RequestError, TimeoutError) as e:
         print(f"Erro no serviço de reconhecimento; {e}")
         return ""
 
+RESPOSTAS_BOTOES = {
+    'btn-agenda': "A agenda de hoje inclui a Palestra de Robótica às 15h no Laboratório Maker.",
+    'btn-mapa': "O Bloco C fica à sua esquerda, seguindo este corredor.",
+    'btn-faq': "O horário da biblioteca é das 8h às 21h.",
+}
+RESPOSTA_BOTAO_DESCONHECIDO = "Desculpe, não entendi essa opção."
+
 def processar_comando_texto(id_botao):
     """ Processa a lógica baseada no TOQUE na tela """
-    if id_botao == 'btn-agenda':
-        return "A agenda de hoje inclui a Palestra de Robótica às 15h no Laboratório Maker."
-    elif id_botao == 'btn-mapa':
-        return "O Bloco C fica à sua esquerda, seguindo este corredor."
-    elif id_botao == 'btn-faq':
-        return "O horário da biblioteca é das 8h às 21h."
-    else:
-        return "Desculpe, não entendi essa opção."
+    return RESPOSTAS_BOTOES.get(id_botao, RESPOSTA_BOTAO_DESCONHECIDO)
+
+# Comandos de voz: a ordem da tabela define a prioridade
+ROTEADOR_VOZ = IntentRouter([
+    {"nome": "agenda", "gatilhos": ["agenda", "eventos", "evento"]},
+    {"nome": "biblioteca", "gatilhos": ["biblioteca"]},
+    {"nome": "mapa", "gatilhos": ["mapa", "onde fica"]},
+])
+
+RESPOSTAS_VOZ = {
+    "agenda": "A agenda de hoje inclui a Palestra de Robótica às 15h.",
+    "biblioteca": "O horário da biblioteca é das 8h às 21h.",
+    "mapa": "O Bloco C fica à sua esquerda, seguindo este corredor.",
+}
+
+# Perguntas fora da tabela: documentos do campus (mesma pasta do Prototipo Ultimate)
+base_conhecimento = BaseConhecimento(os.getenv(
+    "ISA_CONHECIMENTO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "conhecimento")
+))
+
+RESPOSTA_VOZ_DESCONHECIDA = "Desculpe, não entendi o comando de voz."
+RESPOSTA_NAO_OUVIU = "Não consegui te ouvir. Pode repetir?"
+FRASE_INICIAL = "Sistema iniciado. Aguardando comandos."
 
 def processar_comando_voz(texto_voz):
     """ Processa a lógica baseada na VOZ do usuário """
-    texto_voz = texto_voz.lower()
-    if "agenda" in texto_voz or "eventos" in texto_voz:
-        return "A agenda de hoje inclui a Palestra de Robótica às 15h."
-    elif "biblioteca" in texto_voz:
-        return "O horário da biblioteca é das 8h às 21h."
-    elif "mapa" in texto_voz or "onde fica" in texto_voz:
-        return "O Bloco C fica à sua esquerda, seguindo este corredor."
-    else:
-        return "Desculpe, não entendi o comando de voz."
+    intencao = ROTEADOR_VOZ.rotear(texto_voz)
+    if intencao:
+        return RESPOSTAS_VOZ[intencao.nome]
+    return base_conhecimento.resposta_direta(texto_voz) or RESPOSTA_VOZ_DESCONHECIDA
+
+# Todas as respostas do totem são fixas: entram no cache de áudio
+cache_voz.fixar(
+    list(RESPOSTAS_BOTOES.values()) + list(RESPOSTAS_VOZ.values())
+    + [RESPOSTA_BOTAO_DESCONHECIDO, RESPOSTA_VOZ_DESCONHECIDA, RESPOSTA_NAO_OUVIU, FRASE_INICIAL]
+)
+
+# Criada depois do fixar(): a thread renderiza as frases fixas quando não tiver nada para falar
+voz = VozTotem(cache_voz)
 
 
 # --- 3. Rotas da API (A ponte entre Interface e Cérebro) ---
@@ -90,7 +136,8 @@ def api_get_info():
     button_id = request.json['id']
     resposta_texto = processar_comando_texto(button_id)
     
-    # Manda o robô FALAR a resposta
+    # Novo toque: a resposta anterior para no meio e a nova entra no lugar
+    voz.interromper()
     falar(resposta_texto)
     
     # Retorna o texto para a tela
@@ -99,14 +146,15 @@ def api_get_info():
 @app.route('/api/ouvir', methods=['POST'])
 def api_ouvir():
     """ API para quando o usuário clica no botão de microfone """
+    voz.interromper()  # Não grava a própria voz do robô
     texto_ouvido = ouvir_comando()
     
     if texto_ouvido:
         resposta_texto = processar_comando_voz(texto_ouvido)
     else:
-        resposta_texto = "Não consegui te ouvir. Pode repetir?"
+        resposta_texto = RESPOSTA_NAO_OUVIU
 
-    # Manda o robô FALAR a resposta
+    # Manda o robô FALAR a resposta (em segundo plano)
     falar(resposta_texto)
     
     # Retorna o que foi ouvido e a resposta para a tela
@@ -116,7 +164,7 @@ def api_ouvir():
 # --- 4. Inicialização ---
 if __name__ == '__main__':
     print("Iniciando assistente ACI...")
-    falar("Sistema iniciado. Aguardando comandos.")
+    falar(FRASE_INICIAL)
     # 'host=0.0.0.0' torna o servidor visível (útil para o celular)
     # 'debug=True' reinicia o servidor se você alterar o código
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -1,23 +1,59 @@
 import os
+import re
+import sys
+import json
+import time
+import uuid
 import threading
-import queue
 import psutil
 import pyautogui
 import pyttsx3
 import speech_recognition as sr
 import webbrowser
 import screen_brightness_control as sbc
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, send_file, stream_with_context
 from dotenv import load_dotenv
-from AppOpener import open as open_app
 import google.generativeai as genai
 from urllib.parse import quote 
 
+# Núcleo compartilhado (pasta isa_core na raiz do repositório)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from isa_core.chat_pool import ChatPool
+from isa_core.context_budget import OrcamentoContexto, estimar_tokens
+from isa_core.streaming import DivisorFrases, evento_sse
+from isa_core.response_cache import ResponseCache, depende_de_contexto, resposta_compartilhavel
+from isa_core.intent_router import IntentRouter
+from isa_core.site_registry import RegistroSites
+from isa_core.app_launcher import IndiceAplicativos, iniciar as iniciar_aplicativo
+from isa_core.metrics_sampler import Assinatura, MetricsSampler, etag_confere
+from isa_core.speech_scheduler import PRIORIDADE_CHAT, PRIORIDADE_COMANDO, SpeechScheduler
+from isa_core.tts_cache import TTSAudioCache
+from isa_core.capture_service import CaptureService, MicrofoneOcupado
+from isa_core.stt import TAXA, criar_stt
+from isa_core.voice_pipeline import PipelineVoz
+from isa_core.wake_word import PALAVRAS_PADRAO, criar_detector, esperar_palavra_chave
+from isa_core.screen_capture import HistoricoCapturas
+from isa_core.knowledge_base import BaseConhecimento
+from isa_core.task_lanes import RaiaCheia
+from isa_core.llm_client import ClienteIA, IAIndisponivel
+from isa_core.tracing import TIPO_CONTEUDO, Metricas
+
 # --- CONFIGURAÇÃO INICIAL ---
 app = Flask(__name__)
-audio_queue = queue.Queue()
 load_dotenv() # Carrega as variáveis do arquivo .env
 
+# Configurações opcionais do config.json (reconhecimento de voz, etc.)
+PASTA_APP = os.path.dirname(os.path.abspath(__file__))
+
+def carregar_config():
+    try:
+        with open(os.path.join(PASTA_APP, "config.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+CONFIG = carregar_config()
+
 # Verifica se a pasta static existe (para salvar prints)
 if not os.path.exists('static'):
     os.makedirs('static')
@@ -30,20 +66,111 @@ MINHA_CHAVE = os.getenv("GEMINI_API_KEY")
 if not MINHA_CHAVE:
     print("⚠️ AVISO: Chave API não encontrada no arquivo .env!")
 
+# ==========================================
+# TABELAS DE COMANDOS (compiladas em um único roteador)
+# ==========================================
+# A ordem define a prioridade quando a frase casa com mais de uma intenção.
+# Só vale em posição de comando ("aumenta o som", "isa, tira um print"):
+# perguntas e frases como "o que é um print screen?" vão para a IA.
+ARTIGOS = ["o", "a", "os", "as", "um", "uma", "do", "da", "de", "no", "na"]
+PREFIXOS_COMANDO = ["isa", "iza", "ei", "oi", "ok", "por favor", "me", "pode", "poderia", "consegue", "você", "vc",
+                    "quero", "queria", "gostaria de"]
+
+ROTEADOR_COMANDOS = IntentRouter([
+    {"nome": "volume", "gatilhos": ["volume", "som", "áudio"], "antes": ARTIGOS + ["deixa", "deixe", "coloca", "coloque"],
+     "slots": {"acao": {"up": ["aumentar", "aumenta", "aumente", "sobe", "subir", "suba"],
+                        "down": ["diminuir", "diminui", "diminua", "baixa", "baixar", "abaixa", "abaixar"],
+                        "max": ["máximo", "no máximo", "no talo"],
+                        "mute": ["mudo", "silenciar", "silêncio"]}},
+     "obrigatorios": ["acao"]},
+    # "mudo" / "silenciar" sozinhos já dizem o que fazer com o som
+    {"nome": "volume", "gatilhos": ["mudo", "silenciar", "silencia", "silencie"],
+     "antes": ARTIGOS + ["deixa", "deixe", "coloca", "coloque", "fica", "fique"],
+     "slots": {"acao": {"mute": ["mudo", "silenciar", "silencia", "silencie"]}}},
+    {"nome": "brilho", "gatilhos": ["brilho", "luz"], "antes": ARTIGOS + ["deixa", "deixe", "coloca", "coloque"],
+     "slots": {"acao": {"up": ["aumentar", "aumenta", "aumente", "mais"],
+                        "down": ["diminuir", "diminui", "diminua", "menos"]}},
+     "obrigatorios": ["acao"]},
+    {"nome": "print", "gatilhos": ["print", "printar", "captura", "capturar"],
+     "antes": ARTIGOS + ["tira", "tire", "tirar", "faz", "faça", "fazer", "dá", "dê", "dar"]},
+    # Comandos de Abrir (Híbrido: App ou Site)
+    {"nome": "abrir", "gatilhos": ["abra", "abrir", "abre"],
+     "slots": {"tipo": {"site": ["site", "página", "portal"]}},
+     "resto": "alvo", "resto_bruto": "frase",
+     "descartar": ARTIGOS + ["site", "página", "portal", "programa", "aplicativo", "app"]},
+    # Site Direto
+    {"nome": "site", "gatilhos": ["acesse", "acessar", "acessa", "site"],
+     "resto": "alvo", "resto_bruto": "frase", "descartar": ARTIGOS + ["site", "página", "portal"],
+     "antes": ARTIGOS + ["vai", "vá", "ir", "entra", "entre", "entrar", "pro", "pra", "para"]},
+], posicao_comando=True, prefixos=PREFIXOS_COMANDO)
+
+# Programas com comando manual: nome -> (comando, resposta)
+PROGRAMAS = {
+    "cmd": ("start cmd", "Prompt de Comando aberto."),
+    "calculadora": ("calc", "Calculadora aberta."),
+    "bloco de notas": ("notepad", "Bloco de Notas aberto."),
+}
+ROTEADOR_PROGRAMAS = IntentRouter([
+    {"nome": "cmd", "gatilhos": ["cmd", "prompt"]},
+    {"nome": "calculadora", "gatilhos": ["calculadora"]},
+    {"nome": "bloco de notas", "gatilhos": ["bloco de notas"]},
+])
+
+# Sites com endereço conhecido: seção "sites" do config.json (relida quando o arquivo muda)
+SITES = RegistroSites(os.path.join(PASTA_APP, "config.json"))
+
+# ==========================================
+# MÉTRICAS (GET /api/metrics, formato Prometheus)
+# ==========================================
+# Spans por etapa (rotear, comando_*, base_local, gemini, fala, microfone...) em isa_etapa_segundos
+metricas = Metricas()
+intencoes = metricas.contador("isa_intencoes_total", "Comandos locais executados, por intenção.", "intencao")
+duracao_stt = metricas.histograma("isa_stt_segundos", "Duração do reconhecimento de voz, por motor.", "motor")
+falhas_stt = metricas.contador("isa_stt_falhas_total", "Reconhecimentos de voz que falharam ou estouraram o tempo.", "motor")
+
 # --- CLASSE: GERENCIADOR DO SISTEMA ---
 class SystemController:
-    def get_status(self):
+    # Métricas lidas por uma thread só, em segundo plano
+    INTERVALO_STATUS = 1.0   # segundos entre leituras
+    HISTORICO_STATUS = 300   # leituras guardadas (5 min com 1 s de intervalo)
+    # Variação mínima para o valor ser enviado aos painéis conectados (push)
+    LIMIARES_STATUS = {"cpu": 2.0, "ram": 1.0, "bat": 1}
+
+    # Índice dos aplicativos instalados, refeito em segundo plano
+    INTERVALO_APLICATIVOS = 10 * 60  # segundos
+
+    def __init__(self, intervalo_status=None, aplicativos=None):
+        psutil.cpu_percent()  # A primeira leitura só zera o contador da CPU
+        self.amostrador = MetricsSampler(
+            self.ler_metricas,
+            intervalo=intervalo_status or self.INTERVALO_STATUS,
+            tamanho_historico=self.HISTORICO_STATUS,
+            limiares=self.LIMIARES_STATUS,
+        )
+        if aplicativos is None:
+            config_apps = CONFIG.get("aplicativos", {})
+            aplicativos = IndiceAplicativos(aliases=config_apps.get("aliases"))
+            aplicativos.atualizar_em_segundo_plano(config_apps.get("intervalo_atualizacao", self.INTERVALO_APLICATIVOS))
+        self.aplicativos = aplicativos
+
+    def ler_metricas(self):
+        # cpu_percent() sem intervalo mede o uso desde a leitura anterior,
+        # ou seja, a média do intervalo do amostrador (sem ruído)
         battery = psutil.sensors_battery()
         percent = int(battery.percent) if battery else 100
         return { 
-            "cpu": psutil.cpu_percent(), 
+            "cpu": round(psutil.cpu_percent(), 1), 
             "ram": psutil.virtual_memory().percent,
             "bat": percent
         }
 
+    def get_status(self):
+        return self.amostrador.ultima().dados
+
     def ajustar_volume(self, acao):
         if acao == "up": pyautogui.press("volumeup", presses=5)
         elif acao == "down": pyautogui.press("volumedown", presses=5)
+        elif acao == "max": pyautogui.press("volumeup", presses=50)
         elif acao == "mute": pyautogui.press("volumemute")
         return "Áudio ajustado."
 
@@ -62,42 +189,38 @@ class SystemController:
 
     def abrir_programa_universal(self, nome_sujo):
         """Tenta abrir programas ou comandos do sistema"""
-        nome_limpo = nome_sujo.lower().replace("abra", "").replace("o ", "").replace("a ", "").strip()
+        nome_limpo = nome_sujo.lower().strip()
         
         # Comandos manuais
-        if "cmd" in nome_limpo or "prompt" in nome_limpo:
-            os.popen("start cmd")
-            return "Prompt de Comando aberto."
-        if "calculadora" in nome_limpo:
-            os.popen("calc")
-            return "Calculadora aberta."
-        if "bloco de notas" in nome_limpo:
-            os.popen("notepad")
-            return "Bloco de Notas aberto."
-
-        # AppOpener para outros programas
+        programa = ROTEADOR_PROGRAMAS.rotear(nome_limpo)
+        if programa:
+            comando, resposta = PROGRAMAS[programa.nome]
+            os.popen(comando)
+            return resposta
+
+        # Aplicativos instalados (índice em memória: .desktop, Menu Iniciar e PATH)
+        aplicativo = self.aplicativos.buscar(nome_limpo)
+        if aplicativo is None:
+            return None # Não encontrado, vai tentar abrir como site
         try:
-            print(f">>> Tentando abrir: {nome_limpo}")
-            open_app(nome_limpo, match_closest=True, throw_error=True)
-            return f"Abrindo {nome_limpo}..."
-        except:
-            return None # Falhou, vai tentar abrir como site
-
-    def abrir_site_rapido(self, termo):
-        """Abre sites no navegador padrão"""
-        termo = termo.replace("acesse", "").replace("o site", "").replace("abra", "").strip()
-        
-        # Remove artigos iniciais
-        if termo.startswith("o "): termo = termo[2:]
-        if termo.startswith("a "): termo = termo[2:]
-
-        # Mapeamento direto
-        if "youtube" in termo: url = "https://youtube.com"
-        elif "globo" in termo: url = "https://ge.globo.com"
-        elif "whatsapp" in termo: url = "https://web.whatsapp.com"
-        elif "google" in termo: url = "https://google.com"
-        elif "q-acadêmico" in termo or "qacademico" in termo: url = "https://qacademico.ifce.edu.br/"
-        
+            print(f">>> Abrindo: {aplicativo.nome} ({aplicativo.comando})")
+            iniciar_aplicativo(aplicativo)
+            return f"Abrindo {aplicativo.nome}..."
+        except Exception as e:
+            print(f"Erro ao abrir {aplicativo.nome}: {e}")
+            return None
+
+    def abrir_site_rapido(self, termo, frase=None):
+        """Abre sites no navegador padrão (`frase`: o pedido sem cortes, ex.: "o portal do campus")"""
+        termo = termo.strip()
+
+        # Atalhos do config.json: a frase inteira primeiro, porque o roteador
+        # corta palavras como "portal" que fazem parte de apelidos
+        site = (SITES.buscar(frase) if frase else None) or SITES.buscar(termo)
+        url = SITES.urls.get(site) if site else None
+        if url:
+            SITES.registrar_uso(site)
+
         # Tratamento de URL genérica
         elif ".com" in termo or "www" in termo:
             url = termo if termo.startswith("http") else f"https://{termo}"
@@ -108,150 +231,657 @@ class SystemController:
         return f"Acessando {termo}"
 
 # --- CLASSE: VOZ (GERENCIADA) ---
-class VoiceManager(threading.Thread):
-    def __init__(self):
-        super().__init__()
-        self.daemon = True # Mata a thread quando o programa fecha
-        self.start()
+# Frases fixas: sintetizadas em arquivo uma vez e tocadas direto nas próximas
+FRASES_FIXAS = [
+    "Áudio ajustado.",
+    "Brilho ajustado.",
+    "Monitor não suporta controle de brilho via software.",
+    "Captura de tela salva.",
+] + [resposta for _, resposta in PROGRAMAS.values()]
 
-    def run(self):
-        try:
-            engine = pyttsx3.init()
-            voices = engine.getProperty('voices')
-            # Tenta achar voz em PT-BR
-            for v in voices:
-                if "brazil" in v.name.lower() or "portuguese" in v.name.lower():
-                    engine.setProperty('voice', v.id)
-                    break
-            engine.setProperty('rate', 180) # Velocidade da fala
-            
-            while True:
-                texto = audio_queue.get()
-                if texto:
-                    try:
-                        engine.say(texto)
-                        engine.runAndWait()
-                    except: pass
-                audio_queue.task_done()
-        except Exception as e:
-            print(f"Erro fatal no motor de voz: {e}")
+PASTA_CACHE_VOZ = os.path.join(PASTA_APP, "cache_voz")
 
-    def falar(self, texto):
-        audio_queue.put(texto)
+class VoiceManager(SpeechScheduler):
+    """Fila de fala com prioridade e interrupção (ver isa_core/speech_scheduler.py)"""
+
+    def __init__(self, engine_factory=None, max_fila=8, cache_audio=None):
+        if cache_audio is None:
+            cache_audio = TTSAudioCache(PASTA_CACHE_VOZ)
+            cache_audio.fixar(FRASES_FIXAS)
+        super().__init__(max_fila=max_fila, cache_audio=cache_audio)
+        self.engine_factory = engine_factory  # Permite usar um motor falso (testes/benchmarks)
+        self.start()
+
+    def criar_engine(self):
+        if self.engine_factory:
+            return self.engine_factory()
+        engine = pyttsx3.init()
+        voices = engine.getProperty('voices')
+        # Tenta achar voz em PT-BR
+        for v in voices:
+            if "brazil" in v.name.lower() or "portuguese" in v.name.lower():
+                engine.setProperty('voice', v.id)
+                break
+        engine.setProperty('rate', 180) # Velocidade da fala
+        return engine
 
 # --- CLASSE: CÉREBRO (IA) - MELHORADA ---
 class Brain:
-    def __init__(self, api_key):
+    # Limites do pool de conversas (uma por navegador/quiosque)
+    MAX_SESSOES = 64
+    TTL_SESSAO = 15 * 60   # segundos sem uso até a conversa ser descartada
+    MAX_TOKENS = 800       # orçamento por chamada; acima disso os turnos antigos viram resumo
+    MANTER_TURNOS = 2      # turnos recentes que nunca entram no resumo
+
+    # Personalidade: instrução de sistema do modelo (não ocupa o histórico)
+    INSTRUCAO_SISTEMA = (
+        "Você é a ISA 6.0, uma assistente virtual do IFCE Campus Canindé. "
+        "Seja útil, educada e breve. "
+        "Se o usuário pedir para gerar texto, música ou poema, faça com criatividade. "
+        "Responda em no máximo 3 frases, a menos que peçam um texto longo."
+    )
+
+    # Cache de respostas para as perguntas repetidas do campus
+    ARQUIVO_CACHE = os.path.join(PASTA_APP, "cache_respostas.json")
+    TTL_CACHE = 24 * 3600
+    MAX_CACHE = 500
+
+    # Base local do campus: acima desta confiança responde sem chamar a IA
+    CONFIANCA_DIRETA = 0.8
+
+    def __init__(self, api_key, model=None, cache=None, conhecimento=None, cliente=None, metricas=None):
         self.connected = False
-        if api_key:
+        self.pool = None
+        self.metricas = metricas if metricas is not None else Metricas()
+        self.respostas = self.metricas.contador(
+            "isa_respostas_ia_total", "Perguntas respondidas pelo Brain, por origem.", "origem"
+        )
+        self.erros = self.metricas.contador("isa_erros_ia_total", "Erros nas chamadas ao Gemini, por tipo.", "tipo")
+        # Cota, fila, prazo, repetições e disjuntor de todas as chamadas ao Gemini
+        self.cliente = cliente if cliente is not None else ClienteIA()
+        self.cache = cache if cache is not None else ResponseCache(
+            self.ARQUIVO_CACHE, ttl=self.TTL_CACHE, max_itens=self.MAX_CACHE
+        )
+        self.conhecimento = conhecimento  # BaseConhecimento ou None
+
+        if model is None and api_key:
             try:
                 genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
-                
-                # Prompt de sistema para dar personalidade
-                system_instruction = """
-                Você é a ISA 6.0, uma assistente virtual do IFCE Campus Canindé. 
-                Seja útil, educada e breve. 
-                Se o usuário pedir para gerar texto, música ou poema, faça com criatividade.
-                Responda em no máximo 3 frases, a menos que peçam um texto longo.
-                """
-                
-                self.chat = self.model.start_chat(history=[
-                    {"role": "user", "parts": "Quem é você e como deve agir?"},
-                    {"role": "model", "parts": system_instruction}
-                ])
-                self.connected = True
-                print(">>> SUCESSO: ISA 6.0 Conectada ao Google Gemini!")
+                model = genai.GenerativeModel('gemini-1.5-flash', system_instruction=self.INSTRUCAO_SISTEMA)
             except Exception as e:
                 print(f">>> ERRO FATAL DE CONEXÃO: {e}")
-                self.connected = False
-        else:
+                model = None
+
+        if model is not None:
+            self.model = model
+            self.orcamento = OrcamentoContexto(
+                self._resumir,
+                max_tokens=self.MAX_TOKENS,
+                manter_turnos=self.MANTER_TURNOS,
+                tokens_fixos=estimar_tokens(self.INSTRUCAO_SISTEMA),
+            )
+            self.pool = ChatPool(
+                self._novo_chat,
+                max_sessoes=self.MAX_SESSOES,
+                ttl_ocioso=self.TTL_SESSAO,
+                orcamento=self.orcamento,
+            )
+            self.connected = True
+            print(">>> SUCESSO: ISA 6.0 Conectada ao Google Gemini!")
+        elif not api_key:
             print(">>> AVISO: Nenhuma chave API encontrada no .env")
 
-    def pensar(self, texto):
+    def _novo_chat(self):
+        return self.model.start_chat(history=[])
+
+    def _resumir(self, resumo_anterior, mensagens):
+        """Resumo contínuo da conversa, feito pelo próprio modelo (uma chamada à parte, com cota e prazo)"""
+        conversa = "\n".join(f"{'Usuário' if papel == 'user' else 'ISA'}: {texto}" for papel, texto in mensagens)
+        prompt = (
+            "Atualize o resumo desta conversa em no máximo 5 frases curtas, mantendo nomes, "
+            "pedidos e fatos que possam ser citados depois.\n\n"
+            f"Resumo anterior: {resumo_anterior or '(nenhum)'}\n\nNovas mensagens:\n{conversa}"
+        )
+        resposta = self.cliente.chamar(
+            lambda timeout: self.model.generate_content(prompt, request_options={"timeout": timeout})
+        )
+        return resposta.text
+
+    def _pode_usar_cache(self, texto, sessao, usar_cache):
+        # O cache vale para todas as sessões: só perguntas que abrem a conversa e
+        # cuja resposta não muda com a data nem com quem pergunta
+        return usar_cache and resposta_compartilhavel(texto) and not self.pool.mensagens(sessao)
+
+    def _resposta_local(self, texto):
+        # Continuações dependem da conversa: a busca só com a frase não basta
+        if self.conhecimento is None or depende_de_contexto(texto):
+            return None
+        return self.conhecimento.resposta_direta(texto, self.CONFIANCA_DIRETA)
+
+    def _com_contexto(self, texto):
+        """
+        Pergunta + só as passagens relevantes da base do campus (prompt curto).
+        As passagens valem só para esta chamada: no histórico fica a pergunta
+        pura (no_historico), para não serem reenviadas a cada turno.
+        """
+        contexto = self.conhecimento.contexto(texto) if self.conhecimento is not None else ""
+        if not contexto:
+            return texto
+        return f"Informações do campus (use se forem úteis):\n{contexto}\n\nPergunta: {texto}"
+
+    def pensar(self, texto, sessao="padrao", usar_cache=True):
+        with self.metricas.etapa("base_local"):
+            local = self._resposta_local(texto)
+        if local:
+            self.respostas.inc("base_local")
+            return local
+
         if not self.connected: 
             return "Minha conexão com a IA não foi estabelecida. Verifique a chave API no terminal."
+
+        usar_cache = self._pode_usar_cache(texto, sessao, usar_cache)
+        if usar_cache:
+            guardada = self.cache.obter(texto)
+            if guardada is not None:
+                self.respostas.inc("cache")
+                return guardada
         
+        prompt = self._com_contexto(texto)
+        # Resumo dos turnos antigos antes da chamada (se falhar, vale o resumo local)
+        self.pool.compactar(sessao, prompt)
         try:
-            # Envia a mensagem para o Google
-            response = self.chat.send_message(texto)
-            return response.text
+            # Envia a mensagem para o Google (no chat desta sessão)
+            with self.metricas.etapa("gemini"):
+                response = self.cliente.chamar(
+                    lambda timeout: self.pool.enviar(sessao, prompt, no_historico=texto, request_options={"timeout": timeout})
+                )
+        except IAIndisponivel as e:
+            self.erros.inc(type(e).__name__)
+            raise  # Fila cheia, circuito aberto ou prazo esgotado: a rota responde 503
         except Exception as e:
+            self.erros.inc(type(e).__name__)
             # ISSO VAI MOSTRAR O ERRO REAL NO SEU VS CODE
             print(f">>> ERRO AO PROCESSAR RESPOSTA: {e}")
             return "Tive um problema técnico. Olhe o terminal do VS Code para ver o erro."
 
+        self.respostas.inc("gemini")
+        if usar_cache:
+            self.cache.guardar(texto, response.text)
+        return response.text
+
+    def pensar_stream(self, texto, sessao="padrao", usar_cache=True):
+        """Igual ao pensar(), mas gera a resposta em pedaços conforme o Gemini escreve"""
+        with self.metricas.etapa("base_local"):
+            local = self._resposta_local(texto)
+        if local:
+            self.respostas.inc("base_local")
+            yield local
+            return
+
+        if not self.connected:
+            yield "Minha conexão com a IA não foi estabelecida. Verifique a chave API no terminal."
+            return
+
+        usar_cache = self._pode_usar_cache(texto, sessao, usar_cache)
+        if usar_cache:
+            guardada = self.cache.obter(texto)
+            if guardada is not None:
+                self.respostas.inc("cache")
+                yield guardada
+                return
+
+        prompt = self._com_contexto(texto)
+        self.pool.compactar(sessao, prompt)
+        pedacos = []
+        inicio = time.perf_counter()
+        try:
+            chamada = self.cliente.chamar_stream(
+                lambda timeout: self.pool.enviar_stream(sessao, prompt, no_historico=texto, request_options={"timeout": timeout})
+            )
+            for pedaco in chamada:
+                if not pedacos:
+                    # Tempo até o primeiro pedaço: o que a pessoa sente como espera
+                    self.metricas.etapas.observar("gemini_primeiro_pedaco", time.perf_counter() - inicio)
+                pedacos.append(pedaco)
+                yield pedaco
+        except IAIndisponivel as e:
+            self.erros.inc(type(e).__name__)
+            raise
+        except Exception as e:
+            self.erros.inc(type(e).__name__)
+            print(f">>> ERRO AO PROCESSAR RESPOSTA (STREAM): {e}")
+            yield "Tive um problema técnico. Olhe o terminal do VS Code para ver o erro."
+            return
+
+        self.metricas.etapas.observar("gemini_stream", time.perf_counter() - inicio)
+        self.respostas.inc("gemini")
+        if usar_cache:
+            self.cache.guardar(texto, "".join(pedacos))
+
 # --- INICIALIZAÇÃO ---
 sys_ctrl = SystemController()
 voice_mgr = VoiceManager()
-brain = Brain(MINHA_CHAVE)
+# Documentos do campus (horários, FAQ, mapas) em .md/.txt; arquivos novos ou editados são reindexados sozinhos
+config_conhecimento = CONFIG.get("conhecimento", {})
+base_conhecimento = BaseConhecimento(
+    os.path.normpath(os.path.join(PASTA_APP, config_conhecimento.get("pasta", "../conhecimento")))
+)
+# Limites do Gemini (seção "gemini" do config.json): cota por minuto, fila e prazo por chamada
+brain = Brain(
+    MINHA_CHAVE, conhecimento=base_conhecimento, cliente=ClienteIA(**CONFIG.get("gemini", {})), metricas=metricas
+)
+
+# Lidas só quando /api/metrics é chamado (os componentes já contam)
+metricas.leitura("isa_fala_fila", "Falas esperando na fila do TTS.", lambda: voice_mgr.estatisticas()["profundidade"])
+metricas.leitura("isa_falas_total", "Falas do TTS por evento.", lambda: dict(voice_mgr.contadores), "evento", "counter")
+metricas.leitura("isa_cache_respostas_total", "Consultas ao cache de respostas da IA.",
+                 lambda: {"hit": brain.cache.hits, "miss": brain.cache.misses}, "resultado", "counter")
+metricas.leitura("isa_cache_audio_total", "Consultas ao cache de áudio do TTS.",
+                 lambda: {"hit": voice_mgr.cache_audio.hits, "miss": voice_mgr.cache_audio.misses}
+                 if voice_mgr.cache_audio else {}, "resultado", "counter")
+metricas.leitura("isa_ia_em_voo", "Chamadas ao Gemini em andamento.", lambda: brain.cliente.estado()["em_voo"])
+metricas.leitura("isa_ia_fila", "Chamadas ao Gemini esperando vaga ou cota.", lambda: brain.cliente.estado()["na_fila"])
+metricas.leitura("isa_ia_circuito", "Estado do disjuntor do Gemini (1 no estado atual).",
+                 lambda: {e: int(brain.cliente.disjuntor.estado == e) for e in ("fechado", "aberto", "meio_aberto")}, "estado")
+
+# Capturas de tela: o quadro é pego na hora e vira JPEG + miniatura em segundo plano
+PASTA_PRINTS = os.path.join(PASTA_APP, "static", "prints")
+ESPERA_PRINT = 10  # segundos que /api/prints/<id> espera a codificação terminar
+capturas = HistoricoCapturas(PASTA_PRINTS, pyautogui.screenshot, **CONFIG.get("capturas", {}))
+
+# --- SESSÃO DO NAVEGADOR ---
+COOKIE_SESSAO = "isa_sessao"
+
+def obter_sessao(req):
+    """Id da conversa: header X-Session-Id (quiosques) ou cookie do navegador"""
+    sessao = req.headers.get("X-Session-Id") or req.cookies.get(COOKIE_SESSAO)
+    if sessao:
+        return sessao, False
+    return uuid.uuid4().hex, True
 
 # --- ROTAS FLASK ---
 @app.route('/')
 def index(): return render_template('index.html')
 
+def resposta_status(req):
+    """Última leitura já pronta; com ?historico=N inclui as leituras dos últimos N segundos"""
+    janela = req.args.get("historico", type=float)
+    if janela:
+        amostras = sys_ctrl.amostrador.historico(janela)
+        corpo = json.dumps({
+            **sys_ctrl.get_status(),
+            "historico": [{"t": round(a.instante, 1), **a.dados} for a in amostras],
+        })
+        return corpo, 200, {"Content-Type": "application/json"}
+
+    amostra = sys_ctrl.amostrador.ultima()
+    cabecalhos = {"Content-Type": "application/json", "ETag": amostra.etag, "Cache-Control": "no-cache"}
+    if etag_confere(req.headers.get("If-None-Match"), amostra.etag):
+        return "", 304, cabecalhos  # Nada mudou desde a última consulta
+    return amostra.json, 200, cabecalhos
+
 @app.route('/api/status')
-def status(): return jsonify(sys_ctrl.get_status())
+def status(): return resposta_status(request)
 
-@app.route('/api/chat', methods=['POST'])
-def chat():
-    data = request.json
-    msg = data.get('msg', '').lower()
-    resp = ""
+INTERVALO_PING = 15  # segundos: comentário SSE para manter a conexão viva em proxies
+
+@app.route('/api/status/stream')
+def status_stream():
+    """Push das métricas via SSE: um evento com tudo e depois só o que mudou"""
+    assinatura = Assinatura()
+    atual, cancelar = sys_ctrl.amostrador.assinar(assinatura.entregar)
+
+    def gerar():
+        try:
+            yield evento_sse("metricas", atual)
+            while True:
+                delta = assinatura.esperar(INTERVALO_PING)
+                yield evento_sse("metricas", delta) if delta else ": ping\n\n"
+        finally:
+            cancelar()  # Navegador fechou a aba
+
+    resposta = Response(gerar(), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    return resposta
+
+@app.route('/api/cache', methods=['GET', 'DELETE'])
+def cache_respostas():
+    """Contadores do cache de respostas (GET) ou limpeza do cache (DELETE)"""
+    if request.method == 'DELETE':
+        brain.cache.limpar()
+    return jsonify(brain.cache.estatisticas())
+
+@app.route('/api/contexto')
+def contexto():
+    """Tokens estimados por chamada à IA e quantas conversas foram resumidas"""
+    return jsonify(brain.orcamento.estatisticas() if brain.pool is not None else {})
+
+@app.route('/api/ia')
+def estado_ia():
+    """Circuito (fechado/aberto/meio_aberto), fila e contadores das chamadas ao Gemini"""
+    return jsonify(brain.cliente.estado())
+
+@app.route('/api/metrics')
+def metrics():
+    """Métricas no formato do Prometheus: etapas (p50/p95/p99), intenções, cache, erros da IA, fila de fala e STT"""
+    return Response(metricas.prometheus(), content_type=TIPO_CONTEUDO)
+
+@app.route('/api/voz')
+def voz():
+    """Estado da fila de fala: profundidade, descartes e latência na fila"""
+    cache_audio = voice_mgr.cache_audio  # None sem player de áudio na máquina
+    return jsonify({**voice_mgr.estatisticas(), "cache_audio": cache_audio.estatisticas() if cache_audio else None})
+
+def arquivo_print(captura, miniatura=False):
+    """Resposta com o arquivo de uma captura já codificada (ou 404)"""
+    caminho = captura.miniatura if miniatura else captura.arquivo
+    if not os.path.exists(caminho):
+        return jsonify({"error": "captura não encontrada"}), 404
+    # O id nunca é reaproveitado: o navegador pode guardar a imagem para sempre
+    resposta = send_file(caminho, max_age=365 * 24 * 3600)
+    resposta.headers["Cache-Control"] += ", immutable"
+    return resposta
+
+@app.route('/api/prints')
+def prints():
+    """Histórico de capturas (mais recentes primeiro) e tempos de captura/codificação"""
+    return jsonify({**capturas.estatisticas(), "ids": capturas.listar()})
+
+@app.route('/api/prints/<id_captura>')
+@app.route('/api/prints/<id_captura>/miniatura', defaults={"miniatura": True})
+def print_arquivo(id_captura, miniatura=False):
+    captura = capturas.obter(id_captura)
+    if captura is None:
+        return jsonify({"error": "captura não encontrada"}), 404
+    try:
+        captura.pronta.result(timeout=ESPERA_PRINT)
+    except Exception:
+        return jsonify({"error": "captura indisponível"}), 503
+    return arquivo_print(captura, miniatura)
+
+def executar_comando(msg):
+    """Comandos locais (hardware, programas, sites). Retorna "" se não for comando."""
+    with metricas.etapa("rotear"):
+        intencao = ROTEADOR_COMANDOS.rotear(msg)
+    if intencao is None:
+        return ""
+    return executar_intencao(intencao)
+
+def executar_intencao(intencao):
+    """Executa uma intenção já roteada (também usada pelo pipeline de voz)"""
+    intencoes.inc(intencao.nome)
+    with metricas.etapa(f"comando_{intencao.nome}"):
+        return _executar_intencao(intencao)
+
+def _executar_intencao(intencao):
 
     # 1. Hardware e Sistema
-    if "volume" in msg:
-        if "aumentar" in msg or "sobe" in msg: resp = sys_ctrl.ajustar_volume("up")
-        elif "diminuir" in msg or "baixa" in msg: resp = sys_ctrl.ajustar_volume("down")
-        elif "mudo" in msg: resp = sys_ctrl.ajustar_volume("mute")
-    
-    elif "brilho" in msg or "luz" in msg:
-        if "aumentar" in msg or "mais" in msg: resp = sys_ctrl.ajustar_brilho("up")
-        elif "diminuir" in msg or "menos" in msg: resp = sys_ctrl.ajustar_brilho("down")
-
-    elif "print" in msg or "captura" in msg:
-        caminho = os.path.join("static", "print_last.png")
-        pyautogui.screenshot(caminho)
-        resp = "Captura de tela salva."
+    if intencao.nome == "volume":
+        return sys_ctrl.ajustar_volume(intencao.slots["acao"])
+
+    if intencao.nome == "brilho":
+        return sys_ctrl.ajustar_brilho(intencao.slots["acao"])
+
+    if intencao.nome == "print":
+        try:
+            captura = capturas.tirar()
+        except RaiaCheia:
+            return "Ainda estou salvando as capturas anteriores. Tente de novo em instantes."
+        # A imagem abre quando a codificação terminar (a rota espera por ela)
+        return f"Captura de tela salva.\n\n[![Captura de tela](/api/prints/{captura.id}/miniatura)](/api/prints/{captura.id})"
 
     # 2. Comandos de Abrir (Híbrido: App ou Site)
-    elif "abra" in msg or "abrir" in msg:
-        resp_prog = sys_ctrl.abrir_programa_universal(msg)
-        if resp_prog: 
-            resp = resp_prog 
-        else:
-            resp = sys_ctrl.abrir_site_rapido(msg)
+    alvo = intencao.slots["alvo"]
+    if not alvo:
+        return ""  # "abra" sozinho: deixa a IA perguntar o quê
+    if intencao.nome == "abrir" and intencao.slots.get("tipo") != "site":
+        resp_prog = sys_ctrl.abrir_programa_universal(alvo)
+        if resp_prog:
+            return resp_prog
 
     # 3. Site Direto
-    elif "acesse" in msg or "site" in msg:
-        resp = sys_ctrl.abrir_site_rapido(msg)
+    return sys_ctrl.abrir_site_rapido(alvo, intencao.slots.get("frase"))
+
+# Imagens e links em markdown aparecem no chat, mas não são lidos em voz alta
+_IMAGEM_MARKDOWN = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK_MARKDOWN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+
+def texto_falado(texto):
+    """Resposta sem markdown: sem asteriscos, imagens, e links viram só o texto"""
+    return _LINK_MARKDOWN.sub(r"\1", _IMAGEM_MARKDOWN.sub("", texto)).replace("*", "").strip()
+
+def gravar_cookie_sessao(resposta, sessao, sessao_nova):
+    if sessao_nova:
+        resposta.set_cookie(COOKIE_SESSAO, sessao, httponly=True, samesite="Lax")
+    return resposta
+
+# --- LÓGICA DO CHAT (usada pelo servidor Flask e pelo modo assíncrono em asgi.py) ---
+def responder(msg, sessao, usar_cache=True):
+    """Executa o comando ou consulta a IA e devolve o texto da resposta"""
+    with metricas.etapa("chat"):
+        voice_mgr.interromper()  # Nova pergunta: a ISA para de falar da anterior
+        resp = executar_comando(msg)
+        prioridade = PRIORIDADE_COMANDO
+
+        # 4. Inteligência Artificial (Se nada acima funcionar)
+        if not resp:
+            with metricas.etapa("ia"):
+                resp = brain.pensar(msg, sessao, usar_cache)
+            prioridade = PRIORIDADE_CHAT
+
+        # Falar resposta (se não for muito longa)
+        if len(resp) < 300:
+            with metricas.etapa("fala"):
+                voice_mgr.falar(texto_falado(resp), prioridade)
+
+        return resp
 
-    # 4. Inteligência Artificial (Se nada acima funcionar)
-    if not resp:
-        resp = brain.pensar(msg)
+def gerar_resposta_stream(msg, sessao, usar_cache=True):
+    """Igual ao responder(), mas gera eventos SSE conforme a resposta chega"""
+    # O span "chat" cobre o stream inteiro, inclusive o tempo de envio dos eventos
+    with metricas.etapa("chat"):
+        voice_mgr.interromper()
+        resp = executar_comando(msg)
+        if resp:
+            if len(resp) < 300:
+                with metricas.etapa("fala"):
+                    voice_mgr.falar(texto_falado(resp), PRIORIDADE_COMANDO)
+            yield evento_sse("token", {"texto": resp})
+            yield evento_sse("fim", {"response": resp})
+            return
 
-    # Falar resposta (se não for muito longa)
-    if len(resp) < 300:
-        voice_mgr.falar(resp.replace("*", ""))
+        # Fala cada frase assim que ela fica completa, até 300 caracteres falados.
+        # Diferente do responder(), que não fala respostas longas: aqui o início
+        # já foi falado antes de se saber o tamanho total, então resposta longa
+        # tem as primeiras frases faladas e o resto só aparece na tela.
+        divisor = DivisorFrases()
+        completo = []
+        falados = 0
 
-    return jsonify({"response": resp})
+        def falar_frase(frase):
+            nonlocal falados
+            frase = texto_falado(frase)
+            falados += len(frase)
+            if frase and falados < 300:
+                with metricas.etapa("fala"):
+                    voice_mgr.falar(frase, PRIORIDADE_CHAT)
+
+        try:
+            inicio = time.perf_counter()
+            with metricas.etapa("ia"):
+                for pedaco in brain.pensar_stream(msg, sessao, usar_cache):
+                    if not completo:
+                        metricas.etapas.observar("ia_primeiro_pedaco", time.perf_counter() - inicio)
+                    completo.append(pedaco)
+                    yield evento_sse("token", {"texto": pedaco})
+                    for frase in divisor.alimentar(pedaco):
+                        falar_frase(frase)
+        except IAIndisponivel as e:
+            # O stream já começou (status 200): o aviso e o Retry-After vão no evento
+            yield evento_sse("erro", {"error": "indisponivel", "response": e.mensagem, "retry_after": e.retry_after})
+            return
+        for frase in divisor.finalizar():
+            falar_frase(frase)
+        yield evento_sse("fim", {"response": "".join(completo)})
+
+# Microfone fica aberto e calibrado em segundo plano (aberto no primeiro /api/listen)
+captura = None
+_lock_captura = threading.Lock()
+
+def obter_captura():
+    global captura
+    with _lock_captura:
+        if captura is None or not captura.is_alive():
+            # 16 kHz: o formato que os motores offline esperam, sem conversão
+            captura = CaptureService(lambda: sr.Microphone(sample_rate=TAXA))
+            captura.start()
+        return captura
+
+# Reconhecimento de voz: cadeia de motores do config.json (ex.: Vosk offline -> Google)
+stt = criar_stt(CONFIG.get("stt"), PASTA_APP)
+
+def registrar_stt(motor, segundos, sucesso):
+    duracao_stt.observar(motor, segundos)
+    if not sucesso:
+        falhas_stt.inc(motor)
+
+stt.ao_reconhecer = registrar_stt
+
+def ouvir_microfone():
+    """Captura uma frase do microfone e devolve o texto (lança sr.WaitTimeoutError)"""
+    voice_mgr.interromper()  # Não grava a própria voz da ISA
+    servico = obter_captura()
+    # Timeout curto para não travar a interface
+    with metricas.etapa("microfone"):
+        audio = servico.capturar(timeout=5, limite_frase=10)
+    return stt.reconhecer(audio)
+
+# Comandos de hardware executados assim que aparecem no texto parcial,
+# sem esperar o fim da frase
+INTENCOES_RAPIDAS = {"volume", "brilho", "print"}
+pipeline_voz = PipelineVoz(stt, ROTEADOR_COMANDOS.rotear, INTENCOES_RAPIDAS, timeout=5, limite_frase=10)
+
+def ouvir_stream():
+    """Igual ao ouvir_microfone(), mas gera eventos SSE: parciais, comando rápido e texto final"""
+    voice_mgr.interromper()
+    try:
+        servico = obter_captura()
+        eventos = pipeline_voz.processar(
+            servico.transmitir(limite=15), servico.recognizer.energy_threshold, servico.taxa, servico.largura
+        )
+        for evento in eventos:
+            if evento.tipo == "parcial":
+                yield evento_sse("parcial", {"texto": evento.texto})
+            elif evento.tipo == "comando":
+                resp = executar_intencao(evento.intencao)
+                voice_mgr.falar(texto_falado(resp), PRIORIDADE_COMANDO)
+                yield evento_sse("comando", {"texto": evento.texto, "response": resp})
+            elif evento.tipo == "final":
+                yield evento_sse("final", {"texto": evento.texto})
+            else:
+                yield evento_sse("erro", {"error": "timeout"})
+    except MicrofoneOcupado:
+        yield evento_sse("erro", {"error": "ocupado"})
+    except Exception as e:
+        print(f"Erro Mic: {e}")
+        yield evento_sse("erro", {"error": "erro"})
+
+def resposta_indisponivel(erro):
+    """
+    503 rápido com Retry-After: o front mostra o aviso em vez de esperar a IA.
+    Devolve (dict, status, headers), que o Flask e o Quart convertem em JSON
+    cada um no seu contexto.
+    """
+    corpo = {"response": erro.mensagem, "error": "indisponivel", "retry_after": erro.retry_after}
+    return corpo, 503, {"Retry-After": str(erro.retry_after)}
+
+@app.route('/api/chat', methods=['POST'])
+def chat():
+    data = request.json
+    msg = data.get('msg', '').lower()
+    sessao, sessao_nova = obter_sessao(request)
+    usar_cache = data.get('cache', True)  # O front pode pedir resposta sem cache
+
+    try:
+        resp = responder(msg, sessao, usar_cache)
+    except IAIndisponivel as e:
+        corpo, status, headers = resposta_indisponivel(e)
+        return jsonify(corpo), status, headers
+    return gravar_cookie_sessao(jsonify({"response": resp}), sessao, sessao_nova)
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Mesmo fluxo do /api/chat, mas envia a resposta da IA via SSE (token a token)"""
+    data = request.json
+    msg = data.get('msg', '').lower()
+    sessao, sessao_nova = obter_sessao(request)
+    usar_cache = data.get('cache', True)
+
+    gerador = gerar_resposta_stream(msg, sessao, usar_cache)
+    resposta = Response(stream_with_context(gerador), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"  # Evita buffer em proxy (nginx)
+    return gravar_cookie_sessao(resposta, sessao, sessao_nova)
 
 @app.route('/api/listen', methods=['POST'])
 def listen():
-    r = sr.Recognizer()
     try:
-        with sr.Microphone() as source:
-            r.adjust_for_ambient_noise(source, duration=0.2)
-            # Timeout curto para não travar a interface
-            audio = r.listen(source, timeout=5, phrase_time_limit=10)
-            text = r.recognize_google(audio, language='pt-BR')
-            return jsonify({"success": True, "text": text})
+        text = ouvir_microfone()
+        return jsonify({"success": True, "text": text})
     except sr.WaitTimeoutError:
         return jsonify({"success": False, "error": "timeout"})
+    except MicrofoneOcupado:
+        return jsonify({"success": False, "error": "ocupado"})
     except Exception as e:
         print(f"Erro Mic: {e}")
         return jsonify({"success": False, "error": "erro"})
 
+# Modo mãos livres: detector local da palavra-chave (precisa de um motor incremental, ex.: Vosk)
+detector_palavra = criar_detector(stt, CONFIG.get("palavra_chave", {}).get("palavras", PALAVRAS_PADRAO))
+_lock_maos_livres = threading.Lock()
+
+def maos_livres_stream():
+    """Escuta contínua: espera a palavra-chave e então segue como o ouvir_stream() (SSE)"""
+    if detector_palavra is None:
+        yield evento_sse("erro", {"error": "sem_detector"})
+        return
+    if not _lock_maos_livres.acquire(blocking=False):
+        yield evento_sse("erro", {"error": "ocupado"})
+        return
+    try:
+        servico = obter_captura()
+        while True:
+            # A cada INTERVALO_PING sem a palavra-chave, um ping detecta se a aba foi fechada
+            if not esperar_palavra_chave(servico, detector_palavra, timeout=INTERVALO_PING):
+                yield ": ping\n\n"
+                continue
+            yield evento_sse("ativada", detector_palavra.estatisticas())
+            yield from ouvir_stream()
+    except MicrofoneOcupado:
+        yield evento_sse("erro", {"error": "ocupado"})
+    except Exception as e:
+        print(f"Erro Mic (mãos livres): {e}")
+        yield evento_sse("erro", {"error": "erro"})
+    finally:
+        _lock_maos_livres.release()
+
+@app.route('/api/listen/stream', methods=['POST'])
+def listen_stream():
+    """Escuta com VAD: transcrição parcial ao vivo e comandos de hardware sem esperar o fim da frase"""
+    resposta = Response(stream_with_context(ouvir_stream()), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    return resposta
+
+@app.route('/api/listen/wake', methods=['POST'])
+def listen_wake():
+    """Mãos livres: fica ouvindo até a aba fechar; cada "ISA" abre uma escuta como a do /api/listen/stream"""
+    resposta = Response(stream_with_context(maos_livres_stream()), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    return resposta
+
 if __name__ == '__main__':
     print("--- ISA 6.0: ULTIMATE EDITION INICIADA ---")
     app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False)
\ No newline at end of file
@@ -0,0 +1,295 @@
+"""
+ISA 6.0 - modo assíncrono (ASGI).
+
+Mesmas rotas do app.py, servidas pelo Quart (API igual à do Flask) num loop
+asyncio. As chamadas lentas (Gemini, microfone) rodam em pools de threads
+próprios e são aguardadas com `await`, então um "ouvir" de 15 s não segura
+o /api/status dos outros painéis.
+
+Limites de concorrência por rota:
+    /api/chat e /api/chat/stream -> LIMITE_CHAT (max_em_voo + max_fila do
+                                    ClienteIA) ao mesmo tempo; quem chega
+                                    além disso recebe 503 com Retry-After
+                                    na hora, sem esperar thread.
+    /api/listen, /api/listen/stream e /api/listen/wake
+                                 -> LIMITE_MICROFONE (1): só existe um
+                                    microfone; quem chega com ele ocupado
+                                    recebe {"error": "ocupado"} na hora.
+                                    O modo mãos livres segura o microfone
+                                    enquanto a aba estiver aberta.
+                                    Com o Gemini fora do ar ou a fila do
+                                    ClienteIA cheia, /api/chat responde 503
+                                    com Retry-After na hora.
+    /api/status, /api/cache, /api/ia, /api/metrics
+                                 -> sem limite, respondem direto no loop.
+    /api/prints/<id>             -> sem limite; espera a codificação da
+                                    captura no loop, sem thread própria.
+    /api/status/stream           -> sem limite; cada painel é só uma tarefa
+                                    esperando no loop, sem thread própria.
+
+Executar:
+    pip install quart hypercorn
+    hypercorn asgi:app --bind 0.0.0.0:5000
+    (ou simplesmente: python asgi.py)
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from quart import Quart, Response, jsonify, render_template, request, send_file
+
+import app as isa  # Reaproveita controladores, Brain e voz do app Flask
+from isa_core.llm_client import FilaCheia
+from isa_core.streaming import evento_sse
+
+# Uma thread para cada chamada que o ClienteIA aceita (rodando ou na fila):
+# assim é ele quem recusa o excesso, e não uma fila sem limite no pool
+LIMITE_CHAT = isa.brain.cliente.max_em_voo + isa.brain.cliente.max_fila
+LIMITE_MICROFONE = 1
+
+app = Quart(__name__)
+
+_pool_chat = ThreadPoolExecutor(max_workers=LIMITE_CHAT, thread_name_prefix="isa-chat")
+_pool_microfone = ThreadPoolExecutor(max_workers=LIMITE_MICROFONE, thread_name_prefix="isa-mic")
+_microfone_livre = asyncio.Semaphore(LIMITE_MICROFONE)
+_chat_livre = asyncio.Semaphore(LIMITE_CHAT)
+
+
+def chat_lotado():
+    """503 na hora quando todas as vagas do chat estão ocupadas."""
+    corpo, status, headers = isa.resposta_indisponivel(FilaCheia(1))
+    return jsonify(corpo), status, headers
+
+
+async def em_thread(pool, funcao, *args):
+    """Roda uma função bloqueante no pool indicado sem travar o loop."""
+    return await asyncio.get_running_loop().run_in_executor(pool, funcao, *args)
+
+
+async def iterar_em_thread(pool, gerador):
+    """Consome um gerador bloqueante no pool, entregando cada item ao loop."""
+    loop = asyncio.get_running_loop()
+    fila = asyncio.Queue()
+    fim = object()
+    parar = threading.Event()
+
+    def consumir():
+        try:
+            for item in gerador:
+                if parar.is_set():
+                    break
+                loop.call_soon_threadsafe(fila.put_nowait, item)
+        finally:
+            gerador.close()
+            loop.call_soon_threadsafe(fila.put_nowait, fim)
+
+    tarefa = loop.run_in_executor(pool, consumir)
+    try:
+        while True:
+            item = await fila.get()
+            if item is fim:
+                break
+            yield item
+    finally:
+        parar.set()  # Cliente desconectou: o gerador é fechado no próximo item
+    await tarefa  # Propaga exceções do gerador
+
+
+# --- ROTAS ---
+@app.route('/')
+async def index():
+    return await render_template('index.html')
+
+
+@app.route('/api/status')
+async def status():
+    return isa.resposta_status(request)
+
+
+@app.route('/api/status/stream')
+async def status_stream():
+    loop = asyncio.get_running_loop()
+    sinal = asyncio.Event()
+    pendente = {}
+    lock = threading.Lock()
+
+    def entregar(delta):
+        # Chamado na thread do amostrador: mescla e acorda a tarefa no loop
+        with lock:
+            pendente.update(delta)
+        loop.call_soon_threadsafe(sinal.set)
+
+    atual, cancelar = isa.sys_ctrl.amostrador.assinar(entregar)
+
+    async def gerar():
+        try:
+            yield evento_sse("metricas", atual)
+            while True:
+                try:
+                    await asyncio.wait_for(sinal.wait(), isa.INTERVALO_PING)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                sinal.clear()
+                with lock:
+                    delta = dict(pendente)
+                    pendente.clear()
+                if delta:
+                    yield evento_sse("metricas", delta)
+        finally:
+            cancelar()
+
+    resposta = Response(gerar(), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    resposta.timeout = None
+    return resposta
+
+
+@app.route('/api/cache', methods=['GET', 'DELETE'])
+async def cache_respostas():
+    if request.method == 'DELETE':
+        isa.brain.cache.limpar()
+    return jsonify(isa.brain.cache.estatisticas())
+
+
+@app.route('/api/contexto')
+async def contexto():
+    return jsonify(isa.brain.orcamento.estatisticas() if isa.brain.pool is not None else {})
+
+
+@app.route('/api/ia')
+async def estado_ia():
+    return jsonify(isa.brain.cliente.estado())
+
+
+@app.route('/api/metrics')
+async def metrics():
+    return Response(isa.metricas.prometheus(), content_type=isa.TIPO_CONTEUDO)
+
+
+@app.route('/api/voz')
+async def voz():
+    cache_audio = isa.voice_mgr.cache_audio  # None sem player de áudio na máquina
+    return jsonify({**isa.voice_mgr.estatisticas(), "cache_audio": cache_audio.estatisticas() if cache_audio else None})
+
+
+@app.route('/api/prints')
+async def prints():
+    return jsonify({**isa.capturas.estatisticas(), "ids": isa.capturas.listar()})
+
+
+@app.route('/api/prints/<id_captura>')
+@app.route('/api/prints/<id_captura>/miniatura', defaults={"miniatura": True})
+async def print_arquivo(id_captura, miniatura=False):
+    captura = isa.capturas.obter(id_captura)
+    if captura is None:
+        return jsonify({"error": "captura não encontrada"}), 404
+    try:
+        # Espera a codificação no loop, sem ocupar uma thread
+        await asyncio.wait_for(asyncio.wrap_future(captura.pronta), isa.ESPERA_PRINT)
+    except Exception:
+        return jsonify({"error": "captura indisponível"}), 503
+    caminho = captura.miniatura if miniatura else captura.arquivo
+    if not os.path.exists(caminho):
+        return jsonify({"error": "captura não encontrada"}), 404
+    resposta = await send_file(caminho)
+    resposta.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return resposta
+
+
+@app.route('/api/chat', methods=['POST'])
+async def chat():
+    data = await request.get_json()
+    msg = data.get('msg', '').lower()
+    sessao, sessao_nova = isa.obter_sessao(request)
+    usar_cache = data.get('cache', True)
+    if _chat_livre.locked():
+        return chat_lotado()
+
+    async with _chat_livre:
+        try:
+            resp = await em_thread(_pool_chat, isa.responder, msg, sessao, usar_cache)
+        except isa.IAIndisponivel as e:
+            corpo, status, headers = isa.resposta_indisponivel(e)
+            return jsonify(corpo), status, headers
+    return isa.gravar_cookie_sessao(jsonify({"response": resp}), sessao, sessao_nova)
+
+
+@app.route('/api/chat/stream', methods=['POST'])
+async def chat_stream():
+    data = await request.get_json()
+    msg = data.get('msg', '').lower()
+    sessao, sessao_nova = isa.obter_sessao(request)
+    usar_cache = data.get('cache', True)
+    if _chat_livre.locked():
+        return chat_lotado()
+
+    async def gerar():
+        async with _chat_livre:
+            async for evento in iterar_em_thread(_pool_chat, isa.gerar_resposta_stream(msg, sessao, usar_cache)):
+                yield evento
+
+    resposta = Response(gerar(), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    resposta.timeout = None  # Respostas longas da IA não devem ser cortadas
+    return isa.gravar_cookie_sessao(resposta, sessao, sessao_nova)
+
+
+@app.route('/api/listen', methods=['POST'])
+async def listen():
+    if _microfone_livre.locked():
+        return jsonify({"success": False, "error": "ocupado"})
+
+    async with _microfone_livre:
+        try:
+            text = await em_thread(_pool_microfone, isa.ouvir_microfone)
+            return jsonify({"success": True, "text": text})
+        except isa.sr.WaitTimeoutError:
+            return jsonify({"success": False, "error": "timeout"})
+        except Exception as e:
+            print(f"Erro Mic: {e}")
+            return jsonify({"success": False, "error": "erro"})
+
+
+
+@app.route('/api/listen/stream', methods=['POST'])
+async def listen_stream():
+    if _microfone_livre.locked():
+        return Response(evento_sse("erro", {"error": "ocupado"}), mimetype="text/event-stream")
+
+    async def gerar():
+        async with _microfone_livre:
+            async for evento in iterar_em_thread(_pool_microfone, isa.ouvir_stream()):
+                yield evento
+
+    resposta = Response(gerar(), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    resposta.timeout = None
+    return resposta
+
+
+
+@app.route('/api/listen/wake', methods=['POST'])
+async def listen_wake():
+    if _microfone_livre.locked():
+        return Response(evento_sse("erro", {"error": "ocupado"}), mimetype="text/event-stream")
+
+    async def gerar():
+        async with _microfone_livre:
+            async for evento in iterar_em_thread(_pool_microfone, isa.maos_livres_stream()):
+                yield evento
+
+    resposta = Response(gerar(), mimetype="text/event-stream")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.headers["X-Accel-Buffering"] = "no"
+    resposta.timeout = None
+    return resposta
+
+
+if __name__ == '__main__':
+    print("--- ISA 6.0: ULTIMATE EDITION (MODO ASSÍNCRONO) ---")
+    app.run(host='0.0.0.0', port=5000)
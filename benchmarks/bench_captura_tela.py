@@ -0,0 +1,91 @@
+"""
+Latência do comando "print" do Prototipo Ultimate: PNG na requisição x captura em segundo plano.
+
+Compara:
+    inline -> pega a tela e grava o PNG de tela cheia antes de responder
+              (o pyautogui.screenshot(caminho) antigo)
+    fila   -> isa_core.screen_capture.HistoricoCapturas: pega o quadro,
+              responde na hora e codifica JPEG + miniatura num pool
+Mede o tempo até a resposta, o tempo até o arquivo ficar pronto e o tamanho
+em disco. A "tela" é uma imagem sintética do Pillow (gradiente com ruído,
+`--largura` x `--altura`), copiada a cada captura como um grab real.
+
+Uso (na raiz do repositório, com Pillow instalado):
+    python benchmarks/bench_captura_tela.py [--capturas 20] [--intervalo 0.5] [--formato JPEG]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image  # noqa: E402
+
+from isa_core.screen_capture import HistoricoCapturas  # noqa: E402
+
+
+def tela_sintetica(largura, altura):
+    """Gradiente com ruído: comprime mal como uma tela com fotos e texto."""
+    gradiente = Image.linear_gradient("L").resize((largura, altura))
+    ruido = Image.effect_noise((largura, altura), 64)
+    return Image.merge("RGB", (gradiente, ruido, gradiente.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+
+def bench_inline(tela, capturas, intervalo, pasta):
+    respostas = []
+    caminho = os.path.join(pasta, "print_last.png")
+    for _ in range(capturas):
+        inicio = time.perf_counter()
+        tela.copy().save(caminho)  # Grab + PNG na própria requisição
+        respostas.append(time.perf_counter() - inicio)
+        time.sleep(intervalo)
+    return respostas, respostas, os.path.getsize(caminho)
+
+
+def bench_fila(tela, capturas, intervalo, pasta, formato):
+    historico = HistoricoCapturas(pasta, tela.copy, max_itens=capturas, formato=formato, max_fila=capturas)
+    respostas, feitas, tiradas = [], [], []
+    for _ in range(capturas):
+        inicio = time.perf_counter()
+        captura = historico.tirar()
+        respostas.append(time.perf_counter() - inicio)
+        captura.pronta.add_done_callback(lambda _, inicio=inicio: feitas.append(time.perf_counter() - inicio))
+        tiradas.append(captura)
+        time.sleep(intervalo)
+    for captura in tiradas:
+        captura.pronta.result()
+    historico.encerrar()
+    ultima = tiradas[-1]
+    return respostas, feitas, os.path.getsize(ultima.arquivo) + os.path.getsize(ultima.miniatura)
+
+
+def resumo(valores):
+    valores = sorted(valores)
+    p95 = valores[int(0.95 * (len(valores) - 1))]
+    return f"p50={statistics.median(valores) * 1000:>7.1f} ms p95={p95 * 1000:>7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capturas", type=int, default=20)
+    parser.add_argument("--intervalo", type=float, default=0.5, help="segundos entre um print e outro")
+    parser.add_argument("--largura", type=int, default=1920)
+    parser.add_argument("--altura", type=int, default=1080)
+    parser.add_argument("--formato", default="JPEG", choices=["JPEG", "WEBP"])
+    args = parser.parse_args()
+
+    tela = tela_sintetica(args.largura, args.altura)
+    resultados = [
+        ("inline", bench_inline(tela, args.capturas, args.intervalo, tempfile.mkdtemp())),
+        ("fila", bench_fila(tela, args.capturas, args.intervalo, tempfile.mkdtemp(), args.formato)),
+    ]
+    print(f"{args.capturas} capturas de {args.largura}x{args.altura}\n")
+    for nome, (respostas, feitas, tamanho) in resultados:
+        print(f"{nome:<7} resposta {resumo(respostas)} | arquivo pronto {resumo(feitas)} | {tamanho / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Perguntas ao Gemini com o serviço lento e depois fora do ar: chamada direta x ClienteIA.
+
+Usa o modelo falso de isa_core.fakes, em três fases seguidas:
+    normal    -> responde em `--atraso` segundos
+    fora      -> toda chamada demora `--atraso` e falha com ResourceExhausted (429)
+    volta     -> responde normalmente de novo
+Em cada fase, `--usuarios` threads mandam `--perguntas` perguntas cada,
+com `--pausa` segundos entre uma e outra.
+Compara:
+    direto -> chat.send_message sem limite nenhum (o Brain antigo)
+    cliente -> isa_core.llm_client.ClienteIA: fila limitada, prazo,
+               repetições com jitter e disjuntor
+Mostra o tempo até a resposta (ou o erro), quantas chamadas chegaram ao
+modelo e quantas foram recusadas na hora (503 com Retry-After).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_cliente_ia.py [--usuarios 8] [--perguntas 5] [--atraso 0.2] [--pausa 0.3]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from isa_core.estatisticas import percentil  # noqa: E402
+from isa_core.fakes import FakeModel  # noqa: E402
+from isa_core.llm_client import ClienteIA, IAIndisponivel  # noqa: E402
+
+
+def rodar_fase(perguntar, usuarios, perguntas, pausa):
+    tempos, resultados = [], {"ok": 0, "erro": 0, "503": 0}
+
+    def usuario():
+        for _ in range(perguntas):
+            inicio = time.perf_counter()
+            try:
+                perguntar()
+                resultados["ok"] += 1
+            except IAIndisponivel:
+                resultados["503"] += 1
+            except Exception:
+                resultados["erro"] += 1
+            tempos.append(time.perf_counter() - inicio)
+            time.sleep(pausa)
+
+    with ThreadPoolExecutor(usuarios) as pool:
+        for _ in range(usuarios):
+            pool.submit(usuario)
+    return tempos, resultados
+
+
+def bench(nome, usar_cliente, args):
+    modelo = FakeModel(atraso=args.atraso)
+    cliente = ClienteIA(
+        limite_por_minuto=6000, rajada=args.usuarios, max_em_voo=4, max_fila=4,
+        prazo=args.atraso * 10, espera_base=args.atraso, limite_falhas=5, tempo_aberto=args.atraso * 10,
+    )
+
+    def chamada(timeout=None):
+        if modelo.fora_do_ar:
+            time.sleep(modelo.atraso)  # Um 429/503 real também demora a chegar
+        return modelo.start_chat().send_message("Qual o horário da biblioteca?")
+
+    perguntar = (lambda: cliente.chamar(chamada)) if usar_cliente else chamada
+    for fase, fora in (("normal", False), ("fora", True), ("volta", False)):
+        modelo.fora_do_ar = fora
+        chamadas_antes = modelo.chamadas
+        if fase == "volta" and usar_cliente:
+            time.sleep(cliente.disjuntor.tempo_aberto)  # Espera o circuito ir para meio aberto
+        tempos, resultados = rodar_fase(perguntar, args.usuarios, args.perguntas, args.pausa)
+        print(f"{nome:<8} {fase:<7} p50={percentil(tempos, 0.5) * 1000:>7.1f} ms "
+              f"p95={percentil(tempos, 0.95) * 1000:>7.1f} ms  ao modelo={modelo.chamadas - chamadas_antes:>3}  "
+              f"ok={resultados['ok']:>3} erro={resultados['erro']:>3} 503={resultados['503']:>3}")
+    if usar_cliente:
+        print(f"{'':<8} circuito no fim: {cliente.estado()['circuito']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, default=8)
+    parser.add_argument("--perguntas", type=int, default=5)
+    parser.add_argument("--atraso", type=float, default=0.2, help="segundos de cada chamada ao modelo falso")
+    parser.add_argument("--pausa", type=float, default=0.3, help="segundos entre as perguntas de um usuário")
+    args = parser.parse_args()
+
+    print(f"{args.usuarios} usuários x {args.perguntas} perguntas por fase\n")
+    bench("direto", False, args)
+    bench("cliente", True, args)
+
+
+if __name__ == "__main__":
+    main()
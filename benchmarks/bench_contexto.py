@@ -0,0 +1,128 @@
+"""
+Tokens enviados ao Gemini por pergunta: histórico podado por turnos x orçamento com resumo.
+
+Compara, numa conversa longa com o modelo falso de isa_core.fakes:
+    inteiro -> persona como par pergunta/resposta e a conversa inteira
+               reenviada a cada pergunta (o Brain original)
+    antes   -> persona como par pergunta/resposta no começo do histórico e
+               os últimos 10 turnos reenviados a cada pergunta (ChatPool com
+               max_turnos, como o Brain fazia)
+    depois  -> persona como instrução de sistema e OrcamentoContexto: passando
+               de `--max-tokens`, os turnos antigos viram um resumo contínuo
+Os tokens são estimados (~4 caracteres por token) sobre exatamente o que o
+chat enviaria: instrução de sistema + histórico + pergunta.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_contexto.py [--perguntas 40] [--max-tokens 800]
+"""
+import argparse
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from isa_core.chat_pool import ChatPool  # noqa: E402
+from isa_core.context_budget import OrcamentoContexto, estimar_tokens, texto_mensagem  # noqa: E402
+from isa_core.fakes import FakeModel  # noqa: E402
+
+PERSONA = (
+    "Você é a ISA 6.0, uma assistente virtual do IFCE Campus Canindé. "
+    "Seja útil, educada e breve. "
+    "Se o usuário pedir para gerar texto, música ou poema, faça com criatividade. "
+    "Responda em no máximo 3 frases, a menos que peçam um texto longo."
+)
+
+PERGUNTAS = [
+    "Qual o horário da biblioteca?",
+    "Informações do campus (use se forem úteis):\n- Horário da biblioteca: O horário da biblioteca "
+    "é das 8h às 21h.\n- Acervo online da biblioteca: O acervo e os serviços da biblioteca estão no "
+    "portal do campus.\n\nPergunta: e ela abre no sábado?",
+    "Me explique como funciona a matrícula em disciplinas optativas do curso de licenciatura.",
+    "Escreva um poema curto sobre o sertão e a chuva.",
+    "Quem foi Alan Turing e por que ele é importante para a computação?",
+]
+
+RESPOSTA = (
+    "Claro! Aqui está uma resposta de tamanho típico da ISA, com três frases curtas e diretas. "
+    "Ela traz a informação principal logo no começo, seguida de um detalhe útil. "
+    "Se precisar de mais alguma coisa, é só perguntar."
+)
+
+
+class ModeloMedido(FakeModel):
+    """FakeModel que anota os tokens de cada envio (histórico + pergunta + instrução fixa)."""
+
+    def __init__(self, tokens_fixos=0):
+        super().__init__(resposta=RESPOSTA)
+        self.tokens_fixos = tokens_fixos
+        self.enviados = []
+        self.tokens_resumo = 0  # Prompts das chamadas de resumo também custam tokens
+
+    def responder(self, texto, history):
+        tokens = self.tokens_fixos + estimar_tokens(texto)
+        tokens += sum(estimar_tokens(texto_mensagem(m)) for m in history)
+        self.enviados.append(tokens)
+        return super().responder(texto, history)
+
+    def generate_content(self, texto, **kwargs):
+        self.tokens_resumo += estimar_tokens(texto)
+        return super().generate_content(texto, **kwargs)
+
+
+def conversar(pool, perguntas):
+    for i in range(perguntas):
+        pergunta = PERGUNTAS[i % len(PERGUNTAS)]
+        pool.compactar("sessao", pergunta)  # Como o Brain: o resumo sai antes do envio
+        pool.enviar("sessao", pergunta)
+
+
+def antes(perguntas, max_turnos=10):
+    historico_inicial = [
+        {"role": "user", "parts": "Quem é você e como deve agir?"},
+        {"role": "model", "parts": PERSONA},
+    ]
+    modelo = ModeloMedido()
+    pool = ChatPool(lambda: modelo.start_chat(history=list(historico_inicial)),
+                    max_turnos=max_turnos, prefixo=len(historico_inicial))
+    conversar(pool, perguntas)
+    return modelo.enviados, 0, 0
+
+
+def depois(perguntas, max_tokens):
+    modelo = ModeloMedido(tokens_fixos=estimar_tokens(PERSONA))
+
+    def resumir(resumo, mensagens):
+        conversa = "\n".join(f"{papel}: {texto}" for papel, texto in mensagens)
+        return modelo.generate_content(f"Resumo anterior: {resumo}\n\nNovas mensagens:\n{conversa}").text
+
+    orcamento = OrcamentoContexto(
+        resumir,
+        max_tokens=max_tokens, tokens_fixos=estimar_tokens(PERSONA),
+    )
+    pool = ChatPool(lambda: modelo.start_chat(history=[]), orcamento=orcamento)
+    conversar(pool, perguntas)
+    return modelo.enviados, orcamento.contadores["compactacoes"], modelo.tokens_resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--perguntas", type=int, default=40)
+    parser.add_argument("--max-tokens", type=int, default=800)
+    args = parser.parse_args()
+
+    print(f"{args.perguntas} perguntas na mesma conversa\n")
+    print("tokens por pergunta (total inclui os prompts de resumo)")
+    print(f"{'modo':<7} {'total':>8} {'média':>7} {'p50':>6} {'max':>6} {'última':>7} {'resumos':>8} {'t. resumo':>10}")
+    modos = [
+        ("inteiro", antes(args.perguntas, max_turnos=args.perguntas + 1)),
+        ("antes", antes(args.perguntas)),
+        ("depois", depois(args.perguntas, args.max_tokens)),
+    ]
+    for nome, (enviados, resumos, tokens_resumo) in modos:
+        print(f"{nome:<7} {sum(enviados) + tokens_resumo:>8} {statistics.mean(enviados):>7.0f} "
+              f"{statistics.median(enviados):>6.0f} {max(enviados):>6} {enviados[-1]:>7} {resumos:>8} {tokens_resumo:>10}")
+
+
+if __name__ == "__main__":
+    main()
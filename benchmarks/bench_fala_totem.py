@@ -0,0 +1,110 @@
+"""
+Latência das rotas do totem (Prototipo 02) com a fala dentro ou fora da requisição.
+
+Compara:
+    sincrono -> a rota chama o motor de voz e só responde quando a fala acaba
+                (o falar() antigo; um lock imita o pyttsx3, que não aceita
+                dois runAndWait ao mesmo tempo)
+    fila     -> a rota enfileira a fala no VozTotem (SpeechScheduler) e
+                responde na hora; um toque novo interrompe a fala anterior
+Usa o motor falso de isa_core.fakes (cada palavra "dura" `--atraso-palavra`
+segundos) e o microfone desligado: /api/ouvir reconhece sempre "agenda".
+Vários "usuários" tocam os botões ao mesmo tempo.
+
+Uso (na raiz do repositório, com flask instalado):
+    python benchmarks/bench_fala_totem.py [--toques 20] [--usuarios 4] [--atraso-palavra 0.05]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "Prototipo 02"))
+
+import speech_recognition as sr  # noqa: E402
+
+from isa_core.fakes import FakeTTSEngine  # noqa: E402
+
+BOTOES = ["btn-agenda", "btn-mapa", "btn-faq"]
+
+
+def carregar_app():
+    sr.Microphone = lambda *args, **kwargs: None  # Sem placa de som: o microfone não é aberto
+    import app as totem
+
+    totem.ouvir_comando = lambda: "agenda"
+    return totem
+
+
+def modo_sincrono(totem, atraso_palavra):
+    motor = FakeTTSEngine(atraso_palavra=atraso_palavra)
+    lock = threading.Lock()
+
+    def falar(texto):
+        with lock:
+            motor.say(texto)
+            motor.runAndWait()
+
+    totem.falar = falar
+    return motor
+
+
+def modo_fila(totem, atraso_palavra):
+    motor = FakeTTSEngine(atraso_palavra=atraso_palavra)
+    totem.voz = totem.VozTotem(cache_audio=None, engine_factory=lambda: motor)
+    totem.falar = lambda texto: totem.voz.falar(texto)
+    return motor
+
+
+def medir(totem, toques, usuarios):
+    cliente = totem.app.test_client()
+    latencias = {"/api/get-info": [], "/api/ouvir": []}
+
+    def usuario(u):
+        for i in range(toques):
+            if i % 4 == 3:
+                rota, corpo = "/api/ouvir", None
+            else:
+                rota, corpo = "/api/get-info", {"id": BOTOES[(u + i) % len(BOTOES)]}
+            inicio = time.perf_counter()
+            resposta = cliente.post(rota, json=corpo)
+            latencias[rota].append(time.perf_counter() - inicio)
+            assert resposta.status_code == 200
+
+    with ThreadPoolExecutor(max_workers=usuarios) as pool:
+        for t in [pool.submit(usuario, u) for u in range(usuarios)]:
+            t.result()
+    return latencias
+
+
+def resumo(valores):
+    valores = sorted(valores)
+    p95 = valores[int(0.95 * (len(valores) - 1))]
+    return f"n={len(valores):<4} p50={statistics.median(valores) * 1000:>8.1f} ms p95={p95 * 1000:>8.1f} ms max={valores[-1] * 1000:>8.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--toques", type=int, default=20, help="toques por usuário")
+    parser.add_argument("--usuarios", type=int, default=4, help="usuários tocando ao mesmo tempo")
+    parser.add_argument("--atraso-palavra", type=float, default=0.05)
+    args = parser.parse_args()
+
+    totem = carregar_app()
+    for nome, preparar in [("sincrono", modo_sincrono), ("fila", modo_fila)]:
+        motor = preparar(totem, args.atraso_palavra)
+        inicio = time.perf_counter()
+        latencias = medir(totem, args.toques, args.usuarios)
+        total = time.perf_counter() - inicio
+        print(f"--- {nome} ({total:.1f} s, {len(motor.faladas)} falas completas, {len(motor.interrompidas)} interrompidas) ---")
+        for rota, valores in latencias.items():
+            print(f"  {rota:<14} {resumo(valores)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Teste de carga do log da interface Tkinter (Prototipo 01).
+
+Compara:
+    direto -> cada mensagem é um insert no widget (o exibir_log antigo), sem limite
+    sink   -> isa_core.log_sink.LogSink: threads escrevem numa fila e o loop
+              do Tk insere em lotes, mantendo só as últimas `--max-linhas`
+Mede o tempo total, a maior "travada" do loop do Tk (o pior insert/lote),
+quantas linhas ficam no widget e o tamanho do log em disco.
+
+Usa um Tk de verdade (janela escondida) se houver tela; senão, o widget
+falso de isa_core.fakes.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_log_tk.py [--mensagens 50000] [--threads 8] [--max-linhas 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from isa_core.fakes import FakeRootTk, FakeTexto  # noqa: E402
+from isa_core.log_sink import LogSink  # noqa: E402
+
+
+def criar_widget():
+    try:
+        from tkinter import Text, TclError, Tk
+        try:
+            root = Tk()
+            root.withdraw()
+            return root, Text(root), "Tk"
+        except TclError:
+            pass
+    except ImportError:
+        pass
+    return FakeRootTk(), FakeTexto(), "falso"
+
+
+def linhas_no_widget(widget):
+    return int(widget.index("end-1c").split(".")[0])
+
+
+def mensagem(thread, i):
+    return f"Sistema [{thread}]: mensagem {i} - Tentando abrir: https://www.google.com/search?q=teste"
+
+
+def bench_direto(n):
+    root, widget, tipo = criar_widget()
+    pior = 0.0
+    inicio = time.perf_counter()
+    for i in range(n):
+        t = time.perf_counter()
+        widget.insert("end", "\n" + mensagem(0, i))
+        widget.see("end")
+        pior = max(pior, time.perf_counter() - t)
+    total = time.perf_counter() - inicio
+    return tipo, total, pior, linhas_no_widget(widget), 0
+
+
+def bench_sink(n, threads, max_linhas):
+    root, widget, tipo = criar_widget()
+    pasta = tempfile.mkdtemp()
+    sink = LogSink(max_linhas=max_linhas, intervalo_ms=50, arquivo=os.path.join(pasta, "isa.log"),
+                   max_bytes=512 * 1024, backups=3)
+    sink.widget, sink.root = widget, root  # Descarregamos à mão para medir cada lote
+
+    por_thread = n // threads
+
+    def produzir(t):
+        for i in range(por_thread):
+            sink.escrever(mensagem(t, i))
+
+    inicio = time.perf_counter()
+    produtores = [threading.Thread(target=produzir, args=(t,)) for t in range(threads)]
+    for p in produtores:
+        p.start()
+    pior = 0.0
+    while any(p.is_alive() for p in produtores) or sink.pendentes():
+        t = time.perf_counter()
+        sink.descarregar()
+        pior = max(pior, time.perf_counter() - t)
+        root.update()  # O resto do loop do Tk (eventos, desenho)
+        time.sleep(sink.intervalo_ms / 1000)
+    total = time.perf_counter() - inicio
+    em_disco = sum(os.path.getsize(os.path.join(pasta, f)) for f in os.listdir(pasta))
+    return tipo, total, pior, linhas_no_widget(widget), em_disco
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensagens", type=int, default=50000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--max-linhas", type=int, default=1000)
+    args = parser.parse_args()
+
+    resultados = [
+        ("direto", bench_direto(args.mensagens)),
+        ("sink", bench_sink(args.mensagens, args.threads, args.max_linhas)),
+    ]
+    print(f"{args.mensagens} mensagens\n")
+    print(f"{'modo':<8} {'widget':<7} {'total (s)':>10} {'pior travada (ms)':>18} {'linhas no widget':>17} {'disco (KB)':>11}")
+    for nome, (tipo, total, pior, linhas, disco) in resultados:
+        print(f"{nome:<8} {tipo:<7} {total:>10.2f} {pior * 1000:>18.1f} {linhas:>17} {disco / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Custo da instrumentação de isa_core.tracing: span por etapa, contador e coleta.
+
+Mede, em microssegundos por operação:
+    vazio    -> o laço sem nada (referência)
+    span     -> `with metricas.etapa("rotear"): pass`
+    contador -> `contador.inc("volume")`
+e o tempo de montar o texto do /api/metrics com `--etapas` séries cheias.
+Com `--threads` > 1, os spans rodam em paralelo na mesma série (lock disputado).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_metricas.py [--operacoes 200000] [--threads 4] [--etapas 20]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from isa_core.tracing import Metricas  # noqa: E402
+
+
+def por_operacao(funcao, operacoes, threads=1):
+    """Microssegundos por operação (tempo de parede dividido pelo total de operações)."""
+    por_thread = operacoes // threads
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for _ in range(threads):
+            pool.submit(funcao, por_thread)
+    return (time.perf_counter() - inicio) / (por_thread * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operacoes", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--etapas", type=int, default=20, help="séries no histograma para medir a coleta")
+    args = parser.parse_args()
+
+    metricas = Metricas()
+    contador = metricas.contador("isa_intencoes_total", "Intenções.", "intencao")
+
+    def vazio(n):
+        for _ in range(n):
+            pass
+
+    def spans(n):
+        for _ in range(n):
+            with metricas.etapa("rotear"):
+                pass
+
+    def contar(n):
+        for _ in range(n):
+            contador.inc("volume")
+
+    base = por_operacao(vazio, args.operacoes)
+    print(f"{args.operacoes} operações\n")
+    print(f"vazio            {base:6.3f} µs")
+    for nome, funcao in (("span", spans), ("contador", contar)):
+        print(f"{nome:<8} 1 thread  {por_operacao(funcao, args.operacoes) - base:6.3f} µs")
+        print(f"{nome:<8} {args.threads} threads {por_operacao(funcao, args.operacoes, args.threads) - base:6.3f} µs")
+
+    for i in range(args.etapas):
+        for _ in range(metricas.amostras):
+            metricas.etapas.observar(f"etapa_{i}", 0.001)
+    inicio = time.perf_counter()
+    texto = metricas.prometheus()
+    print(f"\ncoleta /api/metrics ({args.etapas} séries x {metricas.amostras} amostras): "
+          f"{(time.perf_counter() - inicio) * 1000:.2f} ms, {len(texto) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
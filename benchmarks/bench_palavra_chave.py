@@ -0,0 +1,109 @@
+"""
+Benchmark do detector da palavra-chave ("ISA") sobre áudio gravado.
+
+Passe uma pasta com gravações .wav longas do ambiente real (sala de aula,
+corredor, conversa). Um .txt ao lado com a transcrição é opcional: cada
+"isa" nele conta como ativação esperada; sem .txt, espera-se zero. Mede:
+    - uso de CPU do detector (tempo de CPU / duração do áudio),
+    - quanto do áudio chegou ao reconhecedor (o resto o VAD descartou),
+    - ativações, ativações perdidas e falsos disparos por hora.
+Com --comparar, mede também o Vosk sem gramática sobre o áudio inteiro
+(o custo de mandar tudo para o reconhecimento completo).
+
+Uso (na raiz do repositório, com vosk e o modelo instalados):
+    python benchmarks/bench_palavra_chave.py gravacoes/ \\
+        --vosk-modelo "Prototipo Ultimate/modelos/vosk-model-small-pt-0.3" --comparar
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import speech_recognition as sr  # noqa: E402
+
+from isa_core.intent_router import dobrar  # noqa: E402
+from isa_core.stt import TAXA, criar_motor  # noqa: E402
+from isa_core.wake_word import DetectorPalavraChave  # noqa: E402
+
+BLOCO = 1024  # Quadros por bloco, igual ao CHUNK do sr.Microphone
+
+
+def carregar(wav):
+    """Áudio em 16 kHz/16 bits e o limiar de energia calibrado no começo do arquivo."""
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(wav) as fonte:
+        recognizer.adjust_for_ambient_noise(fonte, duration=0.5)
+        audio = recognizer.record(fonte)
+    return audio.get_raw_data(convert_rate=TAXA, convert_width=2), recognizer.energy_threshold
+
+
+def esperadas(wav, palavras):
+    txt = os.path.splitext(wav)[0] + ".txt"
+    if not os.path.exists(txt):
+        return 0
+    with open(txt, encoding="utf-8") as f:
+        return sum(1 for p in dobrar(f.read()).split() if p in palavras)
+
+
+def blocos(bruto):
+    for inicio in range(0, len(bruto), BLOCO * 2):
+        yield bruto[inicio:inicio + BLOCO * 2]
+
+
+def cpu_reconhecimento_completo(motor, bruto):
+    fluxo = motor.iniciar_fluxo()
+    inicio = time.thread_time()
+    for bloco in blocos(bruto):
+        fluxo.aceitar(bloco)
+    fluxo.finalizar()
+    return time.thread_time() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pasta", help="pasta com gravações .wav (+ .txt opcional)")
+    parser.add_argument("--vosk-modelo", default="modelos/vosk-model-small-pt-0.3")
+    parser.add_argument("--palavras", default="isa,iza")
+    parser.add_argument("--comparar", action="store_true", help="mede também o Vosk sem gramática")
+    args = parser.parse_args()
+
+    wavs = sorted(glob.glob(os.path.join(args.pasta, "*.wav")))
+    if not wavs:
+        sys.exit(f"Nenhum .wav em {args.pasta}")
+    motor = criar_motor("vosk", {"vosk_modelo": args.vosk_modelo})
+    detector = DetectorPalavraChave(motor, args.palavras.split(","))
+
+    total_esperadas = perdidas = falsas = 0
+    cpu_completo = 0.0
+    print(f"{'arquivo':<30} {'dur (s)':>8} {'esperadas':>10} {'ativações':>10}")
+    for wav in wavs:
+        bruto, limiar = carregar(wav)
+        detector.preparar(limiar)
+        antes = detector.ativacoes
+        for bloco in blocos(bruto):
+            detector.alimentar(bloco)
+        ativacoes = detector.ativacoes - antes
+        esperado = esperadas(wav, detector.palavras)
+        total_esperadas += esperado
+        perdidas += max(0, esperado - ativacoes)
+        falsas += max(0, ativacoes - esperado)
+        if args.comparar:
+            cpu_completo += cpu_reconhecimento_completo(motor, bruto)
+        print(f"{os.path.basename(wav):<30} {len(bruto) / (2 * TAXA):>8.1f} {esperado:>10} {ativacoes:>10}")
+
+    e = detector.estatisticas()
+    horas = e["audio_s"] / 3600
+    print(f"\nÁudio total: {e['audio_s']:.0f} s")
+    print(f"Chegou ao reconhecedor: {e['reconhecido_pct']}% do áudio")
+    print(f"CPU do detector: {e['cpu_pct']}% de um núcleo")
+    if args.comparar:
+        print(f"CPU do Vosk completo sobre tudo: {100 * cpu_completo / max(e['audio_s'], 1e-9):.2f}% de um núcleo")
+    print(f"Ativações: {e['ativacoes']} (esperadas {total_esperadas}, perdidas {perdidas})")
+    print(f"Falsos disparos: {falsas} ({falsas / max(horas, 1e-9):.1f} por hora)")
+
+
+if __name__ == "__main__":
+    main()
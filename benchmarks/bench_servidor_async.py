@@ -0,0 +1,165 @@
+"""
+Benchmark: servidor WSGI (threads fixas) x modo assíncrono (asgi.py).
+
+Sobe o Prototipo Ultimate com IA e reconhecedor falsos (isa_core.fakes) e,
+em cada modo, dispara ao mesmo tempo:
+    - capturas de voz lentas em /api/listen,
+    - perguntas à IA em /api/chat,
+    - painéis consultando /api/status a cada 100 ms.
+Mede a latência do /api/status (o que o usuário sente no dashboard) e das
+respostas do chat.
+
+Uso (na raiz do repositório, com flask, quart e hypercorn instalados):
+    python benchmarks/bench_servidor_async.py [--workers 4] [--ouvintes 4] [--chats 16]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socketserver
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PASTA_APP = os.path.join(RAIZ, "Prototipo Ultimate")
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, PASTA_APP)
+os.chdir(PASTA_APP)
+
+from isa_core.fakes import FakeModel, FakeRecognizer  # noqa: E402
+from isa_core.llm_client import ClienteIA  # noqa: E402
+from isa_core.response_cache import ResponseCache  # noqa: E402
+
+
+class _Silencioso(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class ServidorWSGIFixo(socketserver.ThreadingMixIn, WSGIServer):
+    """WSGI com número fixo de threads (como gunicorn --threads / waitress)."""
+
+    workers = 4
+
+    def process_request(self, req, endereco):
+        if not hasattr(self, "_pool"):
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._pool.submit(self.process_request_thread, req, endereco)
+
+
+def preparar_fakes(atraso_llm, atraso_fala):
+    import app as isa
+
+    # Sem cota nem fila: o benchmark mede o servidor, não os limites do Gemini
+    cliente = ClienteIA(limite_por_minuto=10**6, rajada=10**6, max_em_voo=256, max_fila=256)
+    isa.brain = isa.Brain(None, model=FakeModel(atraso=atraso_llm), cache=ResponseCache(), cliente=cliente)
+    reconhecedor = FakeRecognizer(atraso_fala=atraso_fala, atraso_rede=0.3)
+    isa.ouvir_microfone = lambda: reconhecedor.recognize_google(reconhecedor.listen())
+    isa.voice_mgr.falar = lambda *args, **kwargs: None
+    return isa
+
+
+def subir_wsgi(isa, porta, workers):
+    ServidorWSGIFixo.workers = workers
+    servidor = make_server("127.0.0.1", porta, isa.app, server_class=ServidorWSGIFixo, handler_class=_Silencioso)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor.shutdown
+
+
+def subir_asgi(porta):
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    import asgi
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{porta}"]
+    config.accesslog = None
+    parar = threading.Event()
+
+    async def rodar():
+        await serve(asgi.app, config, shutdown_trigger=lambda: asyncio.to_thread(parar.wait))
+
+    threading.Thread(target=lambda: asyncio.run(rodar()), daemon=True).start()
+    return parar.set
+
+
+def requisitar(url, corpo=None):
+    dados = json.dumps(corpo).encode() if corpo is not None else None
+    req = urllib.request.Request(url, data=dados, headers={"Content-Type": "application/json"})
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=60) as r:
+        r.read()
+    return time.perf_counter() - inicio
+
+
+def esperar_servidor(base):
+    for _ in range(100):
+        try:
+            requisitar(base + "/api/status")
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Servidor não respondeu em {base}")
+
+
+def carga(base, ouvintes, chats, duracao_status=3.0):
+    latencias_status, latencias_chat = [], []
+    fim_status = time.perf_counter() + duracao_status
+
+    def painel():
+        while time.perf_counter() < fim_status:
+            latencias_status.append(requisitar(base + "/api/status"))
+            time.sleep(0.1)
+
+    def perguntar(i):
+        latencias_chat.append(requisitar(base + "/api/chat", {"msg": f"pergunta {i}", "cache": False}))
+
+    with ThreadPoolExecutor(max_workers=ouvintes + chats + 4) as pool:
+        tarefas = [pool.submit(requisitar, base + "/api/listen", {}) for _ in range(ouvintes)]
+        tarefas += [pool.submit(perguntar, i) for i in range(chats)]
+        tarefas += [pool.submit(painel) for _ in range(4)]
+        for t in tarefas:
+            t.result()
+    return latencias_status, latencias_chat
+
+
+def resumo(nome, valores):
+    valores = sorted(valores)
+    p95 = valores[int(0.95 * (len(valores) - 1))]
+    return f"{nome}: n={len(valores)} p50={statistics.median(valores) * 1000:.0f} ms p95={p95 * 1000:.0f} ms max={valores[-1] * 1000:.0f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="threads do servidor WSGI")
+    parser.add_argument("--ouvintes", type=int, default=4, help="capturas de voz simultâneas")
+    parser.add_argument("--chats", type=int, default=16, help="perguntas simultâneas à IA")
+    parser.add_argument("--atraso-llm", type=float, default=1.0)
+    parser.add_argument("--atraso-fala", type=float, default=3.0)
+    args = parser.parse_args()
+
+    isa = preparar_fakes(args.atraso_llm, args.atraso_fala)
+    modos = [
+        ("WSGI", lambda: subir_wsgi(isa, 5101, args.workers), "http://127.0.0.1:5101"),
+        ("ASGI", lambda: subir_asgi(5102), "http://127.0.0.1:5102"),
+    ]
+    for nome, subir, base in modos:
+        parar = subir()
+        esperar_servidor(base)
+        inicio = time.perf_counter()
+        status, chat = carga(base, args.ouvintes, args.chats)
+        total = time.perf_counter() - inicio
+        print(f"--- {nome} ({total:.1f} s) ---")
+        print("  " + resumo("/api/status", status))
+        print("  " + resumo("/api/chat  ", chat))
+        parar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark dos motores de STT sobre uma pasta de comandos gravados.
+
+Cada arquivo .wav deve ter ao lado um .txt com a transcrição correta
+(ex.: aumentar_volume.wav + aumentar_volume.txt). Para cada motor, mede a
+latência de reconhecimento e a taxa de erro de palavras (WER).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_stt.py gravacoes/ --motores vosk,whisper,google \\
+        --vosk-modelo "Prototipo Ultimate/modelos/vosk-model-small-pt-0.3"
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import speech_recognition as sr  # noqa: E402
+
+from isa_core.intent_router import dobrar  # noqa: E402
+from isa_core.stt import criar_motor  # noqa: E402
+
+
+def distancia_palavras(referencia, hipotese):
+    """Distância de edição (Levenshtein) contada em palavras."""
+    anterior = list(range(len(hipotese) + 1))
+    for i, ref in enumerate(referencia, 1):
+        atual = [i]
+        for j, hip in enumerate(hipotese, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ref != hip)))
+        anterior = atual
+    return anterior[-1]
+
+
+def carregar_gravacoes(pasta):
+    gravacoes = []
+    for wav in sorted(glob.glob(os.path.join(pasta, "*.wav"))):
+        txt = os.path.splitext(wav)[0] + ".txt"
+        if not os.path.exists(txt):
+            print(f"Sem transcrição, ignorando: {wav}")
+            continue
+        with sr.AudioFile(wav) as fonte:
+            audio = sr.Recognizer().record(fonte)
+        with open(txt, encoding="utf-8") as f:
+            gravacoes.append((os.path.basename(wav), audio, f.read()))
+    return gravacoes
+
+
+def avaliar(motor, gravacoes):
+    latencias, erros, palavras, falhas = [], 0, 0, 0
+    for _, audio, esperado in gravacoes:
+        referencia = dobrar(esperado).split()
+        inicio = time.perf_counter()
+        try:
+            texto = motor.reconhecer(audio)
+        except Exception:
+            texto = ""
+            falhas += 1
+        latencias.append(time.perf_counter() - inicio)
+        erros += distancia_palavras(referencia, dobrar(texto).split())
+        palavras += len(referencia)
+    latencias.sort()
+    return {
+        "p50_ms": statistics.median(latencias) * 1000,
+        "p95_ms": latencias[int(0.95 * (len(latencias) - 1))] * 1000,
+        "wer": erros / max(1, palavras),
+        "falhas": falhas,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pasta", help="pasta com .wav + .txt")
+    parser.add_argument("--motores", default="vosk,google")
+    parser.add_argument("--vosk-modelo", default="modelos/vosk-model-small-pt-0.3")
+    parser.add_argument("--whisper-modelo", default="small")
+    args = parser.parse_args()
+
+    gravacoes = carregar_gravacoes(args.pasta)
+    if not gravacoes:
+        sys.exit(f"Nenhuma gravação com transcrição em {args.pasta}")
+    config = {"vosk_modelo": args.vosk_modelo, "whisper_modelo": args.whisper_modelo}
+
+    print(f"{len(gravacoes)} gravações\n")
+    print(f"{'motor':<10} {'carga (s)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'WER':>7} {'falhas':>7}")
+    for nome in args.motores.split(","):
+        inicio = time.perf_counter()
+        try:
+            motor = criar_motor(nome.strip(), config)
+            motor.aquecer()
+        except Exception as e:
+            print(f"{nome:<10} indisponível: {e}")
+            continue
+        carga = time.perf_counter() - inicio
+        r = avaliar(motor, gravacoes)
+        print(f"{nome:<10} {carga:>10.2f} {r['p50_ms']:>10.0f} {r['p95_ms']:>10.0f} {r['wer']:>7.1%} {r['falhas']:>7}")
+
+
+if __name__ == "__main__":
+    main()
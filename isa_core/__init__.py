@@ -0,0 +1,6 @@
+"""
+Núcleo compartilhado da ISA.
+
+Módulos reutilizáveis pelos protótipos (Prototipo 01, 02 e Ultimate).
+Cada app adiciona a raiz do repositório ao sys.path e importa daqui.
+"""
@@ -0,0 +1,238 @@
+import bisect
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+from collections import namedtuple
+
+from isa_core.intent_router import dobrar
+
+# origem: "desktop" (.desktop do Linux), "menu" (atalho do Menu Iniciar), "path" ou "alias"
+Aplicativo = namedtuple("Aplicativo", "nome comando origem")
+
+# Códigos de campo do Exec= (%f, %U, ...) que o lançador substituiria por arquivos
+_CODIGO_CAMPO = re.compile(r"\s*%[fFuUdDnNickvm]")
+
+
+def normalizar(nome):
+    return " ".join(dobrar(nome).split())
+
+
+def pastas_padrao():
+    """Onde cada sistema guarda os atalhos de aplicativos instalados."""
+    if sys.platform == "win32":
+        return [
+            os.path.join(os.environ.get("PROGRAMDATA", r"C:\ProgramData"), r"Microsoft\Windows\Start Menu\Programs"),
+            os.path.join(os.environ.get("APPDATA", ""), r"Microsoft\Windows\Start Menu\Programs"),
+        ]
+    dados = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+    dados.insert(0, os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share")))
+    dados.append("/var/lib/flatpak/exports/share")
+    return [os.path.join(d, "applications") for d in dados if d]
+
+
+def ler_desktop(caminho):
+    """
+    Lê um arquivo .desktop e devolve {"nomes": [...], "comando": str}, ou None
+    se não for um aplicativo visível no menu.
+    """
+    campos = {}
+    secao = None
+    try:
+        with open(caminho, encoding="utf-8", errors="replace") as f:
+            for linha in f:
+                linha = linha.strip()
+                if linha.startswith("["):
+                    secao = linha
+                elif secao == "[Desktop Entry]" and "=" in linha and not linha.startswith("#"):
+                    chave, valor = linha.split("=", 1)
+                    campos.setdefault(chave.strip(), valor.strip())
+    except OSError:
+        return None
+    if campos.get("Type", "Application") != "Application" or not campos.get("Exec"):
+        return None
+    if campos.get("NoDisplay") == "true" or campos.get("Hidden") == "true":
+        return None
+    nomes = [campos[c] for c in ("Name[pt_BR]", "Name[pt]", "Name", "GenericName[pt_BR]", "GenericName") if campos.get(c)]
+    nomes += [k for k in campos.get("Keywords[pt_BR]", campos.get("Keywords", "")).split(";") if k.strip()]
+    if not nomes:
+        return None
+    return {"nomes": nomes, "comando": _CODIGO_CAMPO.sub("", campos["Exec"]).strip()}
+
+
+def varrer_aplicativos(pastas=None, caminhos_path=None):
+    """
+    Lista (nome, Aplicativo) de tudo que dá para abrir: entradas .desktop (ou
+    atalhos .lnk do Menu Iniciar no Windows) e executáveis do PATH.
+    Um aplicativo pode aparecer com vários nomes (nome, nome genérico, palavras-chave).
+    """
+    pastas = pastas_padrao() if pastas is None else pastas
+    caminhos_path = os.environ.get("PATH", "").split(os.pathsep) if caminhos_path is None else caminhos_path
+    encontrados = []
+    vistos = set()  # A mesma entrada em ~/.local tem precedência sobre /usr
+
+    for pasta in pastas:
+        for raiz, _, arquivos in os.walk(pasta):
+            for arquivo in sorted(arquivos):
+                caminho = os.path.join(raiz, arquivo)
+                base, extensao = os.path.splitext(arquivo)
+                if extensao == ".desktop" and arquivo not in vistos:
+                    vistos.add(arquivo)
+                    entrada = ler_desktop(caminho)
+                    if entrada:
+                        app = Aplicativo(entrada["nomes"][0], entrada["comando"], "desktop")
+                        encontrados.extend((nome, app) for nome in entrada["nomes"])
+                elif extensao == ".lnk":
+                    encontrados.append((base, Aplicativo(base, caminho, "menu")))
+
+    for pasta in caminhos_path:
+        try:
+            arquivos = sorted(os.listdir(pasta))
+        except OSError:
+            continue
+        for arquivo in arquivos:
+            caminho = os.path.join(pasta, arquivo)
+            nome = os.path.splitext(arquivo)[0] if sys.platform == "win32" else arquivo
+            if nome not in vistos and os.path.isfile(caminho) and os.access(caminho, os.X_OK):
+                vistos.add(nome)
+                encontrados.append((nome, Aplicativo(nome, caminho, "path")))
+    return encontrados
+
+
+def _trigramas(texto):
+    texto = f"  {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class _Indice:
+    """
+    Estruturas de busca de uma varredura (trocadas inteiras na atualização).
+    Executáveis do PATH só entram pelo nome exato: são milhares, com nomes
+    curtos ("install", "chattr") que casariam por prefixo ou trigrama com
+    qualquer coisa ("instagram", "chat").
+    """
+
+    def __init__(self, entradas):
+        self.exatos = {}     # nome normalizado -> Aplicativo
+        self.palavras = {}   # palavra do nome -> [Aplicativo] (só atalhos do menu)
+        self.trigramas = {}  # trigrama -> {nome normalizado} (só atalhos do menu)
+        for nome, app in entradas:
+            chave = normalizar(nome)
+            if not chave or chave in self.exatos:
+                continue
+            self.exatos[chave] = app
+            if app.origem == "path":
+                continue
+            for palavra in set(chave.split()):
+                self.palavras.setdefault(palavra, []).append(app)
+            for trigrama in _trigramas(chave):
+                self.trigramas.setdefault(trigrama, set()).add(chave)
+        # Para busca por prefixo com bisect (só atalhos do menu)
+        self.ordenados = sorted(c for c, app in self.exatos.items() if app.origem != "path")
+
+
+class IndiceAplicativos:
+    """
+    Índice dos aplicativos instalados para o "abra ...": montado uma vez e
+    consultado só na memória.
+
+    Ordem da busca:
+        1. apelido do usuário (`aliases`: {"navegador": "firefox"})
+        2. nome exato (atalhos do menu e executáveis do PATH)
+        3. prefixo do nome ("libre" -> "LibreOffice Writer"), com pelo
+           menos `MIN_PREFIXO` letras
+        4. palavra inteira do nome ("writer")
+        5. trigramas, para erros de reconhecimento de voz ("calculadra"),
+           se a semelhança passar de `similaridade_minima`
+    Os passos 3 a 5 (e os 4 e 5 exigem `MIN_APROXIMADO` letras) só olham os
+    atalhos do menu; um nome que não casa com nada devolve None, e o
+    "abra ..." segue para os sites.
+    `atualizar_em_segundo_plano` refaz a varredura periodicamente, sem
+    bloquear as consultas (o índice novo substitui o antigo de uma vez).
+    """
+
+    MIN_PREFIXO = 4     # "o" ou "e" não abrem o primeiro app que começa com a letra
+    MIN_APROXIMADO = 3  # Palavra inteira e trigramas
+
+    def __init__(self, pastas=None, caminhos_path=None, aliases=None, similaridade_minima=0.6):
+        self.pastas = pastas
+        self.caminhos_path = caminhos_path
+        self.aliases = {normalizar(k): v for k, v in (aliases or {}).items()}
+        self.similaridade_minima = similaridade_minima
+        self._indice = _Indice([])
+        self._parar = threading.Event()
+        self.atualizar()
+
+    def __len__(self):
+        return len(self._indice.exatos)
+
+    def atualizar(self):
+        self._indice = _Indice(varrer_aplicativos(self.pastas, self.caminhos_path))
+
+    def atualizar_em_segundo_plano(self, intervalo=300):
+        def laco():
+            while not self._parar.wait(intervalo):
+                try:
+                    self.atualizar()
+                except Exception as e:
+                    print(f"Erro ao atualizar o índice de aplicativos: {e}")
+
+        threading.Thread(target=laco, name="isa-aplicativos", daemon=True).start()
+
+    def parar(self):
+        self._parar.set()
+
+    def buscar(self, nome):
+        """Aplicativo mais provável para `nome`, ou None."""
+        consulta = normalizar(nome)
+        if not consulta:
+            return None
+        indice = self._indice  # Uma referência só: a atualização pode trocar o índice no meio
+
+        if consulta in self.aliases:
+            alvo = self.aliases[consulta]
+            return indice.exatos.get(normalizar(alvo)) or Aplicativo(alvo, alvo, "alias")
+
+        if consulta in indice.exatos:
+            return indice.exatos[consulta]
+
+        if len(consulta) >= self.MIN_PREFIXO:
+            posicao = bisect.bisect_left(indice.ordenados, consulta)
+            if posicao < len(indice.ordenados) and indice.ordenados[posicao].startswith(consulta):
+                return indice.exatos[indice.ordenados[posicao]]
+
+        if len(consulta) < self.MIN_APROXIMADO:
+            return None
+
+        candidatos = indice.palavras.get(consulta)
+        if candidatos:
+            return candidatos[0]
+
+        return self._buscar_trigramas(indice, consulta)
+
+    def _buscar_trigramas(self, indice, consulta):
+        trigramas = _trigramas(consulta)
+        comuns = {}
+        for trigrama in trigramas:
+            for chave in indice.trigramas.get(trigrama, ()):
+                comuns[chave] = comuns.get(chave, 0) + 1
+        melhor, melhor_nota = None, self.similaridade_minima
+        for chave, n in comuns.items():
+            nota = 2 * n / (len(trigramas) + len(chave) + 1)  # Dice; nome com k letras tem k+1 trigramas
+            if nota > melhor_nota or (nota == melhor_nota and melhor and len(chave) < len(melhor)):
+                melhor, melhor_nota = chave, nota
+        return indice.exatos.get(melhor) if melhor else None
+
+
+def iniciar(app):
+    """Abre o aplicativo sem esperar ele fechar."""
+    if app.origem == "menu" or (sys.platform == "win32" and app.origem != "desktop"):
+        os.startfile(app.comando)
+        return
+    subprocess.Popen(
+        shlex.split(app.comando),
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
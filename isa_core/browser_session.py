@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+import time
+
+
+def resolver_chromedriver(arquivo_cache, instalar, forcar=False):
+    """
+    Caminho do chromedriver, guardado em disco entre execuções.
+
+    `instalar()` (ex.: ChromeDriverManager().install()) só roda quando não há
+    caminho salvo, o arquivo sumiu ou `forcar=True` (driver incompatível
+    depois de uma atualização do Chrome).
+    """
+    if not forcar:
+        try:
+            with open(arquivo_cache, encoding="utf-8") as f:
+                caminho = json.load(f).get("caminho")
+            if caminho and os.path.exists(caminho):
+                return caminho
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    caminho = instalar()
+    temporario = f"{arquivo_cache}.tmp"
+    try:
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump({"caminho": caminho, "resolvido_em": time.time()}, f)
+        os.replace(temporario, arquivo_cache)
+    except OSError as e:
+        print(f"Não foi possível salvar o caminho do chromedriver: {e}")
+    return caminho
+
+
+class SessaoNavegador:
+    """
+    Um navegador controlado pelo Selenium, aberto uma vez e reaproveitado.
+
+    `criar_driver()` só é chamado na primeira navegação ou quando a sessão
+    morre (o usuário fechou a janela, o Chrome travou). Antes de cada uso, um
+    health check barato (`window_handles`) confirma que a sessão responde.
+    Todas as operações passam por um lock: o driver do Selenium não aceita
+    comandos de várias threads ao mesmo tempo.
+    """
+
+    def __init__(self, criar_driver):
+        self.criar_driver = criar_driver
+        self.inicializacoes = 0
+        self.navegacoes = 0
+        self._driver = None
+        self._lock = threading.RLock()
+
+    @property
+    def aberto(self):
+        """Há uma sessão iniciada (sem checar se ainda responde)."""
+        return self._driver is not None
+
+    @staticmethod
+    def _saudavel(driver):
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def driver_ativo(self):
+        """Driver atual se ainda responde, senão None (não abre um navegador novo)."""
+        with self._lock:
+            if self._driver is not None and not self._saudavel(self._driver):
+                self._descartar()
+            return self._driver
+
+    def obter_driver(self):
+        """Driver pronto para uso: reaproveita o atual ou inicia outro se ele morreu."""
+        with self._lock:
+            if self.driver_ativo() is None:
+                self._driver = self.criar_driver()
+                self.inicializacoes += 1
+            return self._driver
+
+    def navegar(self, url, nova_aba=False):
+        with self._lock:
+            driver = self.obter_driver()
+            if nova_aba:
+                driver.switch_to.new_window("tab")
+            driver.get(url)
+            self.navegacoes += 1
+            return driver
+
+    def executar(self, acao):
+        """Roda `acao(driver)` com o lock; None se não há navegador aberto."""
+        with self._lock:
+            driver = self.driver_ativo()
+            return acao(driver) if driver is not None else None
+
+    def _descartar(self):
+        driver, self._driver = self._driver, None
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def fechar(self):
+        with self._lock:
+            if self._driver is not None:
+                self._descartar()
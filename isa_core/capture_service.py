@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+
+
+class MicrofoneOcupado(Exception):
+    """Já existem pedidos demais esperando o microfone."""
+
+
+class _Pedido:
+    __slots__ = ("timeout", "limite_frase", "pronto", "audio", "erro", "cancelado")
+
+    def __init__(self, timeout, limite_frase):
+        self.timeout = timeout
+        self.limite_frase = limite_frase
+        self.pronto = threading.Event()
+        self.audio = None
+        self.erro = None
+        self.cancelado = False  # Quem pediu desistiu: a thread de captura pula o pedido
+
+
+class _Transmissao:
+    """Pedido de áudio bruto bloco a bloco (para o pipeline de VAD/parciais)."""
+
+    __slots__ = ("limite", "blocos", "encerrar")
+
+    def __init__(self, limite):
+        self.limite = limite
+        self.blocos = queue.Queue()
+        self.encerrar = threading.Event()
+
+
+class CaptureService(threading.Thread):
+    """
+    Serviço de captura com o microfone aberto o tempo todo.
+
+    O dispositivo é aberto uma vez e calibrado no início; depois, enquanto
+    ninguém está pedindo uma frase, a thread recalibra o limiar de energia a
+    cada `intervalo_calibragem` segundos e vai descartando o áudio ambiente.
+    Quando chega um pedido (`capturar`), a escuta começa na hora, sem abrir
+    dispositivo nem calibrar: a latência é só a própria frase.
+
+    `criar_fonte()` devolve a fonte do speech_recognition: sr.Microphone()
+    no uso normal ou sr.AudioFile("frase.wav") com `ao_vivo=False` para
+    testar sem microfone (assim o áudio do arquivo não é descartado).
+
+    Além da frase pronta (`capturar`), entrega o áudio bruto conforme chega
+    (`transmitir`), no formato de `taxa`/`largura` da fonte.
+    """
+
+    def __init__(self, criar_fonte, recognizer=None, intervalo_calibragem=30.0,
+                 duracao_calibragem=0.5, max_pedidos=4, ao_vivo=True):
+        super().__init__(name="isa-captura")
+        self.daemon = True
+        if recognizer is None:
+            import speech_recognition as sr
+            recognizer = sr.Recognizer()
+        self.criar_fonte = criar_fonte
+        self.recognizer = recognizer
+        self.intervalo_calibragem = intervalo_calibragem
+        self.duracao_calibragem = duracao_calibragem
+        self.ao_vivo = ao_vivo
+        self._pedidos = queue.Queue(maxsize=max_pedidos)
+        self._parar = threading.Event()
+        self.aberto = threading.Event()  # Fonte aberta e calibrada (ou falhou: ver `erro`)
+        self.erro = None
+        self.ultima_calibragem = 0.0
+        self.taxa = 16000
+        self.largura = 2
+
+    # --- API usada pelas rotas ---
+    def capturar(self, timeout=5, limite_frase=10):
+        """
+        Espera a próxima frase e devolve o AudioData.
+        Repassa as exceções do recognizer (ex.: sr.WaitTimeoutError).
+        """
+        if not self.aberto.wait(10) or self.erro:
+            raise RuntimeError(f"Microfone indisponível: {self.erro}")
+        pedido = _Pedido(timeout, limite_frase)
+        try:
+            self._pedidos.put_nowait(pedido)
+        except queue.Full:
+            raise MicrofoneOcupado("Fila do microfone cheia") from None
+        # Margem para os pedidos que estão na frente na fila
+        espera = (timeout or 0) + (limite_frase or 0) + 1
+        if not pedido.pronto.wait(espera * (self._pedidos.qsize() + 1)):
+            # Sem isso o pedido continuaria na fila e o microfone gravaria
+            # uma frase que ninguém vai ler
+            pedido.cancelado = True
+            raise RuntimeError("Captura não terminou a tempo")
+        if pedido.erro:
+            raise pedido.erro
+        return pedido.audio
+
+    def transmitir(self, limite=15):
+        """
+        Gera os blocos de áudio bruto (bytes) a partir de agora, por no máximo
+        `limite` segundos ou até quem consome fechar o gerador.
+        """
+        if not self.aberto.wait(10) or self.erro:
+            raise RuntimeError(f"Microfone indisponível: {self.erro}")
+        transmissao = _Transmissao(limite)
+        try:
+            self._pedidos.put_nowait(transmissao)
+        except queue.Full:
+            raise MicrofoneOcupado("Fila do microfone cheia") from None
+        try:
+            while True:
+                try:
+                    bloco = transmissao.blocos.get(timeout=limite + 5)
+                except queue.Empty:
+                    raise RuntimeError("Microfone parou de enviar áudio") from None
+                if isinstance(bloco, Exception):
+                    raise bloco
+                if bloco is None:
+                    return
+                yield bloco
+        finally:
+            transmissao.encerrar.set()  # A thread de captura volta a ficar ociosa
+
+    def parar(self):
+        self._parar.set()
+
+    # --- Thread de captura ---
+    def _calibrar(self, fonte):
+        self.recognizer.adjust_for_ambient_noise(fonte, duration=self.duracao_calibragem)
+        self.ultima_calibragem = time.monotonic()
+
+    def _ocioso(self, fonte):
+        if time.monotonic() - self.ultima_calibragem >= self.intervalo_calibragem:
+            self._calibrar(fonte)
+        elif self.ao_vivo:
+            # Lê e descarta um bloco para o buffer não guardar áudio velho
+            # para o próximo pedido
+            fonte.stream.read(fonte.CHUNK)
+
+    def _transmitir(self, fonte, transmissao):
+        fim = time.monotonic() + transmissao.limite
+        try:
+            while not (transmissao.encerrar.is_set() or self._parar.is_set()) and time.monotonic() < fim:
+                bloco = fonte.stream.read(fonte.CHUNK)
+                if not bloco:
+                    break  # Fim do arquivo (modo de teste)
+                transmissao.blocos.put(bloco)
+        except Exception as e:
+            transmissao.blocos.put(e)
+        transmissao.blocos.put(None)
+
+    def run(self):
+        try:
+            with self.criar_fonte() as fonte:
+                self.taxa = getattr(fonte, "SAMPLE_RATE", self.taxa)
+                self.largura = getattr(fonte, "SAMPLE_WIDTH", self.largura)
+                self._calibrar(fonte)
+                self.aberto.set()
+                while not self._parar.is_set():
+                    try:
+                        # Arquivo WAV: espera o pedido sem consumir o áudio do teste
+                        pedido = self._pedidos.get_nowait() if self.ao_vivo else self._pedidos.get(timeout=0.05)
+                    except queue.Empty:
+                        self._ocioso(fonte)
+                        continue
+                    if isinstance(pedido, _Transmissao):
+                        self._transmitir(fonte, pedido)
+                        continue
+                    if pedido.cancelado:
+                        continue
+                    try:
+                        pedido.audio = self.recognizer.listen(
+                            fonte, timeout=pedido.timeout, phrase_time_limit=pedido.limite_frase
+                        )
+                    except Exception as e:
+                        pedido.erro = e
+                    pedido.pronto.set()
+        except Exception as e:
+            print(f"Erro no serviço de captura: {e}")
+            self.erro = e
+            self.aberto.set()
+        finally:
+            # Quem ainda estava esperando recebe o erro em vez de ficar preso
+            while True:
+                try:
+                    pedido = self._pedidos.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(pedido, _Transmissao):
+                    pedido.blocos.put(RuntimeError("Serviço de captura encerrado"))
+                    continue
+                pedido.erro = RuntimeError("Serviço de captura encerrado")
+                pedido.pronto.set()
@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import OrderedDict
+
+from isa_core.context_budget import papel_mensagem
+
+
+class _Sessao:
+    """Um chat do Gemini + o lock que serializa só as mensagens desta sessão."""
+
+    __slots__ = ("chat", "lock", "ultimo_uso", "tokens")
+
+    def __init__(self, chat):
+        self.chat = chat
+        self.lock = threading.Lock()
+        self.ultimo_uso = time.monotonic()
+        self.tokens = 0  # Tokens estimados do último envio (com orçamento)
+
+
+class ChatPool:
+    """
+    Pool de chats indexado por id de sessão (cookie ou header).
+
+    - LRU: passando de `max_sessoes`, a sessão menos usada é descartada.
+    - TTL: sessões paradas há mais de `ttl_ocioso` segundos são recriadas.
+    - Histórico: cada sessão guarda no máximo `max_turnos` pares user/model
+      (além das `prefixo` mensagens iniciais da persona).
+    - Com `orcamento` (OrcamentoContexto), o limite passa a ser em tokens:
+      os turnos antigos viram um resumo em vez de serem descartados. O
+      resumo é outra chamada à IA, então não acontece dentro do `enviar`:
+      quem envia chama `compactar` antes (fora do prazo e das repetições da
+      chamada principal). Os tokens só são anotados quando o envio dá certo.
+    - `no_historico`: o que fica no histórico no lugar do texto enviado
+      (ex.: a pergunta sem as passagens da base do campus, que só valem
+      para esta chamada e não devem ser reenviadas nos próximos turnos).
+    """
+
+    def __init__(self, fabrica_chat, max_sessoes=64, ttl_ocioso=900, max_turnos=10, prefixo=0, orcamento=None):
+        self.fabrica_chat = fabrica_chat  # Função sem argumentos que cria um chat novo
+        self.max_sessoes = max_sessoes
+        self.ttl_ocioso = ttl_ocioso
+        self.max_turnos = max_turnos
+        self.prefixo = prefixo
+        self.orcamento = orcamento
+        self._sessoes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessoes)
+
+    def __contains__(self, sessao_id):
+        return sessao_id in self._sessoes
+
+    def _obter(self, sessao_id):
+        agora = time.monotonic()
+        with self._lock:
+            self._expirar(agora)
+            sessao = self._sessoes.get(sessao_id)
+            if sessao is None:
+                sessao = _Sessao(self.fabrica_chat())
+                self._sessoes[sessao_id] = sessao
+                while len(self._sessoes) > self.max_sessoes:
+                    self._sessoes.popitem(last=False)
+            else:
+                self._sessoes.move_to_end(sessao_id)
+            sessao.ultimo_uso = agora
+            return sessao
+
+    def _expirar(self, agora):
+        # O OrderedDict está em ordem de uso, então basta olhar o começo
+        while self._sessoes:
+            sessao_id, sessao = next(iter(self._sessoes.items()))
+            if agora - sessao.ultimo_uso <= self.ttl_ocioso:
+                break
+            del self._sessoes[sessao_id]
+
+    def _podar_historico(self, chat):
+        # Abre espaço para o turno que vai ser enviado agora
+        manter = 2 * max(0, self.max_turnos - 1)
+        historico = list(chat.history)
+        if len(historico) > self.prefixo + manter:
+            chat.history = historico[:self.prefixo] + historico[len(historico) - manter:]
+
+    def _preparar(self, sessao):
+        # Chamado com o lock da sessão; devolve o histórico que vai junto com o envio
+        if self.orcamento is None:
+            self._podar_historico(sessao.chat)
+        return list(sessao.chat.history)
+
+    def _registrar(self, sessao, historico, texto):
+        # Só depois do envio dar certo: uma repetição não conta os tokens duas vezes
+        if self.orcamento is not None:
+            sessao.tokens = self.orcamento.registrar_envio(historico, texto)
+
+    @staticmethod
+    def _guardar_pergunta(chat, no_historico):
+        if no_historico is None:
+            return
+        historico = list(chat.history)
+        if len(historico) >= 2 and papel_mensagem(historico[-2]) == "user":
+            historico[-2] = {"role": "user", "parts": no_historico}
+            chat.history = historico
+
+    def compactar(self, sessao_id, texto):
+        """Resume os turnos antigos da sessão se o próximo envio passar do orçamento."""
+        if self.orcamento is None:
+            return
+        sessao = self._obter(sessao_id)
+        with sessao.lock:
+            compactado = self.orcamento.compactar(sessao.chat.history, texto)
+            if compactado is not None:
+                sessao.chat.history = compactado
+
+    def mensagens(self, sessao_id):
+        """Mensagens no histórico da sessão (0 se ela não existe ou já expirou)."""
+        with self._lock:
+            sessao = self._sessoes.get(sessao_id)
+        if sessao is None or time.monotonic() - sessao.ultimo_uso > self.ttl_ocioso:
+            return 0
+        return len(sessao.chat.history)
+
+    def tokens(self, sessao_id):
+        """Tokens estimados do último envio da sessão (0 sem orçamento ou sessão)."""
+        with self._lock:
+            sessao = self._sessoes.get(sessao_id)
+        return sessao.tokens if sessao is not None else 0
+
+    def enviar(self, sessao_id, texto, no_historico=None, **kwargs):
+        """Manda `texto` para o chat da sessão e devolve a resposta do modelo."""
+        sessao = self._obter(sessao_id)
+        with sessao.lock:
+            historico = self._preparar(sessao)
+            resposta = sessao.chat.send_message(texto, **kwargs)
+            self._guardar_pergunta(sessao.chat, no_historico)
+            self._registrar(sessao, historico, texto)
+            return resposta
+
+    def enviar_stream(self, sessao_id, texto, no_historico=None, **kwargs):
+        """
+        Igual a `enviar`, mas com stream=True: gera os pedaços de texto conforme
+        chegam. O lock da sessão fica preso até o stream terminar, porque o
+        chat só aceita a próxima mensagem depois de consumir a resposta inteira.
+        """
+        sessao = self._obter(sessao_id)
+        with sessao.lock:
+            historico = self._preparar(sessao)
+            for pedaco in sessao.chat.send_message(texto, stream=True, **kwargs):
+                if pedaco.text:
+                    yield pedaco.text
+            self._guardar_pergunta(sessao.chat, no_historico)
+            self._registrar(sessao, historico, texto)
+
+    def descartar(self, sessao_id):
+        with self._lock:
+            self._sessoes.pop(sessao_id, None)
+
+    def limpar(self):
+        with self._lock:
+            self._sessoes.clear()
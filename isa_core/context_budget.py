@@ -0,0 +1,122 @@
+import re
+import threading
+from collections import deque
+
+from .estatisticas import percentil
+
+PREFIXO_RESUMO = "Resumo da conversa até aqui:"
+CONFIRMACAO_RESUMO = "Entendido, vou considerar esse resumo."
+
+_FIM_FRASE = re.compile(r"(?<=[.!?])\s")
+
+
+def estimar_tokens(texto):
+    """Estimativa barata (~4 caracteres por token), sem chamar a API."""
+    return (len(texto) + 3) // 4
+
+
+def texto_mensagem(mensagem):
+    """Texto de uma mensagem do histórico (dict {"role", "parts"} ou Content do genai)."""
+    partes = mensagem["parts"] if isinstance(mensagem, dict) else mensagem.parts
+    if isinstance(partes, str):
+        return partes
+    return "".join(p if isinstance(p, str) else getattr(p, "text", "") for p in partes)
+
+
+def papel_mensagem(mensagem):
+    return mensagem["role"] if isinstance(mensagem, dict) else mensagem.role
+
+
+def resumo_local(resumo_anterior, mensagens, max_caracteres=600):
+    """Resumo sem IA: a primeira frase de cada mensagem (usado quando o modelo falha)."""
+    linhas = [resumo_anterior] if resumo_anterior else []
+    for papel, texto in mensagens:
+        primeira = _FIM_FRASE.split(texto.strip(), 1)[0]
+        linhas.append(f"{'Usuário' if papel == 'user' else 'ISA'}: {primeira}")
+    resumo = " ".join(linhas)
+    return resumo if len(resumo) <= max_caracteres else "..." + resumo[-max_caracteres:]
+
+
+class OrcamentoContexto:
+    """
+    Limite de tokens do histórico de um chat, com resumo das partes antigas.
+
+    Antes de cada envio, `compactar` estima os tokens do que vai para a API
+    (instrução de sistema + histórico + mensagem nova). Passando de
+    `max_tokens`, os turnos antigos (menos os `manter_turnos` mais recentes)
+    viram um resumo, guardado no começo do histórico como um par
+    usuário/modelo e atualizado a cada nova compactação (resumo contínuo).
+
+    `resumir(resumo_anterior, [(papel, texto)])` gera o resumo (ex.: com o
+    próprio Gemini); se ele falhar, vale o `resumo_local`. Os tokens
+    enviados em cada chamada ficam em `estatisticas()`.
+    """
+
+    def __init__(self, resumir=None, max_tokens=800, manter_turnos=2, tokens_fixos=0, amostras=200):
+        self.resumir = resumir or resumo_local
+        self.max_tokens = max_tokens
+        self.manter_turnos = manter_turnos
+        self.tokens_fixos = tokens_fixos  # Instrução de sistema, enviada em toda chamada
+        self.contadores = {"envios": 0, "compactacoes": 0, "resumos_locais": 0}
+        self._enviados = deque(maxlen=amostras)
+        self._lock = threading.Lock()
+
+    def tokens(self, historico, texto=""):
+        return self.tokens_fixos + estimar_tokens(texto) + sum(estimar_tokens(texto_mensagem(m)) for m in historico)
+
+    @staticmethod
+    def _separar_resumo(historico):
+        if len(historico) >= 2 and papel_mensagem(historico[0]) == "user":
+            primeiro = texto_mensagem(historico[0])
+            if primeiro.startswith(PREFIXO_RESUMO):
+                return primeiro[len(PREFIXO_RESUMO):].strip(), historico[2:]
+        return "", historico
+
+    def compactar(self, historico, texto):
+        """Histórico novo (com o resumo atualizado) ou None se ainda cabe no orçamento."""
+        historico = list(historico)
+        if self.tokens(historico, texto) <= self.max_tokens:
+            return None
+        resumo, turnos = self._separar_resumo(historico)
+        manter = 2 * self.manter_turnos
+        antigos, recentes = turnos[:max(0, len(turnos) - manter)], turnos[max(0, len(turnos) - manter):]
+        if not antigos:
+            return None  # Só os turnos recentes: não há o que resumir
+
+        mensagens = [(papel_mensagem(m), texto_mensagem(m)) for m in antigos]
+        try:
+            novo = self.resumir(resumo, mensagens).strip()
+        except Exception as e:
+            print(f"Erro ao resumir a conversa ({e}); usando o resumo local.")
+            novo = ""
+        if not novo:
+            novo = resumo_local(resumo, mensagens)
+            with self._lock:
+                self.contadores["resumos_locais"] += 1
+        with self._lock:
+            self.contadores["compactacoes"] += 1
+        return [
+            {"role": "user", "parts": f"{PREFIXO_RESUMO} {novo}"},
+            {"role": "model", "parts": CONFIRMACAO_RESUMO},
+        ] + recentes
+
+    def registrar_envio(self, historico, texto):
+        """Anota os tokens estimados de uma chamada e devolve o número."""
+        tokens = self.tokens(historico, texto)
+        with self._lock:
+            self.contadores["envios"] += 1
+            self._enviados.append(tokens)
+        return tokens
+
+    def estatisticas(self):
+        with self._lock:
+            enviados = sorted(self._enviados)
+            dados = dict(self.contadores)
+        dados["max_tokens"] = self.max_tokens
+        dados["tokens_por_envio"] = {
+            "media": round(sum(enviados) / len(enviados)) if enviados else 0,
+            "p50": percentil(enviados, 0.50) if enviados else 0,
+            "p95": percentil(enviados, 0.95) if enviados else 0,
+            "max": enviados[-1] if enviados else 0,
+        }
+        return dados
@@ -0,0 +1,9 @@
+"""Estatísticas pequenas compartilhadas pelos módulos que medem latência."""
+
+
+def percentil(valores, p):
+    """Valor no percentil `p` (0 a 1) da amostra, pelo método do vizinho mais próximo; 0.0 se vazia."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
@@ -0,0 +1,292 @@
+"""
+Dublês (fakes) para rodar a ISA sem internet, microfone ou caixa de som.
+
+Usados pelos benchmarks e para testar os subsistemas offline.
+"""
+import time
+
+
+class FakeResposta:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeChat:
+    """Imita o ChatSession do google.generativeai (history + send_message)."""
+
+    def __init__(self, model, history=None):
+        self.model = model
+        self.history = list(history or [])
+
+    def send_message(self, texto, stream=False, **kwargs):
+        self.model.chamadas += 1
+        self.model.falhar()
+        resposta = self.model.responder(texto, self.history)
+        self.history.append({"role": "user", "parts": texto})
+        self.history.append({"role": "model", "parts": resposta})
+        if stream:
+            return self._stream(resposta)
+        if self.model.atraso:
+            time.sleep(self.model.atraso)
+        return FakeResposta(resposta)
+
+    def _stream(self, resposta):
+        # Divide o atraso entre as palavras, como um modelo gerando tokens
+        palavras = resposta.split(" ")
+        for i, palavra in enumerate(palavras):
+            if self.model.atraso:
+                time.sleep(self.model.atraso / len(palavras))
+            yield FakeResposta(palavra if i == 0 else " " + palavra)
+
+
+class ResourceExhausted(Exception):
+    """Mesmo nome e código do erro de cota (429) do google.api_core."""
+
+    code = 429
+
+
+class FakeModel:
+    """
+    Imita o GenerativeModel: `start_chat` devolve um FakeChat.
+    Com `falhas=N`, as N primeiras mensagens lançam `erro` (ex.: cota
+    estourada); com `fora_do_ar=True`, todas lançam.
+    """
+
+    def __init__(self, atraso=0.0, resposta=None, falhas=0, erro=ResourceExhausted, fora_do_ar=False):
+        self.atraso = atraso
+        self.resposta = resposta
+        self.falhas = falhas
+        self.erro = erro
+        self.fora_do_ar = fora_do_ar
+        self.chamadas = 0
+        self.chats_criados = 0
+
+    def falhar(self):
+        if self.fora_do_ar or self.falhas > 0:
+            self.falhas = max(0, self.falhas - 1)
+            raise self.erro("Fake: serviço indisponível")
+
+    def responder(self, texto, history):
+        if self.resposta is not None:
+            return self.resposta
+        return f"Resposta para: {texto} ({len(history) // 2} turnos antes)"
+
+    def start_chat(self, history=None):
+        self.chats_criados += 1
+        return FakeChat(self, history)
+
+    def generate_content(self, texto, **kwargs):
+        # Usado para resumir conversas: devolve um "resumo" curto e fixo no tamanho
+        self.chamadas += 1
+        self.falhar()
+        if self.atraso:
+            time.sleep(self.atraso)
+        return FakeResposta(f"Resumo de {len(texto)} caracteres de conversa.")
+
+
+class FakeAudio:
+    """Imita o sr.AudioData: só carrega o texto que o FakeRecognizer vai "reconhecer"."""
+
+    def __init__(self, texto):
+        self.texto = texto
+
+
+class FakeRecognizer:
+    """Imita o sr.Recognizer: `listen` demora `atraso_fala` e `recognize_google` demora `atraso_rede`."""
+
+    def __init__(self, texto="aumentar volume", atraso_fala=0.0, atraso_rede=0.0):
+        self.texto = texto
+        self.atraso_fala = atraso_fala
+        self.atraso_rede = atraso_rede
+        self.energy_threshold = 300
+
+    def adjust_for_ambient_noise(self, source, duration=1):
+        pass
+
+    def listen(self, source=None, timeout=None, phrase_time_limit=None):
+        if self.atraso_fala:
+            time.sleep(self.atraso_fala)
+        return FakeAudio(self.texto)
+
+    def recognize_google(self, audio, language="pt-BR"):
+        if self.atraso_rede:
+            time.sleep(self.atraso_rede)
+        return audio.texto
+
+
+class FakeTTSEngine:
+    """
+    Imita o motor do pyttsx3 sem caixa de som: `runAndWait` "fala" cada palavra
+    em `atraso_palavra` segundos e chama os callbacks de 'started-word', então
+    `stop()` dentro do callback interrompe a fala como no motor real.
+    """
+
+    def __init__(self, atraso_palavra=0.0):
+        self.atraso_palavra = atraso_palavra
+        self.propriedades = {"rate": 200, "voice": None, "voices": []}
+        self.faladas = []        # Textos falados até o fim
+        self.interrompidas = []  # Textos cortados por stop()
+        self.salvas = []         # Textos renderizados com save_to_file
+        self._pendentes = []
+        self._callbacks = {}
+        self._parar = False
+
+    def getProperty(self, nome):
+        return self.propriedades.get(nome)
+
+    def setProperty(self, nome, valor):
+        self.propriedades[nome] = valor
+
+    def connect(self, evento, callback):
+        self._callbacks.setdefault(evento, []).append(callback)
+
+    def say(self, texto):
+        self._pendentes.append(texto)
+
+    def save_to_file(self, texto, caminho):
+        # Grava um WAV mudo (1 amostra por caractere) no lugar do áudio real
+        import wave
+        with wave.open(caminho, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b"\x00\x00" * len(texto))
+        self.salvas.append(texto)
+
+    def stop(self):
+        self._parar = True
+
+    def runAndWait(self):
+        pendentes, self._pendentes = self._pendentes, []
+        for texto in pendentes:
+            self._parar = False
+            posicao = 0
+            for palavra in texto.split():
+                for callback in self._callbacks.get("started-word", []):
+                    callback(texto, posicao, len(palavra))
+                if self._parar:
+                    break
+                if self.atraso_palavra:
+                    time.sleep(self.atraso_palavra)
+                posicao += len(palavra) + 1
+            (self.interrompidas if self._parar else self.faladas).append(texto)
+        self._parar = False
+
+
+class FakeFonte:
+    """
+    Imita sr.Microphone/sr.AudioFile como context manager (o FakeRecognizer não lê dela).
+    Com `audio` (bytes 16 bits mono), `stream.read` entrega esse áudio bloco a bloco.
+    """
+
+    CHUNK = 1024
+    SAMPLE_WIDTH = 2
+
+    def __init__(self, audio=b"", taxa=16000):
+        self.SAMPLE_RATE = taxa
+        self.stream = self
+        self._audio = audio
+        self._posicao = 0
+
+    def read(self, quadros):
+        bloco = self._audio[self._posicao:self._posicao + quadros * self.SAMPLE_WIDTH]
+        self._posicao += len(bloco)
+        return bloco
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class FakeDriver:
+    """
+    Imita o webdriver do Selenium sem abrir navegador. `fechar_janela()`
+    simula o usuário fechando o Chrome: depois disso os comandos falham como
+    numa sessão morta.
+    """
+
+    def __init__(self, atraso_inicio=0.0):
+        if atraso_inicio:
+            time.sleep(atraso_inicio)  # Custo de subir o Chrome
+        self.visitadas = []
+        self.abas = ["aba-0"]
+        self.scripts = []
+        self.encerrado = False
+        self.switch_to = self
+
+    def _checar(self):
+        if self.encerrado or not self.abas:
+            raise RuntimeError("invalid session id")
+
+    @property
+    def window_handles(self):
+        self._checar()
+        return list(self.abas)
+
+    @property
+    def current_url(self):
+        self._checar()
+        return self.visitadas[-1] if self.visitadas else "about:blank"
+
+    def new_window(self, tipo="tab"):
+        self._checar()
+        self.abas.append(f"aba-{len(self.abas)}")
+
+    def get(self, url):
+        self._checar()
+        self.visitadas.append(url)
+
+    def execute_script(self, script, *args):
+        self._checar()
+        self.scripts.append(script)
+
+    def maximize_window(self):
+        pass
+
+    def fechar_janela(self):
+        self.abas = []
+
+    def quit(self):
+        self.encerrado = True
+
+
+class FakeTexto:
+    """Imita o suficiente do widget Text do Tkinter (insert/delete/index/see) para testar logs sem tela."""
+
+    def __init__(self):
+        self.linhas = [""]
+
+    def insert(self, posicao, texto):
+        partes = texto.split("\n")
+        self.linhas[-1] += partes[0]
+        self.linhas.extend(partes[1:])
+
+    def index(self, posicao):
+        return f"{len(self.linhas)}.{len(self.linhas[-1])}"
+
+    def delete(self, inicio, fim):
+        # Só o formato usado pelo LogSink: "1.0" até "N.0" (apaga as linhas 1..N-1)
+        del self.linhas[:int(fim.split(".")[0]) - 1]
+
+    def see(self, posicao):
+        pass
+
+
+class FakeRootTk:
+    """Imita o root.after do Tk; `rodar_pendentes()` faz o papel de uma volta do mainloop."""
+
+    def __init__(self):
+        self._agendados = []
+
+    def after(self, ms, funcao, *args):
+        self._agendados.append((funcao, args))
+
+    def rodar_pendentes(self):
+        agendados, self._agendados = self._agendados, []
+        for funcao, args in agendados:
+            funcao(*args)
+
+    def update(self):
+        self.rodar_pendentes()
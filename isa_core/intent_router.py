@@ -0,0 +1,144 @@
+import re
+import unicodedata
+from collections import namedtuple
+
+Intencao = namedtuple("Intencao", "nome slots")
+
+
+def _tabela_dobra():
+    # Um caractere vira exatamente um caractere, então posições no texto dobrado
+    # valem também no texto original (útil para recortar slots sem perder acentos).
+    tabela = {}
+    for codigo in range(0x250):
+        c = chr(codigo)
+        base = "".join(x for x in unicodedata.normalize("NFKD", c) if not unicodedata.combining(x))
+        base = base[:1].lower() if base else " "
+        if not (base.isascii() and base.isalnum()):
+            base = " "
+        if base != c:
+            tabela[codigo] = base
+    return tabela
+
+
+_DOBRA = _tabela_dobra()
+_PROXIMA_PALAVRA = re.compile(r"\s*([a-z0-9]+)")
+
+# Começos de pergunta: "o que é um print?" não é o comando "print"
+PERGUNTAS = (
+    "que", "o que", "qual", "quais", "como", "quando", "onde", "quem", "quanto", "quanta",
+    "quantos", "quantas", "por que", "porque", "pra que", "para que", "sera", "e possivel",
+)
+
+
+def dobrar(texto):
+    """Minúsculas, sem acento e pontuação viram espaço (mesmo tamanho do original)."""
+    return texto.translate(_DOBRA)
+
+
+class IntentRouter:
+    """
+    Roteador de comandos compilado a partir de uma tabela declarativa.
+
+    Cada entrada da tabela é um dict:
+        nome          -> nome da intenção devolvida
+        gatilhos      -> palavras/frases que ativam a intenção
+        slots         -> {slot: {valor: [palavras]}} preenchidos pelo texto
+        obrigatorios  -> slots sem os quais a intenção não vale
+        resto         -> nome do slot que recebe o texto depois do gatilho
+        descartar     -> palavras ignoradas no começo do `resto` ("o", "site"...)
+        resto_bruto   -> nome do slot que recebe o texto depois do gatilho sem
+                         descartar nada ("o portal do campus")
+        antes         -> palavras que podem vir antes do gatilho ("tira um print")
+
+    Todas as palavras viram uma única regex (com limites de palavra e sem
+    acentos), então o texto é percorrido uma vez só, não importa quantos
+    comandos existam. Em caso de empate vale a ordem da tabela.
+
+    Com `posicao_comando=True` (comandos que fazem alguma coisa), o gatilho
+    só vale em posição de comando: antes dele, só `prefixos` ("isa", "por
+    favor"), as palavras `antes` da entrada e as próprias palavras da entrada
+    ("aumenta o volume"). Perguntas nunca viram comando: frases que começam
+    com uma das `perguntas` ("qual", "o que"...) ou que têm "?" sem começar
+    por um prefixo ("pode abrir o youtube?" ainda é um pedido).
+    """
+
+    def __init__(self, tabela, posicao_comando=False, prefixos=(), perguntas=PERGUNTAS):
+        self.tabela = list(tabela)
+        self.posicao_comando = posicao_comando
+        self._prefixos = frozenset(p for frase in prefixos for p in dobrar(frase).split())
+        self._perguntas = tuple(" ".join(dobrar(p).split()) for p in perguntas)
+        self._papeis = {}  # frase dobrada -> [(indice, slot, valor)]
+        for i, entrada in enumerate(self.tabela):
+            for gatilho in entrada.get("gatilhos", ()):
+                self._registrar(gatilho, (i, None, None))
+            for slot, valores in entrada.get("slots", {}).items():
+                for valor, palavras in valores.items():
+                    for palavra in palavras:
+                        self._registrar(palavra, (i, slot, valor))
+        self._descartar = [frozenset(dobrar(p) for p in e.get("descartar", ())) for e in self.tabela]
+        # Palavras aceitas antes do gatilho de cada entrada (modo posicao_comando)
+        self._antes = []
+        for e in self.tabela:
+            frases = list(e.get("antes", ())) + list(e.get("gatilhos", ()))
+            frases += [p for valores in e.get("slots", {}).values() for palavras in valores.values() for p in palavras]
+            self._antes.append(self._prefixos | {p for frase in frases for p in dobrar(frase).split()})
+
+        # Frases mais longas primeiro: "bloco de notas" ganha de "bloco"
+        frases = sorted(self._papeis, key=len, reverse=True)
+        padrao = "|".join(re.escape(f).replace(r"\ ", r"\s+") for f in frases)
+        self._regex = re.compile(rf"\b(?:{padrao})\b") if frases else None
+
+    def _registrar(self, frase, papel):
+        chave = " ".join(dobrar(frase).split())
+        if chave:
+            self._papeis.setdefault(chave, []).append(papel)
+
+    def rotear(self, texto):
+        """Devolve Intencao(nome, slots) ou None se nada casar."""
+        if self._regex is None:
+            return None
+        dobrado = dobrar(texto)
+        if self.posicao_comando and self._pergunta(texto, dobrado):
+            return None
+        gatilhos = {}  # indice da intenção -> (início, fim) do primeiro gatilho
+        slots = {}
+        for m in self._regex.finditer(dobrado):
+            for i, slot, valor in self._papeis[" ".join(m.group().split())]:
+                if slot is None:
+                    gatilhos.setdefault(i, m.span())
+                else:
+                    slots.setdefault(i, {}).setdefault(slot, valor)
+
+        for i in sorted(gatilhos):
+            entrada = self.tabela[i]
+            encontrados = dict(slots.get(i, {}))
+            if any(s not in encontrados for s in entrada.get("obrigatorios", ())):
+                continue
+            inicio, fim = gatilhos[i]
+            if self.posicao_comando and any(p not in self._antes[i] for p in dobrado[:inicio].split()):
+                continue  # "me fale sobre o som da guitarra" não mexe no volume
+            if "resto" in entrada:
+                encontrados[entrada["resto"]] = self._resto(texto, dobrado, fim, i)
+            if "resto_bruto" in entrada:
+                encontrados[entrada["resto_bruto"]] = texto[fim:].strip(" ,.;:!?")
+            return Intencao(entrada["nome"], encontrados)
+        return None
+
+    def _pergunta(self, texto, dobrado):
+        palavras = dobrado.split()
+        comeco = 0
+        while comeco < len(palavras) and palavras[comeco] in self._prefixos:
+            comeco += 1
+        frase = " ".join(palavras[comeco:])
+        if any(frase == p or frase.startswith(p + " ") for p in self._perguntas):
+            return True
+        return "?" in texto and comeco == 0
+
+    def _resto(self, texto, dobrado, inicio, i):
+        descartar = self._descartar[i]
+        while True:
+            m = _PROXIMA_PALAVRA.match(dobrado, inicio)
+            if not m or m.group(1) not in descartar:
+                break
+            inicio = m.end()
+        return texto[inicio:].strip(" ,.;:!?")
@@ -0,0 +1,207 @@
+import itertools
+import math
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+
+from isa_core.intent_router import dobrar
+from isa_core.response_cache import STOP_WORDS_BUSCA
+
+EXTENSOES = (".md", ".txt")
+
+Passagem = namedtuple("Passagem", "id arquivo titulo texto")
+Resultado = namedtuple("Resultado", "passagem pontuacao confianca")
+
+
+def _raiz(palavra):
+    # Plural simples: "horarios" e "horario" viram o mesmo termo
+    return palavra[:-1] if len(palavra) > 3 and palavra.endswith("s") else palavra
+
+
+def termos(texto):
+    """Termos indexados: sem acento, sem stop words, sem o "s" do plural."""
+    return [_raiz(p) for p in dobrar(texto).split() if p not in STOP_WORDS_BUSCA]
+
+
+def dividir_passagens(conteudo):
+    """
+    (título, texto) de cada parágrafo. Linhas "# ..." viram o título dos
+    parágrafos seguintes; cada item de lista ("- ...") é uma passagem.
+    """
+    titulo, linhas, passagens = "", [], []
+
+    def fechar():
+        if linhas:
+            passagens.append((titulo, " ".join(linhas)))
+            linhas.clear()
+
+    for linha in conteudo.splitlines():
+        linha = linha.strip()
+        if not linha:
+            fechar()
+        elif linha.startswith("#"):
+            fechar()
+            titulo = linha.lstrip("#").strip()
+        elif linha.startswith(("- ", "* ")):
+            fechar()
+            linhas.append(linha[2:].strip())
+            fechar()
+        else:
+            linhas.append(linha)
+    fechar()
+    return passagens
+
+
+class BaseConhecimento:
+    """
+    Índice invertido (BM25) dos documentos do campus numa pasta (.md/.txt):
+
+        # Biblioteca
+        A biblioteca funciona das 8h às 21h, de segunda a sexta.
+
+    Cada parágrafo é uma passagem, indexada junto com o título acima dela.
+    `buscar` devolve as melhores passagens com a pontuação BM25 e uma
+    confiança de 0 a 1: quanto do peso (idf) das palavras da pergunta
+    aparece na passagem. Palavras que não existem em nenhum documento
+    derrubam a confiança, então "me conte uma piada sobre a biblioteca"
+    não vira a resposta pronta da biblioteca.
+
+    A pasta é checada no máximo a cada `intervalo_checagem` segundos,
+    durante as buscas; só os arquivos novos, alterados ou apagados são
+    reindexados.
+    """
+
+    def __init__(self, pasta, k1=1.5, b=0.75, intervalo_checagem=2.0):
+        self.pasta = pasta
+        self.k1 = k1
+        self.b = b
+        self.intervalo_checagem = intervalo_checagem
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._passagens = {}   # id -> Passagem
+        self._frequencias = {}  # id -> Counter de termos
+        self._comprimentos = {}  # id -> número de termos
+        self._indice = {}      # termo -> {id: frequência}
+        self._arquivos = {}    # caminho -> (mtime, tamanho, [ids])
+        self._comprimento_total = 0
+        self._ultima_checagem = 0.0
+        self.atualizar()
+
+    def __len__(self):
+        return len(self._passagens)
+
+    def _adicionar(self, caminho, conteudo):
+        ids = []
+        for titulo, texto in dividir_passagens(conteudo):
+            frequencias = Counter(termos(f"{titulo} {texto}"))
+            if not frequencias:
+                continue
+            pid = next(self._ids)
+            self._passagens[pid] = Passagem(pid, os.path.basename(caminho), titulo, texto)
+            self._frequencias[pid] = frequencias
+            self._comprimentos[pid] = sum(frequencias.values())
+            self._comprimento_total += self._comprimentos[pid]
+            for termo, n in frequencias.items():
+                self._indice.setdefault(termo, {})[pid] = n
+            ids.append(pid)
+        return ids
+
+    def _remover(self, ids):
+        for pid in ids:
+            frequencias = self._frequencias.pop(pid)
+            del self._passagens[pid]
+            self._comprimento_total -= self._comprimentos.pop(pid)
+            for termo in frequencias:
+                postagens = self._indice[termo]
+                del postagens[pid]
+                if not postagens:
+                    del self._indice[termo]
+
+    def atualizar(self):
+        """Reindexa só o que mudou na pasta. Devolve quantos arquivos foram (re)lidos ou removidos."""
+        try:
+            nomes = [n for n in os.listdir(self.pasta) if n.lower().endswith(EXTENSOES)]
+        except OSError:
+            nomes = []
+        atuais = {}
+        for nome in nomes:
+            caminho = os.path.join(self.pasta, nome)
+            try:
+                info = os.stat(caminho)
+            except OSError:
+                continue
+            atuais[caminho] = (info.st_mtime, info.st_size)
+
+        mudancas = 0
+        with self._lock:
+            for caminho in set(self._arquivos) - set(atuais):
+                self._remover(self._arquivos.pop(caminho)[2])
+                mudancas += 1
+            for caminho, assinatura in atuais.items():
+                anterior = self._arquivos.get(caminho)
+                if anterior is not None and anterior[:2] == assinatura:
+                    continue
+                try:
+                    with open(caminho, encoding="utf-8") as f:
+                        conteudo = f.read()
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"Erro ao indexar {caminho}: {e}")
+                    continue
+                if anterior is not None:
+                    self._remover(anterior[2])
+                self._arquivos[caminho] = (*assinatura, self._adicionar(caminho, conteudo))
+                mudancas += 1
+        return mudancas
+
+    def _checar_pasta(self):
+        agora = time.monotonic()
+        if agora - self._ultima_checagem < self.intervalo_checagem:
+            return
+        self._ultima_checagem = agora
+        self.atualizar()
+
+    def buscar(self, pergunta, k=3):
+        """Até `k` Resultados, do mais relevante para o menos."""
+        self._checar_pasta()
+        consulta = set(termos(pergunta))
+        if not consulta:
+            return []
+        with self._lock:
+            total = len(self._passagens)
+            if not total:
+                return []
+            media = self._comprimento_total / total
+            idf = {}
+            pontos = {}
+            for termo in consulta:
+                postagens = self._indice.get(termo, {})
+                idf[termo] = math.log(1 + (total - len(postagens) + 0.5) / (len(postagens) + 0.5))
+                for pid, n in postagens.items():
+                    normal = self.k1 * (1 - self.b + self.b * self._comprimentos[pid] / media)
+                    pontos[pid] = pontos.get(pid, 0.0) + idf[termo] * n * (self.k1 + 1) / (n + normal)
+
+            melhores = sorted(pontos.items(), key=lambda item: item[1], reverse=True)[:k]
+            peso_total = sum(idf.values())
+            resultados = []
+            for pid, pontuacao in melhores:
+                presentes = self._frequencias[pid]
+                cobertura = sum(peso for termo, peso in idf.items() if termo in presentes)
+                resultados.append(Resultado(self._passagens[pid], pontuacao, cobertura / peso_total))
+            return resultados
+
+    def resposta_direta(self, pergunta, confianca_minima=0.8):
+        """Texto da melhor passagem se ela cobrir a pergunta com folga; senão None."""
+        resultados = self.buscar(pergunta, k=1)
+        if resultados and resultados[0].confianca >= confianca_minima:
+            return resultados[0].passagem.texto
+        return None
+
+    def contexto(self, pergunta, k=3, confianca_minima=0.3):
+        """Passagens relevantes formatadas para ir junto da pergunta à IA ("" se nenhuma)."""
+        linhas = []
+        for resultado in self.buscar(pergunta, k):
+            if resultado.confianca >= confianca_minima:
+                passagem = resultado.passagem
+                linhas.append(f"- {passagem.titulo}: {passagem.texto}" if passagem.titulo else f"- {passagem.texto}")
+        return "\n".join(linhas)
@@ -0,0 +1,331 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
+
+# Nomes das exceções do google.api_core (e afins) que valem uma nova tentativa
+ERROS_TRANSITORIOS = frozenset({
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway", "Aborted",
+})
+CODIGOS_TRANSITORIOS = frozenset({429, 500, 502, 503, 504})
+
+
+def transitorio(erro):
+    """True para erros de rede/cota que costumam passar sozinhos."""
+    if isinstance(erro, (TimeoutError, ConnectionError)):
+        return True
+    if any(c.__name__ in ERROS_TRANSITORIOS for c in type(erro).__mro__):
+        return True
+    codigo = getattr(erro, "code", None)
+    return isinstance(codigo, int) and codigo in CODIGOS_TRANSITORIOS
+
+
+class IAIndisponivel(Exception):
+    """A chamada nem foi feita (ou foi abandonada): responda 503 com Retry-After."""
+
+    mensagem = "A inteligência artificial está indisponível no momento. Tente de novo em instantes."
+
+    def __init__(self, retry_after, detalhe=""):
+        super().__init__(detalhe or self.mensagem)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class FilaCheia(IAIndisponivel):
+    mensagem = "Estou recebendo muitas perguntas agora. Tente de novo em alguns segundos."
+
+
+class CircuitoAberto(IAIndisponivel):
+    mensagem = "A inteligência artificial está fora do ar no momento. Tente de novo em instantes."
+
+
+class PrazoEsgotado(IAIndisponivel):
+    mensagem = "A inteligência artificial demorou demais para responder. Tente de novo."
+
+
+class BaldeTokens:
+    """Limite de chamadas por segundo com rajada (token bucket)."""
+
+    def __init__(self, por_segundo, capacidade):
+        self.por_segundo = por_segundo
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _repor(self, agora):
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.por_segundo)
+        self._ultimo = agora
+
+    def disponiveis(self):
+        with self._lock:
+            self._repor(time.monotonic())
+            return self._tokens
+
+    def consumir(self, ate):
+        """Espera um token até o instante `ate` (monotonic). False se não der tempo."""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._repor(agora)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                espera = (1 - self._tokens) / self.por_segundo
+            if agora + espera > ate:
+                return False
+            time.sleep(espera)
+
+
+class Disjuntor:
+    """
+    Circuit breaker: `limite_falhas` falhas seguidas abrem o circuito por
+    `tempo_aberto` segundos (tudo falha na hora); depois, uma única chamada
+    de teste (meio aberto) decide se ele fecha ou abre de novo.
+    """
+
+    FECHADO, ABERTO, MEIO_ABERTO = "fechado", "aberto", "meio_aberto"
+
+    def __init__(self, limite_falhas=5, tempo_aberto=30.0):
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.falhas_seguidas = 0
+        self._aberto_em = None
+        self._testando = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self):
+        with self._lock:
+            return self._estado(time.monotonic())
+
+    def _estado(self, agora):
+        if self._aberto_em is None:
+            return self.FECHADO
+        if agora - self._aberto_em < self.tempo_aberto:
+            return self.ABERTO
+        return self.MEIO_ABERTO
+
+    def permitir(self):
+        """0 se a chamada pode seguir; senão, segundos até a próxima tentativa valer a pena."""
+        with self._lock:
+            agora = time.monotonic()
+            estado = self._estado(agora)
+            if estado == self.FECHADO:
+                return 0
+            if estado == self.MEIO_ABERTO and not self._testando:
+                self._testando = True
+                return 0
+            return max(1.0, self._aberto_em + self.tempo_aberto - agora)
+
+    def sucesso(self):
+        with self._lock:
+            self.falhas_seguidas = 0
+            self._aberto_em = None
+            self._testando = False
+
+    def falha(self):
+        with self._lock:
+            self.falhas_seguidas += 1
+            if self._testando or self.falhas_seguidas >= self.limite_falhas:
+                self._aberto_em = time.monotonic()
+            self._testando = False
+
+    def liberar_teste(self):
+        """A chamada de teste terminou sem dizer nada sobre o serviço (ex.: erro do próprio pedido)."""
+        with self._lock:
+            self._testando = False
+
+
+class ClienteIA:
+    """
+    Todas as chamadas ao Gemini passam por aqui:
+
+        resposta = cliente.chamar(lambda timeout: chat.send_message(texto, request_options={"timeout": timeout}))
+
+    - Fila limitada: no máximo `max_em_voo` chamadas rodando e `max_fila`
+      esperando; além disso, FilaCheia na hora (a rota responde 503 com
+      Retry-After em vez de prender mais uma thread).
+    - Cota: balde de tokens com `limite_por_minuto` e rajada de `rajada`.
+    - Prazo: cada chamada tem `prazo` segundos no total (fila + cota +
+      tentativas); estourando, PrazoEsgotado. A função recebe o tempo que
+      sobra, para repassar como timeout do SDK.
+    - Erros transitórios (429, 503, timeout...) são repetidos até
+      `tentativas` vezes, com espera exponencial aleatória (jitter).
+    - Disjuntor: falhas seguidas abrem o circuito e as chamadas falham na
+      hora (CircuitoAberto) até o serviço voltar.
+    `estado()` mostra o circuito, a fila e os contadores.
+    """
+
+    def __init__(self, limite_por_minuto=15, rajada=5, max_em_voo=4, max_fila=8, prazo=20.0,
+                 tentativas=3, espera_base=0.5, espera_max=8.0, limite_falhas=5, tempo_aberto=30.0):
+        self.prazo = prazo
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.max_em_voo = max_em_voo
+        self.max_fila = max_fila
+        self.balde = BaldeTokens(limite_por_minuto / 60.0, rajada)
+        self.disjuntor = Disjuntor(limite_falhas, tempo_aberto)
+        self._vagas = threading.BoundedSemaphore(max_em_voo + max_fila)
+        self._em_voo = threading.BoundedSemaphore(max_em_voo)
+        self._pool = ThreadPoolExecutor(max_workers=max_em_voo, thread_name_prefix="isa-ia")
+        self._lock = threading.Lock()
+        self._esperando = 0
+        self._rodando = 0
+        self.contadores = {
+            "chamadas": 0, "sucessos": 0, "falhas": 0, "repeticoes": 0,
+            "recusadas_fila": 0, "recusadas_circuito": 0, "prazos_esgotados": 0,
+        }
+
+    def _contar(self, nome, n=1):
+        with self._lock:
+            self.contadores[nome] += n
+
+    def _retry_after_fila(self):
+        # Estimativa: o tempo para a cota liberar as chamadas que já estão na frente
+        return (self._esperando + 1) / self.balde.por_segundo / max(1, self.max_em_voo)
+
+    def _admitir(self):
+        espera = self.disjuntor.permitir()
+        if espera:
+            self._contar("recusadas_circuito")
+            raise CircuitoAberto(espera)
+        if not self._vagas.acquire(blocking=False):
+            self.disjuntor.liberar_teste()
+            self._contar("recusadas_fila")
+            raise FilaCheia(self._retry_after_fila())
+
+    def _esperar_vez(self, ate):
+        """Vaga de execução + token da cota; lança PrazoEsgotado se o prazo acabar antes."""
+        with self._lock:
+            self._esperando += 1
+        try:
+            if not self._em_voo.acquire(timeout=max(0.0, ate - time.monotonic())):
+                raise PrazoEsgotado(self.espera_max)
+            if not self.balde.consumir(ate):
+                self._em_voo.release()
+                raise PrazoEsgotado(1 / self.balde.por_segundo)
+        finally:
+            with self._lock:
+                self._esperando -= 1
+
+    def _pausa(self, tentativa, ate):
+        espera = random.uniform(0, min(self.espera_max, self.espera_base * 2 ** tentativa))
+        if time.monotonic() + espera >= ate:
+            return False
+        time.sleep(espera)
+        return True
+
+    def _liberar(self, _futuro=None):
+        with self._lock:
+            self._rodando -= 1
+        self._em_voo.release()
+
+    def chamar(self, funcao, prazo=None):
+        """Roda `funcao(timeout)` com fila, cota, prazo, repetições e disjuntor."""
+        self._admitir()
+        self._contar("chamadas")
+        ate = time.monotonic() + (prazo or self.prazo)
+        try:
+            for tentativa in range(self.tentativas):
+                try:
+                    self._esperar_vez(ate)
+                except PrazoEsgotado:
+                    # Faltou vaga ou cota aqui mesmo: o Gemini nem foi chamado, não conta para o disjuntor
+                    self._contar("prazos_esgotados")
+                    self.disjuntor.liberar_teste()
+                    raise
+                with self._lock:
+                    self._rodando += 1
+                # A vaga só volta quando a chamada termina de fato, mesmo se o prazo estourar antes
+                futuro = self._pool.submit(funcao, max(0.1, ate - time.monotonic()))
+                futuro.add_done_callback(self._liberar)
+                try:
+                    resultado = futuro.result(timeout=max(0.0, ate - time.monotonic()))
+                except FuturoTimeout:
+                    self._contar("prazos_esgotados")
+                    self.disjuntor.falha()
+                    raise PrazoEsgotado(self.espera_max) from None
+                except Exception as e:
+                    if not transitorio(e):
+                        self.disjuntor.liberar_teste()  # Erro do pedido, não do serviço
+                        self._contar("falhas")
+                        raise
+                    self.disjuntor.falha()
+                    if tentativa + 1 >= self.tentativas or not self._pausa(tentativa, ate):
+                        self._contar("falhas")
+                        raise
+                    if self.disjuntor.permitir():
+                        self._contar("falhas")
+                        raise
+                    self._contar("repeticoes")
+                    continue
+                self.disjuntor.sucesso()
+                self._contar("sucessos")
+                return resultado
+        finally:
+            self._vagas.release()
+
+    def chamar_stream(self, funcao, prazo=None):
+        """
+        Gerador: como `chamar`, para respostas em stream (`funcao(timeout)`
+        devolve um iterável). Só repete se o erro vier antes do primeiro
+        pedaço; o prazo vale até o primeiro pedaço (o resto é do SDK).
+        """
+        self._admitir()
+        self._contar("chamadas")
+        ate = time.monotonic() + (prazo or self.prazo)
+        try:
+            for tentativa in range(self.tentativas):
+                try:
+                    self._esperar_vez(ate)
+                except PrazoEsgotado:
+                    # Faltou vaga ou cota aqui mesmo: o Gemini nem foi chamado, não conta para o disjuntor
+                    self._contar("prazos_esgotados")
+                    self.disjuntor.liberar_teste()
+                    raise
+                with self._lock:
+                    self._rodando += 1
+                recebeu = False
+                try:
+                    for pedaco in funcao(max(0.1, ate - time.monotonic())):
+                        recebeu = True
+                        yield pedaco
+                except GeneratorExit:
+                    # O cliente desistiu no meio: só conta como sucesso se o serviço já respondeu
+                    self.disjuntor.sucesso() if recebeu else self.disjuntor.liberar_teste()
+                    raise
+                except Exception as e:
+                    if not transitorio(e):
+                        self.disjuntor.liberar_teste()
+                        self._contar("falhas")
+                        raise
+                    self.disjuntor.falha()
+                    if recebeu or tentativa + 1 >= self.tentativas or not self._pausa(tentativa, ate):
+                        self._contar("falhas")
+                        raise
+                    if self.disjuntor.permitir():
+                        self._contar("falhas")
+                        raise
+                    self._contar("repeticoes")
+                    continue
+                finally:
+                    self._liberar()
+                self.disjuntor.sucesso()
+                self._contar("sucessos")
+                return
+        finally:
+            self._vagas.release()
+
+    def estado(self):
+        with self._lock:
+            dados = dict(self.contadores)
+            dados["em_voo"] = self._rodando
+            dados["na_fila"] = self._esperando
+        dados["circuito"] = self.disjuntor.estado
+        dados["falhas_seguidas"] = self.disjuntor.falhas_seguidas
+        dados["cota_disponivel"] = round(self.balde.disponiveis(), 2)
+        dados["limites"] = {"max_em_voo": self.max_em_voo, "max_fila": self.max_fila, "prazo_s": self.prazo}
+        return dados
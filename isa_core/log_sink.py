@@ -0,0 +1,80 @@
+import logging
+import queue
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+
+class LogSink:
+    """
+    Log da interface Tkinter que aceita mensagens de qualquer thread.
+
+    `escrever` só coloca a linha numa fila (e no arquivo de log, se houver);
+    quem mexe no widget é `_descarregar`, chamado pelo loop do Tk via
+    `root.after` a cada `intervalo_ms`, que insere tudo o que chegou num único
+    insert e apaga as linhas mais antigas quando o widget passa de
+    `max_linhas`. Numa rajada, só as últimas `max_linhas` da fila chegam ao
+    widget: o custo de cada volta do loop fica limitado.
+    O arquivo em disco guarda tudo, com rotação (`max_bytes` x `backups`).
+    """
+
+    def __init__(self, max_linhas=1000, intervalo_ms=100, arquivo=None, max_bytes=1024 * 1024, backups=3):
+        self.max_linhas = max_linhas
+        self.intervalo_ms = intervalo_ms
+        self.widget = None
+        self.root = None
+        self.descartadas = 0  # Linhas apagadas do widget pelo limite (continuam no arquivo)
+        self._fila = queue.SimpleQueue()
+        self._arquivo = None
+        if arquivo:
+            self._arquivo = logging.getLogger(f"isa.log_sink.{id(self)}")
+            self._arquivo.propagate = False
+            self._arquivo.setLevel(logging.INFO)
+            handler = RotatingFileHandler(arquivo, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._arquivo.addHandler(handler)
+
+    def anexar(self, widget, root):
+        """Liga o sink ao widget Text; o descarregamento roda no loop do Tk."""
+        self.widget = widget
+        self.root = root
+        root.after(self.intervalo_ms, self._descarregar)
+
+    def escrever(self, linha):
+        """Pode ser chamado de qualquer thread."""
+        self._fila.put(linha)
+        if self._arquivo is not None:
+            self._arquivo.info(linha)
+
+    def pendentes(self):
+        return self._fila.qsize()
+
+    def _descarregar(self):
+        try:
+            self.descarregar()
+        finally:
+            self.root.after(self.intervalo_ms, self._descarregar)
+
+    def descarregar(self):
+        """Passa o que está na fila para o widget (só na thread do Tk). Devolve quantas linhas."""
+        if self.widget is None:
+            return 0
+        lote = deque(maxlen=self.max_linhas)  # Linhas além do limite sairiam do widget de qualquer jeito
+        recebidas = 0
+        for _ in range(self._fila.qsize()):
+            try:
+                lote.append(self._fila.get_nowait())
+            except queue.Empty:
+                break
+            recebidas += 1
+        if not lote:
+            return 0
+        self.descartadas += recebidas - len(lote)
+        self.widget.insert("end", "\n" + "\n".join(lote))
+
+        linhas = int(self.widget.index("end-1c").split(".")[0])
+        excesso = linhas - self.max_linhas
+        if excesso > 0:
+            self.widget.delete("1.0", f"{excesso + 1}.0")
+            self.descartadas += excesso
+        self.widget.see("end")
+        return len(lote)
@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+import zlib
+from collections import deque, namedtuple
+
+# Uma leitura das métricas, já serializada para ser servida sem custo extra
+Amostra = namedtuple("Amostra", "instante dados json etag")
+
+
+def etag_confere(if_none_match, etag):
+    """True se o header If-None-Match do cliente já contém este ETag."""
+    if not if_none_match:
+        return False
+    candidatos = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidatos or etag in candidatos or f"W/{etag}" in candidatos
+
+
+class Assinatura:
+    """
+    Recebe as variações do amostrador numa thread (ex.: rota SSE do Flask).
+
+    As variações que chegam enquanto o cliente ainda não leu são mescladas num
+    único dict, então um painel lento nunca acumula fila nem perde um campo.
+    """
+
+    def __init__(self):
+        self._pendente = {}
+        self._lock = threading.Lock()
+        self._sinal = threading.Event()
+
+    def entregar(self, delta):
+        with self._lock:
+            self._pendente.update(delta)
+        self._sinal.set()
+
+    def esperar(self, timeout=None):
+        """Variações acumuladas desde a última chamada, ou None se deu timeout."""
+        if not self._sinal.wait(timeout):
+            return None
+        with self._lock:
+            delta, self._pendente = self._pendente, {}
+            self._sinal.clear()
+        return delta
+
+
+class MetricsSampler(threading.Thread):
+    """
+    Thread única que lê as métricas a cada `intervalo` segundos.
+
+    Quem consulta recebe a última amostra pronta (O(1)), não importa quantos
+    painéis estejam abertos. As últimas `tamanho_historico` amostras ficam
+    num buffer circular.
+
+    Também distribui as variações para os assinantes (push): só vão os campos
+    que mudaram pelo menos `limiares[campo]` desde o último envio.
+    """
+
+    def __init__(self, coletar, intervalo=1.0, tamanho_historico=300, limiares=None):
+        super().__init__(name="isa-metricas")
+        self.daemon = True  # Morre junto com o programa
+        self.coletar = coletar
+        self.intervalo = intervalo
+        self.limiares = limiares or {}
+        self._historico = deque(maxlen=tamanho_historico)
+        self._parar = threading.Event()
+        self._ultima = None
+        self._publicado = {}    # Valores que os assinantes já conhecem
+        self._assinantes = set()
+        self._lock_assinantes = threading.Lock()
+        self.amostrar()  # Já nasce com uma amostra, sem janela vazia no início
+        self.start()
+
+    def amostrar(self):
+        dados = self.coletar()
+        corpo = json.dumps(dados, separators=(",", ":"))
+        # O ETag depende só dos valores: se nada mudou, o navegador recebe 304
+        etag = f'"{zlib.crc32(corpo.encode()):08x}"'
+        amostra = Amostra(time.time(), dados, corpo, etag)
+        self._historico.append(amostra)
+        self._ultima = amostra
+        self._publicar(dados)
+        return amostra
+
+    def _mudou(self, campo, valor):
+        anterior = self._publicado.get(campo)
+        if anterior is None or valor == anterior:
+            return anterior is None
+        if isinstance(valor, (int, float)) and isinstance(anterior, (int, float)):
+            return abs(valor - anterior) >= self.limiares.get(campo, 0)
+        return True
+
+    def _publicar(self, dados):
+        with self._lock_assinantes:
+            delta = {k: v for k, v in dados.items() if self._mudou(k, v)}
+            if not delta:
+                return
+            self._publicado.update(delta)
+            assinantes = list(self._assinantes)
+        for entregar in assinantes:
+            try:
+                entregar(delta)
+            except Exception as e:
+                print(f"Erro ao enviar métricas: {e}")
+
+    def assinar(self, entregar):
+        """
+        Registra `entregar(delta)`, chamado na thread do amostrador a cada variação.
+        Devolve (valores atuais, função para cancelar a assinatura).
+        """
+        with self._lock_assinantes:
+            self._assinantes.add(entregar)
+            atual = dict(self._publicado)
+
+        def cancelar():
+            with self._lock_assinantes:
+                self._assinantes.discard(entregar)
+
+        return atual, cancelar
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.amostrar()
+            except Exception as e:
+                print(f"Erro ao ler métricas: {e}")
+
+    def ultima(self):
+        return self._ultima
+
+    def historico(self, janela=None):
+        """Amostras dos últimos `janela` segundos (ou o buffer inteiro)."""
+        amostras = list(self._historico)
+        if janela is None:
+            return amostras
+        limite = time.time() - janela
+        return [a for a in amostras if a.instante >= limite]
+
+    def parar(self):
+        self._parar.set()
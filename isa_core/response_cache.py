@@ -0,0 +1,203 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Palavras que não mudam o sentido da pergunta ("o horário da biblioteca, por favor")
+STOP_WORDS = frozenset("""
+a o as os um uma uns umas de da do das dos d em na no nas nos num numa
+por pela pelo pelas pelos para pra pro com e ou
+me te se lhe voce voces isa por favor favor poderia pode podes sabe
+sabia gostaria queria quero diga dizer fala falar informe informar
+ai entao la aqui ola oi obrigado obrigada
+""".split())
+
+# Na chave do cache elas mudam a resposta ("cardápio do dia" x "da noite",
+# "quando" x "onde"), mas para buscar documentos e sites não dizem nada
+PALAVRAS_PERGUNTA = frozenset("""
+que qual quais quando eu bom dia boa tarde noite
+""".split())
+STOP_WORDS_BUSCA = STOP_WORDS | PALAVRAS_PERGUNTA
+
+# Perguntas que só fazem sentido com a conversa anterior: nunca usam o cache
+MARCADORES_CONTEXTO = frozenset("""
+isso isto esse essa esses essas aquele aquela aquilo ele ela eles elas
+dele dela deles delas disso nisso daquilo anterior antes continue continua
+continuar mais outro outra outros outras tambem resuma explique melhor
+""".split())
+
+# Respostas que mudam com o dia/hora ou com quem pergunta: nunca vão para o
+# cache, que é o mesmo para todas as sessões e totens
+MARCADORES_TEMPO = frozenset("""
+hoje amanha ontem agora dia horas semana
+""".split())
+MARCADORES_PESSOAIS = frozenset("""
+eu meu minha meus minhas mim comigo
+""".split())
+
+_NAO_ALFANUM = re.compile(r"[^a-z0-9]+")
+
+
+def _dobrar(texto):
+    # Remove acentos, caixa e pontuação: "Q-Acadêmico?" -> "q academico"
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NAO_ALFANUM.sub(" ", texto).split()
+
+
+def normalizar(texto):
+    """Chave semântica da pergunta: sem acento, caixa, pontuação e stop words."""
+    palavras = _dobrar(texto)
+    chave = [p for p in palavras if p not in STOP_WORDS]
+    return " ".join(chave or palavras)
+
+
+def depende_de_contexto(texto):
+    """True para continuações ("e ela abre sábado?") que não devem ir para o cache."""
+    return any(p in MARCADORES_CONTEXTO for p in _dobrar(texto))
+
+
+def resposta_compartilhavel(texto):
+    """
+    False se a resposta depende da conversa, do momento ("que dia é hoje?")
+    ou de quem pergunta ("qual é o meu nome?"): essas não usam o cache.
+    """
+    palavras = _dobrar(texto)
+    return not any(p in MARCADORES_CONTEXTO or p in MARCADORES_TEMPO or p in MARCADORES_PESSOAIS
+                   for p in palavras)
+
+
+class ResponseCache:
+    """
+    Cache LRU de respostas da IA com TTL, persistido em JSON.
+
+    As entradas guardam o horário de criação (time.time) para o TTL continuar
+    valendo depois de reiniciar o app.
+
+    Gravar o JSON inteiro a cada resposta nova custaria uma escrita em disco
+    por pergunta: `guardar` só agenda a gravação, que sai numa thread à parte
+    `atraso_gravacao` segundos depois e leva todas as mudanças do intervalo.
+    O pendente é gravado também ao sair do programa (`descarregar`).
+    """
+
+    def __init__(self, caminho=None, ttl=24 * 3600, max_itens=500, atraso_gravacao=2.0):
+        self.caminho = caminho
+        self.ttl = ttl
+        self.max_itens = max_itens
+        self.atraso_gravacao = atraso_gravacao
+        self.hits = 0
+        self.misses = 0
+        self._itens = OrderedDict()  # chave -> [resposta, criado_em]
+        self._lock = threading.Lock()
+        self._lock_arquivo = threading.Lock()
+        self._timer = None
+        if caminho:
+            self.carregar()
+            atexit.register(self.descarregar)
+
+    def __len__(self):
+        return len(self._itens)
+
+    def chave(self, texto):
+        """Chave de `texto` no cache (subclasses podem trocar a normalização)."""
+        return normalizar(texto)
+
+    def obter(self, texto):
+        """Resposta guardada para `texto`, ou None."""
+        chave = self.chave(texto)
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and time.time() - item[1] > self.ttl:
+                del self._itens[chave]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return item[0]
+
+    def guardar(self, texto, resposta):
+        chave = self.chave(texto)
+        if not chave or not resposta:
+            return
+        with self._lock:
+            self._itens[chave] = [resposta, time.time()]
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+        self._agendar()
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+        self._agendar()
+
+    def estatisticas(self):
+        total = self.hits + self.misses
+        return {
+            "itens": len(self._itens),
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_acerto": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    # --- Persistência ---
+    def carregar(self):
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return
+        agora = time.time()
+        with self._lock:
+            for chave, (resposta, criado_em) in dados.items():
+                if agora - criado_em <= self.ttl:
+                    self._itens[chave] = [resposta, criado_em]
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def _agendar(self):
+        if not self.caminho:
+            return
+        if not self.atraso_gravacao:
+            self.salvar()
+            return
+        with self._lock:
+            if self._timer is not None:
+                return  # Já tem uma gravação marcada: ela leva esta mudança junto
+            self._timer = threading.Timer(self.atraso_gravacao, self._gravar_agendado)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _gravar_agendado(self):
+        with self._lock:
+            self._timer = None
+        self.salvar()
+
+    def descarregar(self):
+        """Grava agora a mudança que estava agendada (se houver)."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            self.salvar()
+
+    def salvar(self):
+        if not self.caminho:
+            return
+        with self._lock:
+            dados = dict(self._itens)
+        # Grava num arquivo temporário e troca, para nunca deixar um JSON pela metade
+        temporario = f"{self.caminho}.tmp"
+        with self._lock_arquivo:
+            try:
+                with open(temporario, "w", encoding="utf-8") as f:
+                    json.dump(dados, f, ensure_ascii=False)
+                os.replace(temporario, self.caminho)
+            except OSError as e:
+                print(f"Erro ao salvar cache de respostas: {e}")
@@ -0,0 +1,137 @@
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future
+
+from .estatisticas import percentil
+from .task_lanes import ExecutorRaias
+
+EXTENSOES = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png"}
+
+# pronta: Future que termina quando os arquivos estão no disco
+Captura = namedtuple("Captura", "id arquivo miniatura pronta")
+
+
+class HistoricoCapturas:
+    """
+    Capturas de tela tiradas na hora e codificadas em segundo plano.
+
+    `tirar()` só pega o quadro (`capturar()` devolve uma imagem do Pillow, ex.:
+    pyautogui.screenshot sem caminho) e já devolve a Captura com o id; a
+    codificação em `formato` (JPEG/WebP, bem mais leve que o PNG de tela
+    cheia) e a miniatura rodam num pool limitado (raia "codificar" do
+    ExecutorRaias), que lança RaiaCheia se as capturas chegarem mais rápido
+    do que dá para salvar. A pasta guarda as últimas `max_itens` capturas;
+    as mais antigas são apagadas.
+    """
+
+    def __init__(self, pasta, capturar, max_itens=20, formato="JPEG", qualidade=80,
+                 miniatura=(320, 180), workers=2, max_fila=4):
+        self.pasta = pasta
+        self.capturar = capturar
+        self.max_itens = max_itens
+        self.formato = formato.upper()
+        self.extensao = EXTENSOES[self.formato]
+        self.qualidade = qualidade
+        self.tamanho_miniatura = tuple(miniatura)
+        self._executor = ExecutorRaias({"codificar": (workers, max_fila)})
+        self._itens = OrderedDict()  # id -> Captura, da mais antiga para a mais recente
+        self._tempos_captura = deque(maxlen=200)
+        self._contador = itertools.count()
+        self._lock = threading.Lock()
+        os.makedirs(pasta, exist_ok=True)
+        self._indexar()
+
+    def _caminhos(self, id_captura):
+        return (os.path.join(self.pasta, f"{id_captura}{self.extensao}"),
+                os.path.join(self.pasta, f"{id_captura}_mini{self.extensao}"))
+
+    def _indexar(self):
+        # Capturas de execuções anteriores (o id começa com data e hora)
+        for nome in sorted(os.listdir(self.pasta)):
+            id_captura, extensao = os.path.splitext(nome)
+            if extensao != self.extensao or id_captura.endswith("_mini"):
+                continue
+            pronta = Future()
+            pronta.set_result(None)
+            self._itens[id_captura] = Captura(id_captura, *self._caminhos(id_captura), pronta)
+        self._aplicar_limite()
+
+    def tirar(self):
+        """Pega o quadro e agenda a codificação. Lança RaiaCheia com o pool ocupado."""
+        inicio = time.perf_counter()
+        imagem = self.capturar()
+        # Data e hora + contador mantêm a ordem; o sufixo aleatório evita repetir
+        # um id de outra execução (o arquivo é servido como imutável)
+        id_captura = f"{time.strftime('%Y%m%d-%H%M%S')}-{next(self._contador):04d}-{uuid.uuid4().hex[:8]}"
+        arquivo, miniatura = self._caminhos(id_captura)
+        with self._lock:
+            # Entra no histórico antes que a codificação possa terminar
+            pronta = self._executor.enviar("codificar", self._codificar, id_captura, imagem)
+            captura = Captura(id_captura, arquivo, miniatura, pronta)
+            self._itens[id_captura] = captura
+            self._tempos_captura.append(time.perf_counter() - inicio)
+            self._aplicar_limite()
+        return captura
+
+    def _salvar(self, imagem, caminho):
+        temporario = f"{caminho}.tmp"
+        imagem.save(temporario, format=self.formato, quality=self.qualidade)
+        os.replace(temporario, caminho)  # Quem pede o arquivo nunca vê ele pela metade
+
+    def _codificar(self, id_captura, imagem):
+        arquivo, miniatura = self._caminhos(id_captura)
+        if self.formato == "JPEG" and imagem.mode != "RGB":
+            imagem = imagem.convert("RGB")
+        self._salvar(imagem, arquivo)
+        pequena = imagem.copy()
+        pequena.thumbnail(self.tamanho_miniatura)
+        self._salvar(pequena, miniatura)
+        with self._lock:
+            if id_captura not in self._itens:
+                self._apagar(id_captura)  # Saiu do histórico enquanto era codificada
+
+    def _aplicar_limite(self):
+        while len(self._itens) > self.max_itens:
+            id_captura, captura = self._itens.popitem(last=False)
+            if captura.pronta.done():
+                self._apagar(id_captura)
+
+    def _apagar(self, id_captura):
+        for caminho in self._caminhos(id_captura):
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    def obter(self, id_captura):
+        """Captura do histórico (talvez ainda codificando) ou None."""
+        with self._lock:
+            return self._itens.get(id_captura)
+
+    def listar(self):
+        """Ids do histórico, da mais recente para a mais antiga."""
+        with self._lock:
+            return list(reversed(self._itens))
+
+    def estatisticas(self):
+        with self._lock:
+            tempos = list(self._tempos_captura)
+            itens = len(self._itens)
+        return {
+            "itens": itens,
+            "max_itens": self.max_itens,
+            "formato": self.formato,
+            "captura_ms": {
+                "p50": round(percentil(tempos, 0.50) * 1000, 1),
+                "p95": round(percentil(tempos, 0.95) * 1000, 1),
+                "max": round(max(tempos, default=0) * 1000, 1),
+            },
+            "codificacao": self._executor.estatisticas()["codificar"],
+        }
+
+    def encerrar(self):
+        self._executor.encerrar()
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+
+from isa_core.intent_router import dobrar
+from isa_core.response_cache import STOP_WORDS_BUSCA
+
+
+def _palavras(texto):
+    return dobrar(texto).split()
+
+
+class RegistroSites:
+    """
+    Atalhos de sites ("abra o SUAP") lidos da seção `secao` de um JSON:
+
+        "sites": {
+            "suap": {"url": "https://suap.ifce.edu.br/", "apelidos": ["suap", "admin"]},
+            "youtube": "https://youtube.com"
+        }
+
+    Sem "apelidos", o próprio nome é o apelido. A busca usa só dicionários:
+      1. o termo inteiro é um apelido ("q academico");
+      2. algum trecho do termo é um apelido ("o site do q academico agora");
+      3. índice de palavras: sites cujos apelidos têm todas as palavras do
+         termo ("biblioteca" -> "biblioteca virtual").
+    Se o passo 3 achar mais de um site, vence o mais usado (`registrar_uso`),
+    se `ranking` estiver ligado; no empate (ou sem ranking), o primeiro do
+    arquivo.
+
+    O arquivo é relido quando muda (checado no máximo a cada
+    `intervalo_checagem` segundos, durante as buscas).
+    """
+
+    def __init__(self, caminho, secao="sites", ranking=True, intervalo_checagem=1.0):
+        self.caminho = caminho
+        self.secao = secao
+        self.ranking = ranking
+        self.intervalo_checagem = intervalo_checagem
+        self.usos = {}  # nome do site -> vezes aberto
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._ultima_checagem = 0.0
+        self._carregar_tabelas({})
+        self.recarregar()
+
+    def __len__(self):
+        return len(self.urls)
+
+    def _carregar_tabelas(self, sites):
+        urls, apelidos, indice, ordem = {}, {}, {}, {}
+        maior = 1
+        for nome, dados in sites.items():
+            if isinstance(dados, str):
+                dados = {"url": dados}
+            if not dados.get("url"):
+                continue
+            urls[nome] = dados["url"]
+            ordem[nome] = len(ordem)  # Posição no arquivo: desempate estável
+            for apelido in dados.get("apelidos") or [nome]:
+                palavras = _palavras(apelido)
+                if not palavras:
+                    continue
+                apelidos.setdefault(" ".join(palavras), nome)
+                maior = max(maior, len(palavras))
+                for palavra in palavras:
+                    if palavra not in STOP_WORDS_BUSCA:
+                        indice.setdefault(palavra, set()).add(nome)
+        # Troca tudo de uma vez: buscas em andamento veem as tabelas antigas ou as novas
+        self.urls, self._apelidos, self._indice, self._maior_apelido, self._ordem = urls, apelidos, indice, maior, ordem
+
+    def recarregar(self):
+        """Relê o arquivo; mantém as tabelas atuais se ele estiver inválido."""
+        try:
+            mtime = os.path.getmtime(self.caminho)
+            with open(self.caminho, encoding="utf-8") as f:
+                sites = json.load(f).get(self.secao, {})
+        except (OSError, ValueError, AttributeError) as e:
+            if self._mtime is not None:
+                print(f"Erro ao recarregar os sites de {self.caminho}: {e}")
+            return False
+        self._mtime = mtime
+        self._carregar_tabelas(sites)
+        return True
+
+    def _checar_arquivo(self):
+        agora = time.monotonic()
+        if agora - self._ultima_checagem < self.intervalo_checagem:
+            return
+        with self._lock:
+            if agora - self._ultima_checagem < self.intervalo_checagem:
+                return
+            self._ultima_checagem = agora
+            try:
+                mudou = os.path.getmtime(self.caminho) != self._mtime
+            except OSError:
+                mudou = False
+            if mudou:
+                self.recarregar()
+
+    def buscar(self, termo):
+        """Nome do site para `termo`, ou None."""
+        self._checar_arquivo()
+        palavras = _palavras(termo)
+        if not palavras:
+            return None
+        apelidos = self._apelidos
+
+        # Trechos do termo, do maior para o menor (limitados ao maior apelido)
+        for tamanho in range(min(len(palavras), self._maior_apelido), 0, -1):
+            for inicio in range(len(palavras) - tamanho + 1):
+                nome = apelidos.get(" ".join(palavras[inicio:inicio + tamanho]))
+                if nome:
+                    return nome
+
+        # Todas as palavras do termo precisam aparecer nos apelidos do site:
+        # "biblioteca" acha "biblioteca virtual", mas "realidade virtual" não
+        termos = {p for p in palavras if p not in STOP_WORDS_BUSCA}
+        pontos = {}
+        for palavra in termos:
+            for nome in self._indice.get(palavra, ()):
+                pontos[nome] = pontos.get(nome, 0) + 1
+        candidatos = [nome for nome, n in pontos.items() if n == len(termos)]
+        if not candidatos:
+            return None
+        usos = self.usos if self.ranking else {}
+        ordem = self._ordem
+        return max(candidatos, key=lambda nome: (usos.get(nome, 0), -ordem.get(nome, 0)))
+
+    def url(self, termo):
+        nome = self.buscar(termo)
+        return self.urls.get(nome) if nome else None
+
+    def registrar_uso(self, nome):
+        with self._lock:
+            self.usos[nome] = self.usos.get(nome, 0) + 1
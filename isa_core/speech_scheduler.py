@@ -0,0 +1,214 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+from .estatisticas import percentil
+from .tts_cache import player_disponivel, tocar_wav
+
+# Prioridades (menor número fala primeiro)
+PRIORIDADE_ALERTA = 0   # Avisos do sistema (erros, conexão)
+PRIORIDADE_COMANDO = 1  # Confirmações de comandos ("Áudio ajustado.")
+PRIORIDADE_CHAT = 2     # Respostas da IA
+
+
+class Fala:
+    __slots__ = ("texto", "prioridade", "grupo", "criada_em", "ordem")
+
+    def __init__(self, texto, prioridade, grupo, ordem):
+        self.texto = texto
+        self.prioridade = prioridade
+        self.grupo = grupo
+        self.criada_em = time.monotonic()
+        self.ordem = ordem
+
+
+class SpeechScheduler(threading.Thread):
+    """
+    Fila de fala com prioridade, rodando numa thread dona do motor TTS.
+
+    - Prioridade: alertas passam na frente de comandos, que passam na frente do chat.
+    - Coalescência: o mesmo texto já na fila não entra de novo; uma fala com
+      `grupo` substitui a que estava na fila com o mesmo grupo.
+    - Barge-in: `interromper()` esvazia a fila (menos alertas) e corta a fala atual.
+    - Fila limitada a `max_fila`: descarta a fala mais antiga de menor prioridade.
+
+    - Com `cache_audio` (TTSAudioCache), frases já sintetizadas são tocadas
+      direto do arquivo; as que valem a pena são renderizadas quando a fila
+      está vazia, sem atrasar ninguém. Sem player de áudio na máquina (ou se
+      ele falhar), o cache é desligado e tudo volta a sair pelo motor TTS.
+
+    `criar_engine()` é chamado dentro da thread (o pyttsx3 exige isso) e deve
+    devolver algo com a API do pyttsx3: say, runAndWait, stop e connect.
+    `tocar(arquivo)` começa a tocar um áudio do cache e devolve algo com
+    `esperar()` e `parar()` (ver tts_cache.Reproducao).
+    """
+
+    def __init__(self, max_fila=8, amostras_latencia=200, cache_audio=None, tocar=tocar_wav):
+        super().__init__(name="isa-voz")
+        self.daemon = True  # Mata a thread quando o programa fecha
+        self.max_fila = max_fila
+        if cache_audio is not None and tocar is tocar_wav and not player_disponivel():
+            print("Nenhum player de áudio (aplay, paplay ou afplay): cache de voz desligado.")
+            cache_audio = None
+        self.cache_audio = cache_audio
+        self.tocar = tocar
+        self._renderizar = deque()  # Textos para sintetizar em arquivo quando sobrar tempo
+        self._voz = None
+        self._velocidade = None
+        self._fila = []
+        self._cond = threading.Condition()
+        self._ordem = itertools.count()
+        self._atual = None
+        self._cortar_atual = False
+        self._reproducao = None  # Áudio do cache tocando agora (cortado por interromper)
+        self._engine = None
+        self._latencias = deque(maxlen=amostras_latencia)
+        self.contadores = {"enfileiradas": 0, "faladas": 0, "descartadas": 0, "coalescidas": 0, "interrompidas": 0}
+
+    def criar_engine(self):
+        raise NotImplementedError
+
+    # --- API usada pelas rotas ---
+    def falar(self, texto, prioridade=PRIORIDADE_CHAT, grupo=None):
+        """Enfileira `texto`. Retorna False se foi descartado ou era repetido."""
+        texto = texto.strip()
+        if not texto:
+            return False
+        with self._cond:
+            for i, fala in enumerate(self._fila):
+                if fala.texto == texto:
+                    self.contadores["coalescidas"] += 1
+                    return False
+                if grupo is not None and fala.grupo == grupo:
+                    del self._fila[i]  # Versão nova substitui a antiga
+                    self.contadores["coalescidas"] += 1
+                    break
+
+            if len(self._fila) >= self.max_fila and not self._abrir_espaco(prioridade):
+                self.contadores["descartadas"] += 1
+                return False
+
+            self._fila.append(Fala(texto, prioridade, grupo, next(self._ordem)))
+            self.contadores["enfileiradas"] += 1
+            self._cond.notify()
+            return True
+
+    def interromper(self, manter_ate=PRIORIDADE_ALERTA):
+        """Barge-in: descarta a fila com prioridade abaixo de `manter_ate` e corta a fala atual."""
+        with self._cond:
+            antes = len(self._fila)
+            self._fila = [f for f in self._fila if f.prioridade <= manter_ate]
+            self.contadores["interrompidas"] += antes - len(self._fila)
+            atual = self._atual
+            if atual is not None and atual.prioridade > manter_ate:
+                # O runAndWait não aceita stop() de outra thread: o corte
+                # acontece no callback da próxima palavra, na thread de voz
+                self._cortar_atual = True
+                self.contadores["interrompidas"] += 1
+                if self._reproducao is not None:
+                    self._reproducao.parar()  # Áudio do cache: o player é encerrado na hora
+
+    def estatisticas(self):
+        with self._cond:
+            latencias = list(self._latencias)
+            dados = dict(self.contadores)
+            dados["profundidade"] = len(self._fila)
+            dados["falando"] = self._atual.texto if self._atual else None
+        dados["latencia_fila_ms"] = {
+            "p50": round(percentil(latencias, 0.50) * 1000, 1),
+            "p95": round(percentil(latencias, 0.95) * 1000, 1),
+            "max": round(max(latencias, default=0) * 1000, 1),
+        }
+        return dados
+
+    # --- Thread de fala ---
+    def _abrir_espaco(self, prioridade):
+        # Remove a fala mais antiga da pior prioridade, se não for melhor que a nova
+        pior = max(self._fila, key=lambda f: (f.prioridade, -f.ordem))
+        if pior.prioridade < prioridade:
+            return False
+        self._fila.remove(pior)
+        self.contadores["descartadas"] += 1
+        return True
+
+    def _proxima(self):
+        """Próxima Fala, ou um texto (str) para renderizar se a fila estiver vazia."""
+        with self._cond:
+            while not self._fila:
+                if self._renderizar:
+                    return self._renderizar.popleft()
+                self._cond.wait()
+            fala = min(self._fila, key=lambda f: (f.prioridade, f.ordem))
+            self._fila.remove(fala)
+            self._atual = fala
+            self._cortar_atual = False
+            self._latencias.append(time.monotonic() - fala.criada_em)
+            return fala
+
+    def _ao_comecar_palavra(self, name, location, length):
+        if self._cortar_atual:
+            self._engine.stop()
+
+    def _dizer(self, texto):
+        if self.cache_audio is not None:
+            arquivo = self.cache_audio.obter(texto, self._voz, self._velocidade)
+            if arquivo:
+                try:
+                    reproducao = self.tocar(arquivo)
+                except Exception as e:
+                    # Frase fixa já renderizada não pode ficar muda: desliga o cache e fala pelo motor
+                    print(f"Erro ao tocar o áudio em cache ({e}); cache de voz desligado.")
+                    with self._cond:
+                        self.cache_audio = None
+                        self._renderizar.clear()
+                else:
+                    with self._cond:
+                        self._reproducao = reproducao
+                        cortar = self._cortar_atual  # Interrompida antes de o player começar
+                    if cortar:
+                        reproducao.parar()
+                    try:
+                        reproducao.esperar()
+                    finally:
+                        with self._cond:
+                            self._reproducao = None
+                    return
+            elif self.cache_audio.deve_renderizar(texto):
+                with self._cond:
+                    if texto not in self._renderizar:
+                        self._renderizar.append(texto)
+        self._engine.say(texto)
+        self._engine.runAndWait()
+
+    def run(self):
+        try:
+            self._engine = self.criar_engine()
+            self._engine.connect('started-word', self._ao_comecar_palavra)
+            self._voz = self._engine.getProperty('voice')
+            self._velocidade = self._engine.getProperty('rate')
+        except Exception as e:
+            print(f"Erro fatal no motor de voz: {e}")
+            return
+
+        if self.cache_audio is not None:
+            self._renderizar.extend(self.cache_audio.pendentes(self._voz, self._velocidade))
+
+        while True:
+            fala = self._proxima()
+            if isinstance(fala, str):
+                try:
+                    self.cache_audio.renderizar(self._engine, fala, self._voz, self._velocidade)
+                except Exception as e:
+                    print(f"Erro ao gerar áudio em cache: {e}")
+                continue
+
+            try:
+                self._dizer(fala.texto)
+            except Exception as e:
+                print(f"Erro ao falar: {e}")
+            with self._cond:
+                if not self._cortar_atual:
+                    self.contadores["faladas"] += 1
+                self._atual = None
+                self._cortar_atual = False
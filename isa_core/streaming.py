@@ -0,0 +1,39 @@
+import json
+import re
+
+# Fim de frase: pontuação seguida de espaço/quebra de linha
+_FIM_FRASE = re.compile(r"[.!?…]+[\"')\]]*\s+")
+
+
+def evento_sse(evento, dados):
+    """Formata um evento Server-Sent Events com o payload em JSON."""
+    return f"event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n"
+
+
+class DivisorFrases:
+    """
+    Junta os pedaços de texto que chegam do stream e devolve frases completas,
+    para o TTS começar a falar a primeira frase enquanto o resto ainda chega.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def alimentar(self, pedaco):
+        """Adiciona um pedaço e devolve a lista de frases que ficaram completas."""
+        self._buffer += pedaco
+        frases = []
+        inicio = 0
+        for m in _FIM_FRASE.finditer(self._buffer):
+            frase = self._buffer[inicio:m.end()].strip()
+            if frase:
+                frases.append(frase)
+            inicio = m.end()
+        self._buffer = self._buffer[inicio:]
+        return frases
+
+    def finalizar(self):
+        """Devolve o que sobrou no buffer (última frase sem pontuação final)."""
+        resto = self._buffer.strip()
+        self._buffer = ""
+        return [resto] if resto else []
@@ -0,0 +1,304 @@
+"""
+Motores de reconhecimento de fala (STT) plugáveis.
+
+Todos recebem um sr.AudioData e devolvem o texto. Quando não entendem nada,
+lançam sr.UnknownValueError, como o recognize_google, para as rotas
+continuarem tratando os erros do mesmo jeito.
+
+Configuração (dict, ex.: seção "stt" do config.json):
+    motores       -> ordem da cadeia de fallback, ex.: ["vosk", "google"]
+    timeouts      -> segundos por motor, ex.: {"vosk": 3, "google": 6}
+    idioma        -> "pt-BR"
+    vosk_modelo   -> pasta do modelo Vosk (ex.: vosk-model-small-pt-0.3)
+    whisper_modelo-> nome/pasta do modelo faster-whisper (ex.: "small")
+A variável de ambiente ISA_STT_MOTORES ("vosk,google") sobrepõe `motores`.
+
+Motores incrementais (hoje só o Vosk) também reconhecem enquanto a pessoa
+fala: `FallbackSTT.abrir_fluxo()` devolve um FluxoSTT com os parciais.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
+
+TAXA = 16000  # Vosk e Whisper esperam 16 kHz, 16 bits, mono
+
+
+def converter_audio(bloco, taxa, largura):
+    """Converte áudio bruto para o formato dos motores offline (16 kHz, 16 bits)."""
+    if taxa == TAXA and largura == 2:
+        return bloco
+    import speech_recognition as sr
+    return sr.AudioData(bloco, taxa, largura).get_raw_data(convert_rate=TAXA, convert_width=2)
+
+
+def _nao_entendi(motor):
+    import speech_recognition as sr
+    return sr.UnknownValueError(f"{motor}: nenhuma fala reconhecida")
+
+
+class STTEngine:
+    nome = "base"
+
+    def reconhecer(self, audio):
+        raise NotImplementedError
+
+    def iniciar_fluxo(self, gramatica=None):
+        """
+        Reconhecedor incremental (ver FluxoSTT) ou None se o motor só reconhece
+        a frase inteira. `gramatica` limita as palavras possíveis (ex.: palavra-chave).
+        """
+        return None
+
+    def aquecer(self):
+        """Roda uma vez com silêncio para carregar tudo antes do primeiro usuário."""
+        import speech_recognition as sr
+        try:
+            self.reconhecer(sr.AudioData(b"\x00\x00" * (TAXA // 2), TAXA, 2))
+        except Exception:
+            pass  # Silêncio normalmente dá "não entendi"
+
+
+class GoogleSTT(STTEngine):
+    """O reconhecimento online de sempre (recognize_google)."""
+
+    nome = "google"
+
+    def __init__(self, idioma="pt-BR", timeout=None):
+        import speech_recognition as sr
+        self.idioma = idioma
+        self._recognizer = sr.Recognizer()
+        # Sem isso a requisição HTTP não tem prazo e a thread fica presa na rede
+        self._recognizer.operation_timeout = timeout
+
+    def reconhecer(self, audio):
+        return self._recognizer.recognize_google(audio, language=self.idioma)
+
+    def aquecer(self):
+        pass  # Nada local para carregar
+
+
+class VoskSTT(STTEngine):
+    """Reconhecimento offline com Vosk; o modelo é carregado uma vez e fica na memória."""
+
+    nome = "vosk"
+
+    def __init__(self, caminho_modelo):
+        import vosk
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.modelo = vosk.Model(caminho_modelo)
+
+    def reconhecer(self, audio):
+        reconhecedor = self._vosk.KaldiRecognizer(self.modelo, TAXA)
+        reconhecedor.AcceptWaveform(audio.get_raw_data(convert_rate=TAXA, convert_width=2))
+        texto = json.loads(reconhecedor.FinalResult()).get("text", "").strip()
+        if not texto:
+            raise _nao_entendi(self.nome)
+        return texto
+
+    def iniciar_fluxo(self, gramatica=None):
+        if gramatica:
+            return _FluxoVosk(self._vosk.KaldiRecognizer(self.modelo, TAXA, json.dumps(gramatica)))
+        return _FluxoVosk(self._vosk.KaldiRecognizer(self.modelo, TAXA))
+
+
+class _FluxoVosk:
+    """Vosk recebendo o áudio aos poucos (16 kHz, 16 bits) e devolvendo o parcial."""
+
+    def __init__(self, reconhecedor):
+        self._reconhecedor = reconhecedor
+        self._trechos = []  # Trechos já fechados pelo Vosk (pausas curtas no meio da frase)
+
+    def aceitar(self, bloco):
+        if self._reconhecedor.AcceptWaveform(bloco):
+            trecho = json.loads(self._reconhecedor.Result()).get("text", "").strip()
+            if trecho:
+                self._trechos.append(trecho)
+            return " ".join(self._trechos)
+        parcial = json.loads(self._reconhecedor.PartialResult()).get("partial", "").strip()
+        return " ".join(self._trechos + ([parcial] if parcial else []))
+
+    def finalizar(self):
+        ultimo = json.loads(self._reconhecedor.FinalResult()).get("text", "").strip()
+        return " ".join(self._trechos + ([ultimo] if ultimo else []))
+
+
+class WhisperSTT(STTEngine):
+    """Reconhecimento offline com faster-whisper (mais preciso, mais pesado que o Vosk)."""
+
+    nome = "whisper"
+
+    def __init__(self, modelo="small", idioma="pt-BR"):
+        from faster_whisper import WhisperModel
+        import numpy
+        self._numpy = numpy
+        self.idioma = idioma.split("-")[0]
+        self.modelo = WhisperModel(modelo, device="cpu", compute_type="int8")
+
+    def reconhecer(self, audio):
+        bruto = audio.get_raw_data(convert_rate=TAXA, convert_width=2)
+        amostras = self._numpy.frombuffer(bruto, self._numpy.int16).astype(self._numpy.float32) / 32768.0
+        segmentos, _ = self.modelo.transcribe(amostras, language=self.idioma, beam_size=1)
+        texto = " ".join(s.text.strip() for s in segmentos).strip()
+        if not texto:
+            raise _nao_entendi(self.nome)
+        return texto
+
+
+class FallbackSTT(STTEngine):
+    """
+    Cadeia de motores: tenta cada um com seu timeout e passa ao próximo se
+    falhar, demorar demais ou não entender. Lança o erro do último motor.
+    Um motor que estourou o tempo fica de fora até a chamada presa terminar.
+
+    `ao_reconhecer(motor, segundos, sucesso)`, se definido, é chamado a cada
+    tentativa (ex.: para as métricas de duração do STT).
+    """
+
+    nome = "fallback"
+
+    def __init__(self, motores, timeouts=None, timeout_padrao=8.0):
+        self.motores = list(motores)
+        self.timeouts = timeouts or {}
+        self.timeout_padrao = timeout_padrao
+        self.ultimo_motor = None
+        self.ao_reconhecer = None
+        self._executores = {}
+        self._em_andamento = {}
+        self._trava = threading.Lock()
+
+    def _tentar(self, motor, audio, timeout):
+        # Um executor de um worker por motor: um motor travado segura no máximo
+        # uma thread, e enquanto ela não termina o motor fica de fora da cadeia
+        with self._trava:
+            anterior = self._em_andamento.get(motor.nome)
+            if anterior is not None and not anterior.done():
+                raise RuntimeError(f"{motor.nome}: chamada anterior ainda em andamento")
+            if motor.nome not in self._executores:
+                self._executores[motor.nome] = ThreadPoolExecutor(1, thread_name_prefix=f"isa-stt-{motor.nome}")
+            futuro = self._executores[motor.nome].submit(motor.reconhecer, audio)
+            self._em_andamento[motor.nome] = futuro
+        try:
+            return futuro.result(timeout)
+        except FuturoTimeout:
+            # O worker termina sozinho depois; seguimos com o próximo motor
+            raise TimeoutError(f"{motor.nome}: passou do tempo limite") from None
+
+    def reconhecer(self, audio):
+        erro = RuntimeError("Nenhum motor de STT configurado")
+        for motor in self.motores:
+            inicio = time.perf_counter()
+            try:
+                texto = self._tentar(motor, audio, self.timeouts.get(motor.nome, self.timeout_padrao))
+                self.ultimo_motor = motor.nome
+                self.registrar(motor.nome, time.perf_counter() - inicio, True)
+                return texto
+            except Exception as e:
+                erro = e
+            self.registrar(motor.nome, time.perf_counter() - inicio, False)
+            print(f"STT {motor.nome} falhou ({erro}), tentando o próximo...")
+        raise erro
+
+    def registrar(self, motor, segundos, sucesso):
+        if self.ao_reconhecer is not None:
+            self.ao_reconhecer(motor, segundos, sucesso)
+
+    def aquecer(self):
+        for motor in self.motores:
+            motor.aquecer()
+
+    def iniciar_fluxo(self, gramatica=None):
+        """Reconhecedor incremental do primeiro motor da cadeia que tiver um."""
+        for motor in self.motores:
+            incremental = motor.iniciar_fluxo(gramatica)
+            if incremental is not None:
+                return incremental
+        return None
+
+    def abrir_fluxo(self, taxa=TAXA, largura=2):
+        """FluxoSTT com parciais do primeiro motor incremental e a cadeia inteira no fim."""
+        for motor in self.motores:
+            incremental = motor.iniciar_fluxo()
+            if incremental is not None:
+                return FluxoSTT(self, incremental, taxa, largura, motor.nome)
+        return FluxoSTT(self, None, taxa, largura)
+
+
+class FluxoSTT:
+    """
+    Reconhecimento de uma frase enquanto ela é falada.
+
+    `aceitar(bloco)` recebe o áudio bruto aos poucos e devolve o texto parcial
+    até ali (vazio se nenhum motor da cadeia for incremental). `finalizar()`
+    devolve o texto final; se o motor incremental não entendeu, a frase
+    inteira passa pela cadeia de fallback como no reconhecimento normal.
+    """
+
+    def __init__(self, cadeia, incremental=None, taxa=TAXA, largura=2, motor=None):
+        self.cadeia = cadeia
+        self.incremental = incremental
+        self.motor = motor
+        self.taxa = taxa
+        self.largura = largura
+        self._blocos = []
+
+    def aceitar(self, bloco):
+        self._blocos.append(bloco)
+        if self.incremental is None:
+            return ""
+        return self.incremental.aceitar(converter_audio(bloco, self.taxa, self.largura))
+
+    def finalizar(self):
+        if self.incremental is not None:
+            inicio = time.perf_counter()
+            try:
+                texto = self.incremental.finalizar()
+                # Só o fechamento da frase: o resto foi reconhecido enquanto a pessoa falava
+                self.cadeia.registrar(self.motor, time.perf_counter() - inicio, bool(texto))
+                if texto:
+                    return texto
+            except Exception as e:
+                self.cadeia.registrar(self.motor, time.perf_counter() - inicio, False)
+                print(f"STT incremental falhou ({e}), reconhecendo a frase inteira...")
+        import speech_recognition as sr
+        return self.cadeia.reconhecer(sr.AudioData(b"".join(self._blocos), self.taxa, self.largura))
+
+
+def criar_motor(nome, config):
+    idioma = config.get("idioma", "pt-BR")
+    if nome == "google":
+        return GoogleSTT(idioma, (config.get("timeouts") or {}).get("google", 8.0))
+    if nome == "vosk":
+        return VoskSTT(config.get("vosk_modelo", "modelos/vosk-model-small-pt-0.3"))
+    if nome == "whisper":
+        return WhisperSTT(config.get("whisper_modelo", "small"), idioma)
+    raise ValueError(f"Motor de STT desconhecido: {nome}")
+
+
+def criar_stt(config=None, pasta_base=None):
+    """
+    Monta a cadeia de STT a partir da configuração. Motores que não carregam
+    (biblioteca ou modelo ausente) são pulados com um aviso; se nenhum
+    carregar, usa o Google.
+    """
+    config = dict(config or {})
+    motores = config.get("motores", ["google"])
+    if os.getenv("ISA_STT_MOTORES"):
+        motores = [m.strip() for m in os.getenv("ISA_STT_MOTORES").split(",") if m.strip()]
+    if pasta_base and config.get("vosk_modelo") and not os.path.isabs(config["vosk_modelo"]):
+        config["vosk_modelo"] = os.path.join(pasta_base, config["vosk_modelo"])
+
+    carregados = []
+    for nome in motores:
+        try:
+            carregados.append(criar_motor(nome, config))
+        except Exception as e:
+            print(f"⚠️ AVISO: motor de STT '{nome}' indisponível: {e}")
+    if not carregados:
+        carregados.append(GoogleSTT(config.get("idioma", "pt-BR"), (config.get("timeouts") or {}).get("google", 8.0)))
+
+    stt = FallbackSTT(carregados, config.get("timeouts"))
+    stt.aquecer()
+    return stt
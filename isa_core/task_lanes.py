@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .estatisticas import percentil
+
+
+class RaiaCheia(Exception):
+    """A raia já tem tarefas demais esperando (back-pressure)."""
+
+
+class _Raia:
+    def __init__(self, nome, workers, max_fila, amostras):
+        self.nome = nome
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"isa-{nome}")
+        # Vagas = executando + esperando; sem vaga, a tarefa é recusada na hora
+        self.vagas = threading.BoundedSemaphore(workers + max_fila)
+        self.lock = threading.Lock()
+        self.esperas = deque(maxlen=amostras)
+        self.duracoes = deque(maxlen=amostras)
+        self.contadores = {"enviadas": 0, "concluidas": 0, "erros": 0, "recusadas": 0}
+        self.ocupadas = 0
+
+
+class ExecutorRaias:
+    """
+    Pool de threads limitado, dividido em raias independentes:
+
+        executor = ExecutorRaias({"fala": (1, 16), "navegador": (1, 4), "ia": (2, 8)})
+        executor.enviar("fala", falar, "Olá")
+
+    Cada raia tem (workers, max_fila): no máximo `workers` tarefas rodando e
+    `max_fila` esperando. Com a raia cheia, `enviar` lança RaiaCheia (ou
+    espera até `timeout` segundos por uma vaga), então uma rajada de comandos
+    não cria threads sem limite. Uma raia com 1 worker também serializa quem
+    não aceita chamadas concorrentes (o motor do pyttsx3, o driver do
+    Selenium). `estatisticas()` mostra a espera na fila e a duração das
+    tarefas de cada raia.
+    """
+
+    def __init__(self, raias, amostras=200):
+        self._raias = {nome: _Raia(nome, w, f, amostras) for nome, (w, f) in raias.items()}
+
+    def enviar(self, raia, funcao, *args, bloquear=False, timeout=None, **kwargs):
+        """Agenda `funcao(*args, **kwargs)` na raia e devolve o Future."""
+        r = self._raias[raia]
+        if not r.vagas.acquire(blocking=bloquear, timeout=timeout if bloquear else None):
+            with r.lock:
+                r.contadores["recusadas"] += 1
+            raise RaiaCheia(f"Raia '{raia}' cheia")
+
+        enviada_em = time.monotonic()
+
+        def executar():
+            inicio = time.monotonic()
+            with r.lock:
+                r.ocupadas += 1
+                r.esperas.append(inicio - enviada_em)
+            sucesso = False
+            try:
+                resultado = funcao(*args, **kwargs)
+                sucesso = True
+                return resultado
+            except Exception as e:
+                print(f"Erro na raia '{raia}' ({getattr(funcao, '__name__', funcao)}): {e}")
+                raise
+            finally:
+                with r.lock:
+                    r.ocupadas -= 1
+                    r.duracoes.append(time.monotonic() - inicio)
+                    r.contadores["concluidas" if sucesso else "erros"] += 1
+                r.vagas.release()
+
+        with r.lock:
+            r.contadores["enviadas"] += 1
+        try:
+            return r.pool.submit(executar)
+        except RuntimeError:  # Executor já encerrado
+            r.vagas.release()
+            raise
+
+    def estatisticas(self):
+        dados = {}
+        for nome, r in self._raias.items():
+            with r.lock:
+                esperas, duracoes = list(r.esperas), list(r.duracoes)
+                dados[nome] = dict(r.contadores, executando=r.ocupadas)
+            dados[nome]["espera_ms"] = {
+                "p50": round(percentil(esperas, 0.50) * 1000, 1),
+                "p95": round(percentil(esperas, 0.95) * 1000, 1),
+            }
+            dados[nome]["duracao_ms"] = {
+                "p50": round(percentil(duracoes, 0.50) * 1000, 1),
+                "p95": round(percentil(duracoes, 0.95) * 1000, 1),
+                "max": round(max(duracoes, default=0) * 1000, 1),
+            }
+        return dados
+
+    def encerrar(self, esperar=False):
+        for r in self._raias.values():
+            r.pool.shutdown(wait=esperar, cancel_futures=True)
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+from collections import OrderedDict
+
+PLAYERS = (["afplay"], ["aplay", "-q"], ["paplay"])  # Fora do Windows, o primeiro instalado
+
+
+def player_disponivel():
+    """True se dá para tocar os WAVs do cache nesta máquina."""
+    return sys.platform == "win32" or any(shutil.which(player[0]) for player in PLAYERS)
+
+
+class Reproducao:
+    """
+    Um WAV tocando em segundo plano (winsound assíncrono no Windows,
+    aplay/paplay/afplay fora dele): `esperar()` bloqueia até acabar e
+    `parar()`, chamado de qualquer thread, corta na hora (barge-in).
+    """
+
+    def __init__(self, caminho):
+        self._processo = None
+        self._parada = threading.Event()
+        if sys.platform == "win32":
+            import winsound
+            self._winsound = winsound
+            with wave.open(caminho, "rb") as arquivo:
+                duracao = arquivo.getnframes() / float(arquivo.getframerate() or 1)
+            self._fim = time.monotonic() + duracao
+            winsound.PlaySound(caminho, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            return
+        for player in PLAYERS:
+            if shutil.which(player[0]):
+                self._processo = subprocess.Popen(
+                    player + [caminho], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                return
+        raise RuntimeError("Nenhum player de áudio encontrado (aplay, paplay ou afplay)")
+
+    def esperar(self):
+        if self._processo is not None:
+            self._processo.wait()
+        else:
+            self._parada.wait(max(0.0, self._fim - time.monotonic()))
+
+    def parar(self):
+        self._parada.set()
+        if self._processo is not None:
+            if self._processo.poll() is None:
+                self._processo.terminate()
+        else:
+            self._winsound.PlaySound(None, 0)  # None para o som assíncrono atual
+
+
+def tocar_wav(caminho):
+    """Começa a tocar um WAV e devolve a Reproducao (para esperar ou cortar)."""
+    return Reproducao(caminho)
+
+
+class TTSAudioCache:
+    """
+    Áudios já sintetizados, guardados em disco e indexados por texto + voz + velocidade.
+
+    - Frases fixas (`fixar`) são renderizadas uma vez e nunca saem do cache.
+    - Texto dinâmico entra depois de `min_repeticoes` pedidos e é descartado
+      por LRU quando a pasta passa de `max_bytes`.
+    """
+
+    def __init__(self, pasta, max_bytes=50 * 1024 * 1024, min_repeticoes=2, max_caracteres=160):
+        self.pasta = pasta
+        self.max_bytes = max_bytes
+        self.min_repeticoes = min_repeticoes
+        self.max_caracteres = max_caracteres
+        self.fixas = set()
+        self.hits = 0
+        self.misses = 0
+        self._arquivos = OrderedDict()  # chave -> tamanho em bytes (ordem de uso)
+        self._pedidos = OrderedDict()   # texto dinâmico -> vezes pedido
+        self._bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(pasta, exist_ok=True)
+        self._indexar()
+
+    @staticmethod
+    def chave(texto, voz, velocidade):
+        return hashlib.sha1(f"{voz}|{velocidade}|{texto}".encode("utf-8")).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, f"{chave}.wav")
+
+    def _indexar(self):
+        # Arquivos de execuções anteriores, do mais antigo para o mais recente
+        arquivos = []
+        for nome in os.listdir(self.pasta):
+            if nome.endswith(".tmp"):
+                # Renderização interrompida numa execução anterior
+                try:
+                    os.remove(os.path.join(self.pasta, nome))
+                except OSError:
+                    pass
+            elif nome.endswith(".wav"):
+                caminho = os.path.join(self.pasta, nome)
+                arquivos.append((os.path.getmtime(caminho), nome[:-4], os.path.getsize(caminho)))
+        for _, chave, tamanho in sorted(arquivos):
+            self._arquivos[chave] = tamanho
+            self._bytes += tamanho
+
+    def fixar(self, textos):
+        """Marca frases fixas (respostas prontas): sempre renderizadas e nunca descartadas."""
+        self.fixas.update(t.strip() for t in textos if t.strip())
+
+    def obter(self, texto, voz, velocidade):
+        """Caminho do áudio pronto, ou None."""
+        chave = self.chave(texto, voz, velocidade)
+        with self._lock:
+            if chave in self._arquivos:
+                self._arquivos.move_to_end(chave)
+                self.hits += 1
+                return self._caminho(chave)
+            self.misses += 1
+            return None
+
+    def deve_renderizar(self, texto):
+        """Decide se vale sintetizar `texto` em arquivo para as próximas vezes."""
+        if texto in self.fixas:
+            return True
+        if len(texto) > self.max_caracteres:
+            return False
+        with self._lock:
+            vezes = self._pedidos.pop(texto, 0) + 1
+            self._pedidos[texto] = vezes
+            while len(self._pedidos) > 1000:
+                self._pedidos.popitem(last=False)
+        return vezes >= self.min_repeticoes
+
+    def pendentes(self, voz, velocidade):
+        """Frases fixas que ainda não têm áudio para esta voz."""
+        with self._lock:
+            return [t for t in sorted(self.fixas) if self.chave(t, voz, velocidade) not in self._arquivos]
+
+    def renderizar(self, engine, texto, voz, velocidade):
+        """Sintetiza `texto` com o motor (na thread dona dele) e guarda no cache."""
+        chave = self.chave(texto, voz, velocidade)
+        destino = self._caminho(chave)
+        temporario = os.path.join(self.pasta, f"{chave}.tmp")  # Não termina em .wav: _indexar ignora
+        engine.save_to_file(texto, temporario)
+        engine.runAndWait()
+        if not os.path.exists(temporario):
+            return None
+        os.replace(temporario, destino)
+        tamanho = os.path.getsize(destino)
+        with self._lock:
+            self._bytes += tamanho - self._arquivos.pop(chave, 0)
+            self._arquivos[chave] = tamanho
+            self._pedidos.pop(texto, None)
+            self._evictar(voz, velocidade)
+        return destino
+
+    def _evictar(self, voz, velocidade):
+        protegidas = {self.chave(t, voz, velocidade) for t in self.fixas}
+        for chave in list(self._arquivos):
+            if self._bytes <= self.max_bytes:
+                break
+            if chave in protegidas:
+                continue
+            self._bytes -= self._arquivos.pop(chave)
+            try:
+                os.remove(self._caminho(chave))
+            except OSError:
+                pass
+
+    def estatisticas(self):
+        return {"arquivos": len(self._arquivos), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,63 @@
+import re
+
+from isa_core.intent_router import dobrar
+from isa_core.response_cache import ResponseCache, _dobrar
+
+# Palavras do pedido que não fazem parte do nome do site ("abra o site do youtube")
+PALAVRAS_PEDIDO = frozenset("""
+abra abrir abre acesse acessar acessa entre entrar va ir site sites pagina
+url link endereco portal o a os as um uma do da dos das de no na para pra
+me por favor isa
+""".split())
+
+# Resposta da IA aceita como URL: esquema http(s), domínio com TLD e nada mais
+_URL = re.compile(r"^https?://[a-z0-9-]+(\.[a-z0-9-]+)*\.[a-z]{2,}(:\d+)?(/\S*)?$", re.IGNORECASE)
+
+
+def nome_do_site(comando):
+    """Só o nome do site: "abra o site do YouTube" -> "youtube"."""
+    return " ".join(p for p in dobrar(comando).split() if p not in PALAVRAS_PEDIDO)
+
+
+def validar_url(resposta):
+    """
+    URL limpa se a resposta da IA for exatamente uma URL (com ou sem
+    https://, entre aspas ou crases); None para qualquer outra coisa
+    (pergunta de volta, explicação, várias URLs).
+    """
+    texto = resposta.strip().strip("`'\"<>").strip()
+    if not texto or any(c.isspace() for c in texto):
+        return None
+    if not texto.lower().startswith(("http://", "https://")):
+        texto = "https://" + texto
+    texto = texto.rstrip(".,;")
+    return texto if _URL.match(texto) else None
+
+
+class CacheURLs(ResponseCache):
+    """
+    Nome do site -> URL, para "abra o site X" não perguntar à IA de novo.
+
+    Mesma base do cache de respostas (LRU, TTL, JSON em disco), mas a chave
+    é só o nome do site extraído do pedido, e só entram URLs validadas. O
+    nome fica inteiro (só sem acento e caixa): sem tirar stop words, "bom
+    dia brasil" e "brasil" são sites diferentes.
+    """
+
+    def __init__(self, caminho=None, ttl=30 * 24 * 3600, max_itens=300):
+        super().__init__(caminho, ttl=ttl, max_itens=max_itens)
+
+    def chave(self, nome):
+        return " ".join(_dobrar(nome))
+
+    def obter(self, comando):
+        nome = nome_do_site(comando)
+        return super().obter(nome) if nome else None
+
+    def guardar(self, comando, resposta):
+        """Guarda a URL da resposta da IA se ela for válida; devolve a URL ou None."""
+        nome = nome_do_site(comando)
+        url = validar_url(resposta)
+        if nome and url:
+            super().guardar(nome, url)
+        return url
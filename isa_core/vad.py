@@ -0,0 +1,61 @@
+import math
+from array import array
+
+try:
+    import audioop
+except ImportError:  # Python 3.13+ sem o pacote audioop-lts
+    audioop = None
+
+
+def energia(bloco, largura=2):
+    """RMS do bloco de áudio, na mesma escala do energy_threshold do speech_recognition."""
+    if audioop is not None:
+        return audioop.rms(bloco, largura)
+    amostras = array("h", bloco[: len(bloco) - len(bloco) % 2])
+    if not amostras:
+        return 0
+    return int(math.sqrt(sum(a * a for a in amostras) / len(amostras)))
+
+
+class DetectorVoz:
+    """
+    Detecção de atividade de voz (VAD) por energia, bloco a bloco.
+
+    A fala começa depois de `inicio_fala` segundos acima do `limiar` e
+    termina depois de `fim_fala` segundos abaixo dele. O limiar é o
+    energy_threshold já calibrado pelo CaptureService, então o detector não
+    precisa medir o ruído de novo.
+    """
+
+    def __init__(self, limiar, taxa=16000, largura=2, inicio_fala=0.1, fim_fala=0.6):
+        self.limiar = limiar
+        self.taxa = taxa
+        self.largura = largura
+        self.inicio_fala = inicio_fala
+        self.fim_fala = fim_fala
+        self.falando = False
+        self._voz = 0.0
+        self._silencio = 0.0
+
+    def duracao(self, bloco):
+        return len(bloco) / (self.largura * self.taxa)
+
+    def alimentar(self, bloco):
+        """Processa um bloco e devolve "inicio", "fim" ou None."""
+        duracao = self.duracao(bloco)
+        if energia(bloco, self.largura) >= self.limiar:
+            self._voz += duracao
+            self._silencio = 0.0
+        else:
+            self._silencio += duracao
+            if not self.falando:
+                self._voz = 0.0  # Estalo isolado não conta como início de fala
+
+        if not self.falando and self._voz >= self.inicio_fala:
+            self.falando = True
+            return "inicio"
+        if self.falando and self._silencio >= self.fim_fala:
+            self.falando = False
+            self._voz = 0.0
+            return "fim"
+        return None
@@ -0,0 +1,98 @@
+from collections import deque, namedtuple
+
+from isa_core.vad import DetectorVoz
+
+# tipo: "parcial", "comando", "final" ou "timeout"
+EventoVoz = namedtuple("EventoVoz", "tipo texto intencao")
+
+
+class PipelineVoz:
+    """
+    Blocos de áudio -> VAD -> reconhecimento incremental -> roteador de intenções.
+
+    `processar` é um gerador de EventoVoz:
+        parcial  -> texto reconhecido até agora (para mostrar na tela)
+        comando  -> uma intenção de `intencoes_rapidas` ficou estável no
+                    parcial por `confirmacao` segundos de áudio; o comando já
+                    pode ser executado e a escuta termina aqui, sem esperar o
+                    fim da frase
+        final    -> texto final, depois de `fim_fala` segundos de silêncio
+                    (ou de `limite_frase` segundos falando)
+        timeout  -> ninguém falou em `timeout` segundos
+    O gerador termina depois de "comando", "final" ou "timeout"; fechar o
+    gerador fecha também o fluxo de blocos (o microfone volta a ficar livre).
+    """
+
+    def __init__(self, stt, rotear, intencoes_rapidas=(), confirmacao=0.3, timeout=5,
+                 limite_frase=10, inicio_fala=0.1, fim_fala=0.6, pre_fala=0.3):
+        self.stt = stt
+        self.rotear = rotear
+        self.intencoes_rapidas = set(intencoes_rapidas)
+        self.confirmacao = confirmacao
+        self.timeout = timeout
+        self.limite_frase = limite_frase
+        self.inicio_fala = inicio_fala
+        self.fim_fala = fim_fala
+        self.pre_fala = pre_fala
+
+    def processar(self, blocos, limiar, taxa=16000, largura=2):
+        detector = DetectorVoz(limiar, taxa, largura, self.inicio_fala, self.fim_fala)
+        antes = deque()  # Áudio logo antes do início detectado (começo da 1ª palavra)
+        duracao_antes = 0.0
+        esperando = 0.0
+        fluxo = None
+        falado = 0.0
+        parcial = ""
+        candidata, estavel = None, 0.0
+
+        try:
+            for bloco in blocos:
+                duracao = detector.duracao(bloco)
+                evento = detector.alimentar(bloco)
+
+                if fluxo is None:
+                    antes.append(bloco)
+                    duracao_antes += duracao
+                    while len(antes) > 1 and duracao_antes - detector.duracao(antes[0]) >= self.pre_fala:
+                        duracao_antes -= detector.duracao(antes.popleft())
+                    if evento != "inicio":
+                        esperando += duracao
+                        if esperando >= self.timeout:
+                            yield EventoVoz("timeout", "", None)
+                            return
+                        continue
+                    fluxo = self.stt.abrir_fluxo(taxa, largura)
+                    pendentes, antes = list(antes), deque()
+                else:
+                    pendentes = [bloco]
+
+                novo = parcial
+                for pendente in pendentes:
+                    novo = fluxo.aceitar(pendente) or novo
+                falado += duracao
+
+                if novo != parcial:
+                    parcial = novo
+                    yield EventoVoz("parcial", parcial, None)
+                    intencao = self.rotear(parcial) if self.intencoes_rapidas else None
+                    if intencao is None or intencao.nome not in self.intencoes_rapidas:
+                        candidata, estavel = None, 0.0
+                    elif intencao != candidata:
+                        candidata, estavel = intencao, 0.0
+                elif candidata is not None:
+                    estavel += duracao
+
+                if candidata is not None and estavel >= self.confirmacao:
+                    yield EventoVoz("comando", parcial, candidata)
+                    return
+                if evento == "fim" or falado >= self.limite_frase:
+                    break
+        finally:
+            fechar = getattr(blocos, "close", None)
+            if fechar:
+                fechar()
+
+        if fluxo is None:
+            yield EventoVoz("timeout", "", None)
+            return
+        yield EventoVoz("final", fluxo.finalizar(), None)
@@ -0,0 +1,125 @@
+import time
+from collections import deque
+
+from isa_core.intent_router import dobrar
+from isa_core.stt import converter_audio
+from isa_core.vad import DetectorVoz
+
+PALAVRAS_PADRAO = ("isa",)
+
+
+class DetectorPalavraChave:
+    """
+    Detector local da palavra-chave ("ISA") para o modo mãos livres.
+
+    Fica ligado o tempo todo, então precisa ser barato:
+      - o VAD por energia descarta o silêncio sem chamar reconhecedor nenhum;
+      - só os trechos com voz passam por um reconhecedor incremental (Vosk)
+        com gramática restrita às palavras-chave, bem mais leve que o
+        reconhecimento livre.
+    O STT completo só roda depois que a palavra-chave é ouvida.
+
+    `estatisticas()` mostra quanto áudio chegou ao reconhecedor e o uso de
+    CPU do próprio detector (tempo de CPU / duração do áudio).
+    """
+
+    def __init__(self, motor, palavras=PALAVRAS_PADRAO, inicio_fala=0.1, fim_fala=0.4, pre_fala=0.3):
+        self.motor = motor
+        self.palavras = {dobrar(p).strip() for p in palavras}
+        self.gramatica = sorted(self.palavras) + ["[unk]"]
+        self.inicio_fala = inicio_fala
+        self.fim_fala = fim_fala
+        self.pre_fala = pre_fala
+        self.taxa = 16000
+        self.largura = 2
+        self.vad = DetectorVoz(300, inicio_fala=inicio_fala, fim_fala=fim_fala)
+        self._fluxo = None
+        self._antes = deque()
+        self.segundos_audio = 0.0
+        self.segundos_reconhecidos = 0.0
+        self.segundos_cpu = 0.0
+        self.ativacoes = 0
+
+    def preparar(self, limiar, taxa=16000, largura=2):
+        """Recomeça a escuta com o limiar de energia e o formato atuais do microfone."""
+        self.taxa = taxa
+        self.largura = largura
+        self.vad = DetectorVoz(limiar, taxa, largura, self.inicio_fala, self.fim_fala)
+        self._fluxo = None
+        self._antes.clear()
+
+    def _ouviu(self, texto):
+        return any(palavra in self.palavras for palavra in dobrar(texto).split())
+
+    def alimentar(self, bloco):
+        """Processa um bloco de áudio bruto; True quando a palavra-chave foi dita."""
+        inicio = time.thread_time()
+        try:
+            return self._alimentar(bloco)
+        finally:
+            self.segundos_cpu += time.thread_time() - inicio
+
+    def _alimentar(self, bloco):
+        duracao = self.vad.duracao(bloco)
+        self.segundos_audio += duracao
+        evento = self.vad.alimentar(bloco)
+
+        if self._fluxo is None:
+            self._antes.append(bloco)
+            while len(self._antes) * duracao > self.pre_fala + duracao:
+                self._antes.popleft()
+            if evento != "inicio":
+                return False
+            self._fluxo = self.motor.iniciar_fluxo(self.gramatica)
+            pendentes = list(self._antes)
+            self._antes.clear()
+        else:
+            pendentes = [bloco]
+
+        texto = ""
+        for pendente in pendentes:
+            self.segundos_reconhecidos += self.vad.duracao(pendente)
+            texto = self._fluxo.aceitar(converter_audio(pendente, self.taxa, self.largura))
+        if evento == "fim":
+            texto = self._fluxo.finalizar()
+            self._fluxo = None
+        if not self._ouviu(texto):
+            return False
+
+        self.ativacoes += 1
+        self._fluxo = None
+        return True
+
+    def estatisticas(self):
+        audio = self.segundos_audio or 1.0
+        return {
+            "audio_s": round(self.segundos_audio, 1),
+            "reconhecido_pct": round(100 * self.segundos_reconhecidos / audio, 1),
+            "cpu_pct": round(100 * self.segundos_cpu / audio, 2),
+            "ativacoes": self.ativacoes,
+        }
+
+
+def criar_detector(stt, palavras=PALAVRAS_PADRAO):
+    """Detector com o primeiro motor incremental da cadeia de STT, ou None se não houver nenhum."""
+    for motor in getattr(stt, "motores", [stt]):
+        if motor.iniciar_fluxo(["[unk]"]) is not None:
+            return DetectorPalavraChave(motor, palavras)
+    return None
+
+
+def esperar_palavra_chave(servico, detector, timeout=30):
+    """
+    Escuta o microfone do CaptureService até a palavra-chave (True) ou até
+    `timeout` segundos sem ela (False), para quem chama poder checar se
+    ainda deve continuar.
+    """
+    detector.preparar(servico.recognizer.energy_threshold, servico.taxa, servico.largura)
+    blocos = servico.transmitir(limite=timeout)
+    try:
+        for bloco in blocos:
+            if detector.alimentar(bloco):
+                return True
+        return False
+    finally:
+        blocos.close()  # Libera o microfone para o STT completo
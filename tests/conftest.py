@@ -0,0 +1,37 @@
+"""
+Testes dos módulos de isa_core, rodando offline com os dublês de isa_core/fakes.py.
+
+    python -m pytest -q
+"""
+import ast
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from isa_core.intent_router import IntentRouter  # noqa: E402
+
+
+def carregar_definicoes(caminho, nomes, contexto):
+    """
+    Executa só as atribuições `nomes` do arquivo (ex.: a tabela de comandos
+    do app.py), sem importar o app inteiro com Flask, microfone e voz.
+    """
+    with open(caminho, encoding="utf-8") as f:
+        arvore = ast.parse(f.read(), caminho)
+    corpo = [no for no in arvore.body if isinstance(no, ast.Assign)
+             and any(isinstance(alvo, ast.Name) and alvo.id in nomes for alvo in no.targets)]
+    espaco = dict(contexto)
+    exec(compile(ast.Module(corpo, type_ignores=[]), caminho, "exec"), espaco)
+    return espaco
+
+
+@pytest.fixture(scope="session")
+def roteador_comandos():
+    """O ROTEADOR_COMANDOS do Prototipo Ultimate, com a tabela de verdade."""
+    caminho = os.path.join(RAIZ, "Prototipo Ultimate", "app.py")
+    nomes = {"ARTIGOS", "PREFIXOS_COMANDO", "ROTEADOR_COMANDOS"}
+    return carregar_definicoes(caminho, nomes, {"IntentRouter": IntentRouter})["ROTEADOR_COMANDOS"]
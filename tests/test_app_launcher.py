@@ -0,0 +1,59 @@
+import os
+import stat
+
+import pytest
+
+from isa_core.app_launcher import IndiceAplicativos
+
+DESKTOP = {
+    "writer.desktop": "Name=LibreOffice Writer\nGenericName=Processador de texto\nExec=libreoffice --writer %U\n",
+    "calc.desktop": "Name=Calculadora\nExec=gnome-calculator\n",
+    "oculto.desktop": "Name=Oculto\nExec=oculto\nNoDisplay=true\n",
+}
+EXECUTAVEIS = ["install", "chattr", "firefox", "e"]
+
+
+@pytest.fixture
+def indice(tmp_path):
+    menu = tmp_path / "applications"
+    menu.mkdir()
+    for nome, campos in DESKTOP.items():
+        (menu / nome).write_text(f"[Desktop Entry]\nType=Application\n{campos}", encoding="utf-8")
+    binarios = tmp_path / "bin"
+    binarios.mkdir()
+    for nome in EXECUTAVEIS:
+        caminho = binarios / nome
+        caminho.write_text("#!/bin/sh\n")
+        os.chmod(caminho, os.stat(caminho).st_mode | stat.S_IXUSR)
+    return IndiceAplicativos([str(menu)], [str(binarios)], aliases={"navegador": "firefox"})
+
+
+def test_nome_exato_do_menu_e_do_path(indice):
+    assert indice.buscar("calculadora").comando == "gnome-calculator"
+    assert indice.buscar("Firefox").origem == "path"
+
+
+def test_apelido_do_usuario(indice):
+    assert indice.buscar("navegador").nome == "firefox"
+
+
+def test_prefixo_palavra_e_erro_de_reconhecimento(indice):
+    assert indice.buscar("libre").nome == "LibreOffice Writer"
+    assert indice.buscar("writer").nome == "LibreOffice Writer"
+    assert indice.buscar("calculadra").nome == "Calculadora"
+    assert indice.buscar("libreoffice writer").comando == "libreoffice --writer"
+
+
+def test_executaveis_do_path_so_pelo_nome_exato(indice):
+    assert indice.buscar("instagram") is None
+    assert indice.buscar("chat") is None
+    assert indice.buscar("fire") is None
+
+
+def test_consultas_curtas_nao_abrem_nada(indice):
+    assert indice.buscar("o") is None
+    assert indice.buscar("ca") is None
+
+
+def test_entrada_oculta_fica_de_fora(indice):
+    assert indice.buscar("oculto") is None
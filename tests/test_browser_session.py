@@ -0,0 +1,62 @@
+import json
+
+from isa_core.browser_session import SessaoNavegador, resolver_chromedriver
+from isa_core.fakes import FakeDriver
+
+
+def sessao_com_drivers():
+    drivers = []
+
+    def criar():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    return SessaoNavegador(criar), drivers
+
+
+def test_sessao_reaproveitada_entre_comandos():
+    sessao, drivers = sessao_com_drivers()
+    sessao.navegar("https://youtube.com")
+    sessao.navegar("https://google.com", nova_aba=True)
+    sessao.executar(lambda driver: driver.execute_script("window.scrollBy(0, 500)"))
+    assert len(drivers) == 1 and sessao.inicializacoes == 1
+    assert drivers[0].visitadas == ["https://youtube.com", "https://google.com"]
+    assert len(drivers[0].abas) == 2
+    assert sessao.navegacoes == 2
+
+
+def test_health_check_reinicia_sessao_morta():
+    sessao, drivers = sessao_com_drivers()
+    sessao.navegar("https://youtube.com")
+    drivers[0].fechar_janela()  # O usuário fechou o Chrome
+    sessao.navegar("https://google.com")
+    assert len(drivers) == 2 and sessao.inicializacoes == 2
+    assert drivers[0].encerrado  # A sessão morta foi encerrada
+    assert drivers[1].visitadas == ["https://google.com"]
+
+
+def test_executar_nao_abre_navegador():
+    sessao, drivers = sessao_com_drivers()
+    assert sessao.executar(lambda driver: driver.current_url) is None
+    sessao.navegar("https://youtube.com")
+    drivers[0].fechar_janela()
+    assert sessao.executar(lambda driver: driver.current_url) is None
+    assert not sessao.aberto and len(drivers) == 1
+
+
+def test_caminho_do_chromedriver_fica_em_cache(tmp_path):
+    driver = tmp_path / "chromedriver"
+    driver.write_text("")
+    cache = tmp_path / "cache_chromedriver.json"
+    instalacoes = []
+
+    def instalar():
+        instalacoes.append(1)
+        return str(driver)
+
+    assert resolver_chromedriver(str(cache), instalar) == str(driver)
+    assert resolver_chromedriver(str(cache), instalar) == str(driver)
+    assert len(instalacoes) == 1
+    assert json.loads(cache.read_text())["caminho"] == str(driver)
+    resolver_chromedriver(str(cache), instalar, forcar=True)  # Driver incompatível
+    assert len(instalacoes) == 2
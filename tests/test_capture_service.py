@@ -0,0 +1,95 @@
+import threading
+import time
+import wave
+
+import pytest
+
+from isa_core.capture_service import CaptureService, MicrofoneOcupado
+from isa_core.fakes import FakeFonte, FakeRecognizer
+
+TAXA = 16000
+QUADROS_FRASE = TAXA // 10  # Cada "frase" do WAV tem 100 ms
+
+
+def gravar_wav(caminho, frases):
+    """WAV de teste: a frase i é um trecho com todas as amostras iguais a i + 1."""
+    with wave.open(str(caminho), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(TAXA)
+        for i in range(frases):
+            wav.writeframes((i + 1).to_bytes(2, "little") * QUADROS_FRASE)
+
+
+def ler_wav(caminho):
+    with wave.open(str(caminho), "rb") as wav:
+        return wav.readframes(wav.getnframes())
+
+
+class RecognizerWAV(FakeRecognizer):
+    """Como o sr.Recognizer com um AudioFile: cada `listen` consome uma frase da fonte."""
+
+    def __init__(self):
+        super().__init__()
+        self.ouvidas = 0
+        self.portao = threading.Event()
+        self.portao.set()
+        self.ouvindo = threading.Event()
+
+    def listen(self, source=None, timeout=None, phrase_time_limit=None):
+        self.ouvidas += 1
+        self.ouvindo.set()
+        self.portao.wait()
+        bloco = source.stream.read(QUADROS_FRASE)
+        return int.from_bytes(bloco[:2], "little")  # Número da frase
+
+
+@pytest.fixture
+def servico(tmp_path):
+    caminho = tmp_path / "frases.wav"
+    gravar_wav(caminho, 3)
+    recognizer = RecognizerWAV()
+    servico = CaptureService(lambda: FakeFonte(ler_wav(caminho), TAXA), recognizer, ao_vivo=False, max_pedidos=2)
+    servico.start()
+    yield servico
+    servico.parar()
+
+
+def test_frases_do_wav_chegam_em_ordem(servico):
+    assert servico.aberto.wait(5) and servico.erro is None
+    assert [servico.capturar(timeout=1, limite_frase=1) for _ in range(3)] == [1, 2, 3]
+
+
+def test_pedido_abandonado_nao_consome_a_proxima_frase(servico):
+    recognizer = servico.recognizer
+    recognizer.portao.clear()  # A primeira captura fica presa ouvindo
+    primeira = []
+    ocupada = threading.Thread(target=lambda: primeira.append(servico.capturar(timeout=10, limite_frase=None)))
+    ocupada.start()
+    assert recognizer.ouvindo.wait(5)
+
+    with pytest.raises(RuntimeError, match="não terminou a tempo"):
+        servico.capturar(timeout=None, limite_frase=None)  # Desiste depois de ~2 s na fila
+
+    recognizer.portao.set()
+    ocupada.join(5)
+    assert primeira == [1]
+    # O pedido que desistiu foi pulado: a frase 2 vai para quem pediu agora
+    assert servico.capturar(timeout=1, limite_frase=1) == 2
+    assert recognizer.ouvidas == 2
+
+
+def test_fila_cheia(servico):
+    servico.recognizer.portao.clear()
+    threads = [threading.Thread(target=servico.capturar, kwargs={"timeout": 10}) for _ in range(3)]
+    threads[0].start()
+    assert servico.recognizer.ouvindo.wait(5)  # A primeira já saiu da fila antes das outras entrarem
+    for t in threads[1:]:
+        t.start()
+    while servico._pedidos.qsize() < 2:  # Uma sendo ouvida, duas na fila (max_pedidos=2)
+        time.sleep(0.005)
+    with pytest.raises(MicrofoneOcupado):
+        servico.capturar()
+    servico.recognizer.portao.set()
+    for t in threads:
+        t.join(5)
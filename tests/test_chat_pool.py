@@ -0,0 +1,58 @@
+import time
+
+from isa_core.chat_pool import ChatPool
+from isa_core.fakes import FakeModel
+
+
+def test_cada_sessao_tem_o_seu_chat():
+    modelo = FakeModel()
+    pool = ChatPool(modelo.start_chat)
+    pool.enviar("a", "meu nome é Ana")
+    pool.enviar("a", "e o horário?")
+    resposta = pool.enviar("b", "oi")
+    assert modelo.chats_criados == 2
+    assert "0 turnos antes" in resposta.text  # A conversa de "a" não vazou para "b"
+    assert len(pool._obter("a").chat.history) == 4
+
+
+def test_lru_descarta_a_sessao_menos_usada():
+    pool = ChatPool(FakeModel().start_chat, max_sessoes=2)
+    pool.enviar("a", "oi")
+    pool.enviar("b", "oi")
+    pool.enviar("a", "de novo")  # "a" passa a ser a mais recente
+    pool.enviar("c", "oi")
+    assert len(pool) == 2
+    assert "a" in pool and "c" in pool and "b" not in pool
+
+
+def test_sessao_parada_expira():
+    modelo = FakeModel()
+    pool = ChatPool(modelo.start_chat, ttl_ocioso=0.05)
+    pool.enviar("a", "oi")
+    time.sleep(0.1)
+    resposta = pool.enviar("a", "lembra de mim?")
+    assert modelo.chats_criados == 2
+    assert "0 turnos antes" in resposta.text
+
+
+def test_historico_podado_por_turnos():
+    pool = ChatPool(FakeModel().start_chat, max_turnos=2)
+    for i in range(5):
+        pool.enviar("a", f"pergunta {i}")
+    assert len(pool._obter("a").chat.history) == 4
+
+
+def test_stream_guarda_o_turno():
+    pool = ChatPool(FakeModel(resposta="uma resposta").start_chat)
+    assert "".join(pool.enviar_stream("a", "oi")) == "uma resposta"
+    assert len(pool._obter("a").chat.history) == 2
+
+
+def test_historico_guarda_so_a_pergunta_sem_o_contexto():
+    modelo = FakeModel()
+    pool = ChatPool(modelo.start_chat)
+    prompt = "Informações do campus (use se forem úteis):\n- Biblioteca: das 8h às 21h.\n\nPergunta: e a biblioteca?"
+    pool.enviar("a", prompt, no_historico="e a biblioteca?")
+    "".join(pool.enviar_stream("a", prompt, no_historico="e a biblioteca?"))
+    perguntas = [m["parts"] for m in pool._obter("a").chat.history if m["role"] == "user"]
+    assert perguntas == ["e a biblioteca?", "e a biblioteca?"]
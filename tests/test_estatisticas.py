@@ -0,0 +1,9 @@
+from isa_core.estatisticas import percentil
+
+
+def test_percentil():
+    valores = [5, 1, 4, 2, 3]  # Não precisa vir ordenado
+    assert percentil(valores, 0.50) == 3
+    assert percentil(valores, 0.95) == 5
+    assert percentil(valores, 1.0) == 5
+    assert percentil([], 0.95) == 0.0
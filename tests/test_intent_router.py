@@ -0,0 +1,59 @@
+import pytest
+
+from isa_core.intent_router import IntentRouter
+
+
+@pytest.mark.parametrize("frase, nome, slots", [
+    ("aumentar volume", "volume", {"acao": "up"}),
+    ("Isa, diminui o som", "volume", {"acao": "down"}),
+    ("por favor deixa o volume no mudo", "volume", {"acao": "mute"}),
+    ("volume no máximo", "volume", {"acao": "max"}),
+    ("mudo", "volume", {"acao": "mute"}),
+    ("deixa no mudo", "volume", {"acao": "mute"}),
+    ("aumenta o brilho", "brilho", {"acao": "up"}),
+    ("tira um print", "print", {}),
+    ("abra o site do youtube", "abrir", {"tipo": "site", "alvo": "youtube", "frase": "o site do youtube"}),
+    ("pode abrir a calculadora?", "abrir", {"alvo": "calculadora", "frase": "a calculadora"}),
+    ("quero abrir o youtube", "abrir", {"alvo": "youtube"}),
+    ("gostaria de abrir o youtube", "abrir", {"alvo": "youtube"}),
+    ("acesse o portal do campus", "site", {"alvo": "campus", "frase": "o portal do campus"}),
+])
+def test_comandos(roteador_comandos, frase, nome, slots):
+    intencao = roteador_comandos.rotear(frase)
+    assert intencao is not None and intencao.nome == nome
+    assert {k: intencao.slots[k] for k in slots} == slots
+
+
+@pytest.mark.parametrize("frase", [
+    "o que é um print screen?",
+    "qual o volume de água da caixa?",
+    "me fale sobre o som da guitarra",
+    "como abrir uma conta no banco",
+    "volume",  # Sem a ação obrigatória
+    "a biblioteca abre sábado?",
+])
+def test_perguntas_e_frases_soltas_vao_para_a_ia(roteador_comandos, frase):
+    assert roteador_comandos.rotear(frase) is None
+
+
+def test_frase_mais_longa_ganha():
+    roteador = IntentRouter([
+        {"nome": "bloco", "gatilhos": ["bloco"]},
+        {"nome": "bloco de notas", "gatilhos": ["bloco de notas"]},
+    ])
+    assert roteador.rotear("abre o bloco de notas").nome == "bloco de notas"
+    assert roteador.rotear("abre o bloco").nome == "bloco"
+
+
+def test_empate_vale_a_ordem_da_tabela():
+    roteador = IntentRouter([
+        {"nome": "primeiro", "gatilhos": ["som"]},
+        {"nome": "segundo", "gatilhos": ["som"]},
+    ])
+    assert roteador.rotear("som").nome == "primeiro"
+
+
+def test_acentos_e_caixa_nao_importam():
+    roteador = IntentRouter([{"nome": "audio", "gatilhos": ["áudio"]}])
+    assert roteador.rotear("AUDIO").nome == "audio"
+    assert roteador.rotear("nada aqui") is None
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from isa_core.knowledge_base import BaseConhecimento
+
+DOCUMENTOS = {
+    "biblioteca.md": "# Horário da biblioteca\nA biblioteca funciona das 8h às 21h, de segunda a sexta.\n",
+    "restaurante.md": "# Restaurante\nO restaurante universitário serve almoço das 11h às 14h.\n",
+}
+
+
+@pytest.fixture
+def base(tmp_path):
+    for nome, conteudo in DOCUMENTOS.items():
+        (tmp_path / nome).write_text(conteudo, encoding="utf-8")
+    return BaseConhecimento(str(tmp_path), intervalo_checagem=0)
+
+
+def test_busca_acha_a_passagem_certa(base):
+    resultados = base.buscar("qual o horário da biblioteca?")
+    assert resultados[0].passagem.arquivo == "biblioteca.md"
+    assert resultados[0].confianca == pytest.approx(1.0)
+
+
+def test_resposta_direta_so_com_confianca_alta(base):
+    assert "8h às 21h" in base.resposta_direta("horário da biblioteca")
+    # "piada" não existe em nenhum documento: derruba a confiança
+    assert base.resposta_direta("me conte uma piada sobre a biblioteca") is None
+
+
+def test_pergunta_sem_relacao_nao_tem_contexto(base):
+    assert base.buscar("previsão do tempo amanhã") == []
+    assert base.contexto("previsão do tempo amanhã") == ""
+
+
+def test_reindexa_arquivo_alterado_e_apagado(base, tmp_path):
+    caminho = tmp_path / "restaurante.md"
+    caminho.write_text("# Restaurante\nO restaurante serve jantar das 18h às 20h.\n", encoding="utf-8")
+    os.utime(caminho, (1, 1))  # mtime diferente mesmo no mesmo segundo
+    assert base.atualizar() == 1
+    assert "jantar" in base.resposta_direta("jantar no restaurante")
+
+    os.remove(caminho)
+    assert base.atualizar() == 1
+    assert base.buscar("restaurante") == []
+    assert len(base) == 1
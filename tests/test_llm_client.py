@@ -0,0 +1,133 @@
+import threading
+import time
+
+import pytest
+
+from isa_core.fakes import FakeModel
+from isa_core.llm_client import (BaldeTokens, CircuitoAberto, ClienteIA, Disjuntor, FilaCheia,
+                                 PrazoEsgotado, transitorio)
+
+
+def enviar(modelo, texto="oi"):
+    chat = modelo.start_chat()
+    return lambda timeout: chat.send_message(texto, request_options={"timeout": timeout}).text
+
+
+def test_balde_libera_a_rajada_e_depois_segue_a_taxa():
+    balde = BaldeTokens(por_segundo=20, capacidade=3)
+    agora = time.monotonic()
+    assert all(balde.consumir(agora) for _ in range(3))
+    assert not balde.consumir(time.monotonic())  # Sem token e sem tempo para esperar
+    assert balde.consumir(time.monotonic() + 0.2)  # 1 token a cada 50 ms
+
+
+def test_balde_nao_passa_da_capacidade():
+    balde = BaldeTokens(por_segundo=1000, capacidade=2)
+    time.sleep(0.01)
+    assert balde.disponiveis() == 2
+
+
+def test_disjuntor_abre_depois_das_falhas_seguidas():
+    disjuntor = Disjuntor(limite_falhas=2, tempo_aberto=30)
+    disjuntor.falha()
+    assert disjuntor.estado == Disjuntor.FECHADO
+    disjuntor.falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert disjuntor.permitir() >= 1
+
+
+def test_disjuntor_meio_aberto_deixa_uma_chamada_de_teste():
+    disjuntor = Disjuntor(limite_falhas=1, tempo_aberto=0.05)
+    disjuntor.falha()
+    time.sleep(0.06)
+    assert disjuntor.estado == Disjuntor.MEIO_ABERTO
+    assert disjuntor.permitir() == 0
+    assert disjuntor.permitir() > 0  # Só uma de cada vez
+    disjuntor.sucesso()
+    assert disjuntor.estado == Disjuntor.FECHADO
+
+
+def test_disjuntor_teste_que_falha_abre_de_novo():
+    disjuntor = Disjuntor(limite_falhas=3, tempo_aberto=0.05)
+    for _ in range(3):
+        disjuntor.falha()
+    time.sleep(0.06)
+    assert disjuntor.permitir() == 0
+    disjuntor.falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+
+
+def test_erros_transitorios():
+    modelo = FakeModel(falhas=1)
+    with pytest.raises(Exception) as erro:
+        modelo.start_chat().send_message("oi")
+    assert transitorio(erro.value)
+    assert transitorio(TimeoutError())
+    assert not transitorio(ValueError("pedido inválido"))
+
+
+def test_cliente_repete_erro_transitorio():
+    modelo = FakeModel(falhas=2, resposta="pronto")
+    cliente = ClienteIA(tentativas=3, espera_base=0.001)
+    assert cliente.chamar(enviar(modelo)) == "pronto"
+    assert cliente.contadores["repeticoes"] == 2
+    assert cliente.disjuntor.estado == Disjuntor.FECHADO
+
+
+def test_cliente_nao_repete_erro_do_pedido():
+    cliente = ClienteIA(espera_base=0.001)
+    chamadas = []
+
+    def invalido(timeout):
+        chamadas.append(timeout)
+        raise ValueError("pedido inválido")
+
+    with pytest.raises(ValueError):
+        cliente.chamar(invalido)
+    assert len(chamadas) == 1
+    assert cliente.disjuntor.falhas_seguidas == 0
+
+
+def test_cliente_abre_o_circuito_com_o_servico_fora_do_ar():
+    modelo = FakeModel(fora_do_ar=True)
+    cliente = ClienteIA(tentativas=1, limite_falhas=2, tempo_aberto=30)
+    for _ in range(2):
+        with pytest.raises(Exception):
+            cliente.chamar(enviar(modelo))
+    chamadas = modelo.chamadas
+    with pytest.raises(CircuitoAberto) as erro:
+        cliente.chamar(enviar(modelo))
+    assert modelo.chamadas == chamadas  # Falhou na hora, sem chamar o serviço
+    assert erro.value.retry_after >= 1
+
+
+def test_prazo_esgotado_na_cota_nao_conta_para_o_disjuntor():
+    modelo = FakeModel()
+    cliente = ClienteIA(limite_por_minuto=1, rajada=1, prazo=0.1, limite_falhas=1)
+    cliente.chamar(enviar(modelo))
+    with pytest.raises(PrazoEsgotado):
+        cliente.chamar(enviar(modelo))
+    assert cliente.disjuntor.falhas_seguidas == 0
+    assert cliente.disjuntor.estado == Disjuntor.FECHADO
+
+
+def test_fila_cheia_recusa_na_hora():
+    modelo = FakeModel(atraso=0.3)
+    cliente = ClienteIA(max_em_voo=1, max_fila=0)
+    lenta = threading.Thread(target=cliente.chamar, args=(enviar(modelo),))
+    lenta.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(FilaCheia):
+            cliente.chamar(enviar(modelo))
+    finally:
+        lenta.join()
+
+
+def test_stream_entrega_os_pedacos():
+    modelo = FakeModel(resposta="uma resposta em pedaços")
+    cliente = ClienteIA()
+    chat = modelo.start_chat()
+    pedacos = cliente.chamar_stream(lambda timeout: (p.text for p in chat.send_message("oi", stream=True)))
+    assert "".join(pedacos) == "uma resposta em pedaços"
+    assert cliente.contadores["sucessos"] == 1
@@ -0,0 +1,58 @@
+import re
+import threading
+
+from isa_core.fakes import FakeRootTk, FakeTexto
+from isa_core.log_sink import LogSink
+
+THREADS = 8
+POR_THREAD = 2000
+_LINHA = re.compile(r"\[(\d+)\] (\d+)$")
+
+
+def escrever_em_paralelo(sink, root):
+    def produzir(t):
+        for i in range(POR_THREAD):
+            sink.escrever(f"Sistema [{t}] {i}")
+
+    produtores = [threading.Thread(target=produzir, args=(t,)) for t in range(THREADS)]
+    for p in produtores:
+        p.start()
+    while any(p.is_alive() for p in produtores) or sink.pendentes():
+        root.rodar_pendentes()  # Uma volta do loop do Tk enquanto as threads escrevem
+    for p in produtores:
+        p.join()
+
+
+def por_thread(linhas):
+    sequencias = {}
+    for linha in linhas:
+        t, i = _LINHA.search(linha).groups()
+        sequencias.setdefault(int(t), []).append(int(i))
+    return sequencias
+
+
+def test_widget_fica_com_as_ultimas_max_linhas_em_ordem():
+    root, widget = FakeRootTk(), FakeTexto()
+    sink = LogSink(max_linhas=500, intervalo_ms=0)
+    sink.anexar(widget, root)
+    escrever_em_paralelo(sink, root)
+
+    assert len(widget.linhas) == 500
+    # Tudo o que passou pelo widget: o que ficou + o que foi apagado (a linha vazia inicial também)
+    assert len(widget.linhas) + sink.descartadas == THREADS * POR_THREAD + 1
+    # De cada thread sobram as últimas mensagens, seguidas e na ordem em que foram escritas
+    for sequencia in por_thread(widget.linhas).values():
+        assert sequencia == list(range(sequencia[0], POR_THREAD))
+
+
+def test_arquivo_guarda_tudo_sem_perder_nem_trocar_a_ordem(tmp_path):
+    caminho = tmp_path / "isa.log"
+    root, widget = FakeRootTk(), FakeTexto()
+    sink = LogSink(max_linhas=100, intervalo_ms=0, arquivo=str(caminho), max_bytes=0)
+    sink.anexar(widget, root)
+    escrever_em_paralelo(sink, root)
+
+    linhas = caminho.read_text(encoding="utf-8").splitlines()
+    assert len(linhas) == THREADS * POR_THREAD
+    assert all(sequencia == list(range(POR_THREAD)) for sequencia in por_thread(linhas).values())
+    assert len(widget.linhas) == 100
@@ -0,0 +1,47 @@
+import json
+import time
+
+from isa_core.response_cache import ResponseCache, normalizar, resposta_compartilhavel
+
+
+def test_chave_ignora_caixa_acento_e_pontuacao():
+    assert normalizar("Qual o horário da Biblioteca?") == normalizar("qual o horario da biblioteca")
+    assert normalizar("Por favor, o Q-Acadêmico") == "q academico"
+
+
+def test_chave_separa_perguntas_diferentes():
+    assert normalizar("qual o cardápio do dia?") != normalizar("qual o cardápio da noite?")
+    assert normalizar("quando abre a biblioteca?") != normalizar("onde fica a biblioteca?")
+
+
+def test_respostas_que_nao_podem_ser_compartilhadas():
+    assert resposta_compartilhavel("qual o horário da biblioteca?")
+    assert not resposta_compartilhavel("que dia é hoje?")
+    assert not resposta_compartilhavel("que horas são agora?")
+    assert not resposta_compartilhavel("qual é o meu nome?")
+    assert not resposta_compartilhavel("e ela abre sábado?")
+
+
+def test_ttl_e_lru():
+    cache = ResponseCache(ttl=0.05, max_itens=2)
+    cache.guardar("horário da biblioteca", "8h às 21h")
+    assert cache.obter("Horário da biblioteca?") == "8h às 21h"
+    time.sleep(0.06)
+    assert cache.obter("horário da biblioteca") is None
+
+    cache.ttl = 60
+    for pergunta in ("biblioteca", "restaurante", "ginásio"):
+        cache.guardar(pergunta, pergunta.upper())
+    assert cache.obter("biblioteca") is None
+    assert len(cache) == 2
+
+
+def test_gravacao_agrupada_fora_da_requisicao(tmp_path):
+    caminho = tmp_path / "cache.json"
+    cache = ResponseCache(str(caminho), atraso_gravacao=60)
+    for i in range(50):
+        cache.guardar(f"pergunta {i}", "resposta")
+    assert not caminho.exists()  # Só agendada
+    cache.descarregar()
+    assert len(json.loads(caminho.read_text(encoding="utf-8"))) == 50
+    assert ResponseCache(str(caminho)).obter("pergunta 7") == "resposta"
@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+
+from isa_core.site_registry import RegistroSites
+
+SITES = {
+    "youtube": "https://youtube.com",
+    "qacademico": {"url": "https://qacademico.ifce.edu.br/", "apelidos": ["q-acadêmico", "q acadêmico"]},
+    "portal": {"url": "https://ifce.edu.br/caninde", "apelidos": ["portal do campus", "ifce"]},
+    "biblioteca": {"url": "https://ifce.edu.br/caninde/biblioteca", "apelidos": ["biblioteca do campus"]},
+    "biblioteca virtual": {"url": "https://bv.exemplo.com", "apelidos": ["biblioteca virtual"]},
+}
+
+
+@pytest.fixture
+def registro(tmp_path):
+    caminho = tmp_path / "config.json"
+    caminho.write_text(json.dumps({"sites": SITES}), encoding="utf-8")
+    return RegistroSites(str(caminho), intervalo_checagem=0)
+
+
+def test_apelido_inteiro_e_trecho_do_pedido(registro):
+    assert registro.buscar("YouTube") == "youtube"
+    assert registro.buscar("Q-Acadêmico") == "qacademico"
+    assert registro.buscar("o site do q acadêmico agora") == "qacademico"
+    assert registro.url("portal do campus") == "https://ifce.edu.br/caninde"
+
+
+def test_todas_as_palavras_precisam_aparecer(registro):
+    assert registro.buscar("realidade virtual") is None
+    assert registro.buscar("netflix") is None
+
+
+def test_empate_vai_para_o_primeiro_do_arquivo(registro):
+    # "biblioteca" está nos apelidos de dois sites
+    assert registro.buscar("biblioteca") == "biblioteca"
+
+
+def test_ranking_desempata_pelo_mais_usado(registro):
+    registro.registrar_uso("biblioteca virtual")
+    assert registro.buscar("biblioteca") == "biblioteca virtual"
+
+
+def test_arquivo_invalido_mantem_os_sites(registro, tmp_path):
+    (tmp_path / "config.json").write_text("{ quebrado", encoding="utf-8")
+    assert not registro.recarregar()
+    assert registro.buscar("youtube") == "youtube"
+
+
+def test_recarrega_quando_o_arquivo_muda(registro, tmp_path):
+    assert registro.buscar("moodle") is None
+    caminho = tmp_path / "config.json"
+    sites = dict(SITES, moodle={"url": "https://moodle.ifce.edu.br", "apelidos": ["moodle", "ava"]})
+    caminho.write_text(json.dumps({"sites": sites}), encoding="utf-8")
+    os.utime(caminho, (1, 1))  # mtime diferente mesmo no mesmo segundo
+    assert registro.buscar("moodle") == "moodle"
+    assert registro.url("ava") == "https://moodle.ifce.edu.br"
@@ -0,0 +1,120 @@
+import time
+
+from isa_core.fakes import FakeTTSEngine
+from isa_core.speech_scheduler import (PRIORIDADE_ALERTA, PRIORIDADE_CHAT, PRIORIDADE_COMANDO,
+                                       SpeechScheduler)
+
+
+class VozFalsa(SpeechScheduler):
+    def __init__(self, engine, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+
+    def criar_engine(self):
+        return self.engine
+
+
+def esperar_fila_vazia(voz, limite=5.0):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        dados = voz.estatisticas()
+        if not dados["profundidade"] and dados["falando"] is None:
+            return
+        time.sleep(0.005)
+    raise AssertionError("A fila de fala não esvaziou")
+
+
+def esperar_falando(voz, texto, limite=5.0):
+    fim = time.monotonic() + limite
+    while voz.estatisticas()["falando"] != texto:
+        assert time.monotonic() < fim, "A fala não começou"
+        time.sleep(0.005)
+
+
+def test_prioridade_e_ordem_de_chegada():
+    engine = FakeTTSEngine()
+    voz = VozFalsa(engine)
+    voz.falar("resposta um", PRIORIDADE_CHAT)
+    voz.falar("volume ajustado", PRIORIDADE_COMANDO)
+    voz.falar("resposta dois", PRIORIDADE_CHAT)
+    voz.falar("sem conexão", PRIORIDADE_ALERTA)
+    voz.start()  # Só começa a falar com tudo já na fila
+    esperar_fila_vazia(voz)
+    assert engine.faladas == ["sem conexão", "volume ajustado", "resposta um", "resposta dois"]
+
+
+def test_texto_repetido_e_grupo_coalescem():
+    voz = VozFalsa(FakeTTSEngine())
+    assert voz.falar("oi")
+    assert not voz.falar("oi")
+    voz.falar("carregando 10%", grupo="progresso")
+    voz.falar("carregando 50%", grupo="progresso")
+    assert [f.texto for f in voz._fila] == ["oi", "carregando 50%"]
+    assert voz.contadores["coalescidas"] == 2
+
+
+def test_barge_in_corta_a_fala_atual_e_esvazia_a_fila():
+    engine = FakeTTSEngine(atraso_palavra=0.02)
+    voz = VozFalsa(engine)
+    voz.start()
+    longa = " ".join(["palavra"] * 200)
+    voz.falar(longa, PRIORIDADE_CHAT)
+    voz.falar("próxima resposta", PRIORIDADE_CHAT)
+    voz.falar("alerta", PRIORIDADE_ALERTA)
+    esperar_falando(voz, longa)
+    inicio = time.monotonic()
+    voz.interromper()
+    esperar_fila_vazia(voz)
+    assert time.monotonic() - inicio < 1.0  # Não esperou as 200 palavras
+    assert engine.interrompidas == [longa]
+    assert engine.faladas == ["alerta"]  # Alertas sobrevivem ao barge-in
+
+
+def test_fila_cheia_descarta_a_mais_antiga_de_menor_prioridade():
+    voz = VozFalsa(FakeTTSEngine(), max_fila=2)
+    voz.falar("chat um", PRIORIDADE_CHAT)
+    voz.falar("chat dois", PRIORIDADE_CHAT)
+    assert voz.falar("comando", PRIORIDADE_COMANDO)
+    assert [f.texto for f in voz._fila] == ["chat dois", "comando"]
+    assert voz.falar("chat três", PRIORIDADE_CHAT)
+    assert [f.texto for f in voz._fila] == ["comando", "chat três"]
+    assert voz.contadores["descartadas"] == 2
+
+
+def test_fila_cheia_de_alertas_recusa_o_chat():
+    voz = VozFalsa(FakeTTSEngine(), max_fila=2)
+    voz.falar("alerta um", PRIORIDADE_ALERTA)
+    voz.falar("alerta dois", PRIORIDADE_ALERTA)
+    assert not voz.falar("resposta", PRIORIDADE_CHAT)
+    assert [f.texto for f in voz._fila] == ["alerta um", "alerta dois"]
+
+
+def test_frase_em_cache_sem_player_sai_pelo_motor(tmp_path):
+    from isa_core.tts_cache import TTSAudioCache
+
+    engine = FakeTTSEngine()
+    cache = TTSAudioCache(str(tmp_path))
+    cache.fixar(["Áudio ajustado."])
+    cache.renderizar(engine, "Áudio ajustado.", None, 200)
+    engine.salvas.clear()
+
+    def sem_player(arquivo):
+        raise RuntimeError("Nenhum player de áudio encontrado")
+
+    voz = VozFalsa(engine, cache_audio=cache, tocar=sem_player)
+    voz.start()
+    voz.falar("Áudio ajustado.", PRIORIDADE_COMANDO)
+    esperar_fila_vazia(voz)
+    voz.falar("Áudio ajustado.", PRIORIDADE_COMANDO)
+    esperar_fila_vazia(voz)
+    assert engine.faladas == ["Áudio ajustado.", "Áudio ajustado."]
+    assert voz.cache_audio is None  # Desligado depois da primeira falha
+
+
+def test_cache_de_voz_desligado_sem_player_instalado(tmp_path, monkeypatch):
+    from isa_core import speech_scheduler
+    from isa_core.tts_cache import TTSAudioCache
+
+    monkeypatch.setattr(speech_scheduler, "player_disponivel", lambda: False)
+    voz = VozFalsa(FakeTTSEngine(), cache_audio=TTSAudioCache(str(tmp_path)))
+    assert voz.cache_audio is None
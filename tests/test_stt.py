@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from isa_core.stt import FallbackSTT, STTEngine
+
+
+class MotorFalso(STTEngine):
+    def __init__(self, nome, texto, portao=None):
+        self.nome = nome
+        self.texto = texto
+        self.portao = portao
+        self.chamadas = 0
+
+    def reconhecer(self, audio):
+        self.chamadas += 1
+        if self.portao is not None:
+            self.portao.wait(5)
+        return self.texto
+
+
+def test_passa_ao_proximo_motor_no_timeout():
+    portao = threading.Event()
+    lento = MotorFalso("vosk", "lento", portao)
+    cadeia = FallbackSTT([lento, MotorFalso("google", "rapido")], {"vosk": 0.05})
+    assert cadeia.reconhecer(b"") == "rapido"
+    assert cadeia.ultimo_motor == "google"
+    portao.set()
+
+
+def test_motor_travado_fica_de_fora_ate_terminar():
+    portao = threading.Event()
+    lento = MotorFalso("vosk", "lento", portao)
+    cadeia = FallbackSTT([lento, MotorFalso("google", "rapido")], {"vosk": 0.05})
+    for _ in range(5):
+        assert cadeia.reconhecer(b"") == "rapido"
+    assert lento.chamadas == 1  # Sem empilhar threads no motor preso
+    portao.set()
+    cadeia._em_andamento["vosk"].result(5)
+    assert cadeia.reconhecer(b"") == "lento"
+    assert lento.chamadas == 2
+
+
+def test_lanca_o_erro_do_ultimo_motor():
+    portao = threading.Event()
+    cadeia = FallbackSTT([MotorFalso("vosk", "lento", portao)], timeout_padrao=0.05)
+    with pytest.raises(TimeoutError):
+        cadeia.reconhecer(b"")
+    with pytest.raises(RuntimeError, match="em andamento"):
+        cadeia.reconhecer(b"")
+    portao.set()
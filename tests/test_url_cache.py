@@ -0,0 +1,28 @@
+from isa_core.url_cache import CacheURLs, nome_do_site, validar_url
+
+
+def test_nome_do_site_sai_do_pedido():
+    assert nome_do_site("abra o site do YouTube") == "youtube"
+    assert nome_do_site("acesse o bom dia brasil") == "bom dia brasil"
+
+
+def test_so_aceita_uma_url():
+    assert validar_url("`www.youtube.com`") == "https://www.youtube.com"
+    assert validar_url("https://ge.globo.com/") == "https://ge.globo.com/"
+    assert validar_url("Qual site você quer abrir?") is None
+    assert validar_url("https://a.com https://b.com") is None
+
+
+def test_nomes_com_stop_words_sao_sites_diferentes():
+    cache = CacheURLs()
+    cache.guardar("abra o brasil", "https://brasil.gov.br")
+    assert cache.obter("abra o bom dia brasil") is None
+    cache.guardar("abra o bom dia brasil", "https://g1.globo.com/bom-dia-brasil")
+    assert cache.obter("abra o site do Brasil") == "https://brasil.gov.br"
+    assert cache.obter("acesse o Bom Dia Brasil") == "https://g1.globo.com/bom-dia-brasil"
+
+
+def test_resposta_invalida_nao_entra():
+    cache = CacheURLs()
+    assert cache.guardar("abra o youtube", "Não sei qual é o site.") is None
+    assert cache.obter("abra o youtube") is None